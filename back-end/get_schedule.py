@@ -1,8 +1,9 @@
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
+import os
+import sys
 from combo import get_merged_requirements_for_student 
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'my_app', 'back-end'))
+from services.term_catalog import get_term_catalog
 
 def plan_next_semester_schedule(
     student_id: int,
@@ -19,8 +20,8 @@ def plan_next_semester_schedule(
     Логика:
       1) Получаем требования (Major + Core) через get_merged_requirements_for_student.
       2) Сначала планируем Major, пока не упремся в 18 кредитов или не закроем Major-требования.
-         - Для каждого потенциального course_id ищем в таблице sections => term=next_term.
-           Если находим, берём credits из sections.
+         - Для каждого потенциального course_id ищем секцию в TermCatalog(next_term)
+           (все секции семестра загружаются одним запросом). Если находим, берём credits из sections.
       3) Затем планируем Core. Если для группы available_courses = "CORE X", ищем любую секцию,
          где attribute содержит "Core: X" и term=next_term. Если не нашли, добавляем плейсхолдер.
       4) Возвращаем список словарей:
@@ -49,6 +50,9 @@ def plan_next_semester_schedule(
 
     plan = []
     total_credits = 0
+    # Битовая маска времени уже выбранных секций (см. services/meeting_times.py)
+    busy_mask = 0
+    catalog = get_term_catalog(next_term)
 
     # =========================================================================
     # ШАГ 2. СНАЧАЛА MAJOR
@@ -67,20 +71,14 @@ def plan_next_semester_schedule(
             if needed <= 0:
                 break
 
-            # Ищем секцию в таблице sections, где course_id=course_code и term=next_term
-            resp = supabase.table("sections") \
-                .select("section_id, course_id, credits, attribute, term") \
-                .eq("course_id", course_code) \
-                .eq("term", next_term) \
-                .execute()
-            if not resp.data:
+            # Ищем секцию в каталоге семестра, где course_id=course_code
+            section_info = catalog.first_section(course_code, busy_mask)
+            if not section_info:
                 # Нет секции в этом семестре
                 if debug:
                     print(f"[DEBUG] No section for {course_code} in {next_term}")
                 continue
 
-            # Возьмём первую попавшуюся секцию (упрощённо)
-            section_info = resp.data[0]
             sec_id = section_info["section_id"]
             sec_credits = section_info.get("credits", 0)
 
@@ -95,6 +93,7 @@ def plan_next_semester_schedule(
                 "group": group_name
             })
             total_credits += sec_credits
+            busy_mask |= catalog.meeting_mask(section_info)
             needed -= sec_credits
 
         if debug and needed > 0:
@@ -123,15 +122,10 @@ def plan_next_semester_schedule(
                 if needed <= 0:
                     break
 
-                # Ищем в sections
-                resp = supabase.table("sections") \
-                    .select("section_id, course_id, credits, attribute, term") \
-                    .eq("course_id", course_code) \
-                    .eq("term", next_term) \
-                    .execute()
-                if not resp.data:
+                # Ищем в каталоге семестра
+                section_info = catalog.first_section(course_code, busy_mask)
+                if not section_info:
                     continue
-                section_info = resp.data[0]
                 sec_id = section_info["section_id"]
                 sec_credits = section_info["credits"]
                 if total_credits + sec_credits > max_credits_per_semester:
@@ -144,33 +138,22 @@ def plan_next_semester_schedule(
                     "group": group_name
                 })
                 total_credits += sec_credits
+                busy_mask |= catalog.meeting_mask(section_info)
                 needed -= sec_credits
 
         # 3.2) Если это строка вида "CORE 3" => ищем секции с "Core: attr_needed"
         if attr_needed and needed > 0:
             # Пока есть нужные кредиты и не достигли лимита
             while needed > 0 and total_credits < max_credits_per_semester:
-                # Ищем любую секцию, где attribute (поле sections.attribute) содержит "Core: attr_needed"
-                # Предположим, attribute — это текст, возможно через запятую.
-                # Ниже — упрощённый вариант: загружаем все секции этого term, фильтруем в Python.
-                resp = supabase.table("sections") \
-                    .select("section_id, course_id, credits, attribute, term") \
-                    .eq("term", next_term) \
-                    .execute()
+                # Ищем любую секцию с атрибутом "Core: attr_needed" по индексу каталога
                 found_section = None
-                for row in (resp.data or []):
-                    attr_str = row.get("attribute") or ""
-                    # Допустим, мы ищем строку "Core: {attr_needed}"
-                    # Если attr_str хранит несколько через запятую, нужно проверить каждую.
-                    # Упрощённо:
-                    #    if f"Core: {attr_needed}" in attr_str
-                    # Или если attribute хранится в массиве _text, нужно итерироваться.
-                    # Ниже — вариант поиска по подстроке:
-                    if f"Core: {attr_needed}" in attr_str:
-                        sec_credits = row.get("credits", 0)
-                        if total_credits + sec_credits <= max_credits_per_semester:
-                            found_section = row
-                            break
+                for row in catalog.sections_with_core_attribute(attr_needed):
+                    sec_credits = row.get("credits", 0)
+                    if catalog.meeting_mask(row) & busy_mask:
+                        continue
+                    if total_credits + sec_credits <= max_credits_per_semester:
+                        found_section = row
+                        break
                 if found_section:
                     plan.append({
                         "section_id": found_section["section_id"],
@@ -179,6 +162,7 @@ def plan_next_semester_schedule(
                         "group": group_name
                     })
                     total_credits += found_section["credits"]
+                    busy_mask |= catalog.meeting_mask(found_section)
                     needed -= found_section["credits"]
                 else:
                     # Не нашли реального курса => добавляем плейсхолдер
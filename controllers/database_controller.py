@@ -1,25 +1,48 @@
-from flask import Blueprint, jsonify
-from services.database_service import DatabaseService
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.db_service import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, DatabaseService
+from services.row_stream import NDJSON_MIMETYPE, json_envelope_chunks, ndjson_chunks, primed
 
 db_bp = Blueprint('db_bp', __name__)
 
 @db_bp.route('/courses', methods=['GET'])
 def get_courses():
     """
-    API endpoint to get all courses from the database
+    API endpoint to get all courses from the database.
+    ?after=<id>&limit=<n> returns one page and the cursor of the next one;
+    ?format=ndjson streams every course (after `after`) as NDJSON.
+    Without either, {data, count} is streamed page by page.
     """
     try:
-        courses = DatabaseService.get_courses()
-        if courses is None:
-            return jsonify({
-                'error': 'Database Error',
-                'message': 'Failed to retrieve courses from the database'
-            }), 500
-        
+        after = request.args.get('after') or None
+        after = int(after) if after is not None else None
+        limit = min(max(int(request.args.get('limit') or DEFAULT_PAGE_LIMIT), 1), MAX_PAGE_LIMIT)
+    except ValueError:
         return jsonify({
-            'data': courses,
-            'count': len(courses)
-        }), 200
+            'error': 'Bad Request',
+            'message': 'after and limit must be integers'
+        }), 400
+
+    try:
+        ndjson = request.args.get('format') == 'ndjson'
+        if not ndjson and (after is not None or request.args.get('limit')):
+            page = DatabaseService.get_courses_page(after, limit)
+            if page is None:
+                return jsonify({
+                    'error': 'Database Error',
+                    'message': 'Failed to retrieve courses from the database'
+                }), 500
+            courses, cursor = page
+            return jsonify({
+                'data': courses,
+                'count': len(courses),
+                'next': cursor
+            }), 200
+
+        pages = primed(DatabaseService.iter_course_pages(after))
+        if ndjson:
+            return Response(stream_with_context(ndjson_chunks(pages)), mimetype=NDJSON_MIMETYPE)
+        return Response(stream_with_context(json_envelope_chunks(pages, {}, count_key='count')),
+                        mimetype='application/json')
     except Exception as e:
         return jsonify({
             'error': 'Server Error',
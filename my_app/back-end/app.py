@@ -1,5 +1,6 @@
 import os
-from flask import Flask, send_from_directory
+import threading
+from flask import Flask
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -10,31 +11,110 @@ from controllers.course_controller import course_bp
 from controllers.export_controller import export_bp
 from controllers.prereq_controller import prereq_bp
 from controllers.section_controller import section_bp
+from controllers.requirements_controller import requirements_bp
+from controllers.admin_controller import admin_bp
+from controllers.floor_plan_controller import floor_plans_bp
+from services.course_search import warm_course_search_index
+from services.finals_schedule import get_finals_index
+from services.prereq_service import warm_prerequisite_index
+from services.static_assets import asset_response, warm_static_assets
+from services.session_tokens import require_session_secret
+from services.terms import default_term, parse_term
+from services.instrumentation import configure_logging, init_app as init_instrumentation
 
-app = Flask(__name__)
-CORS(app)
+# When the server start path builds the caches: "background" (daemon threads),
+# "sync" (before serving; the gunicorn preload mode uses it so forked workers
+# share the warmed data) or "off" (each cache on its first request).
+APP_WARMUP = os.getenv("APP_WARMUP", "background")
+# Comma-separated terms whose catalogs are warmed; the default term when unset.
+WARMUP_TERMS = os.getenv("WARMUP_TERMS", "")
 
-app.register_blueprint(user_bp, url_prefix='/user_bp')
-app.register_blueprint(course_bp, url_prefix='/courses_bp')
-app.register_blueprint(section_bp, url_prefix='/sections_bp')
-app.register_blueprint(export_bp, url_prefix='/export_bp')
-app.register_blueprint(prereq_bp, url_prefix='/api_bp')
 
-INTERFACE_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'interface')
+def _warm_term(term: str) -> None:
+    # The finals index is built from the term catalog, so this loads both.
+    try:
+        get_finals_index(term)
+    except Exception as e:
+        print(f"Error loading term catalog for {term}: {str(e)}")
 
-@app.route('/')
-def serve_index():
-    return send_from_directory(INTERFACE_FOLDER, 'index.html')
 
-@app.route('/<path:filename>')
-def serve_static_files(filename):
-    return send_from_directory(INTERFACE_FOLDER, filename)
+def warm_caches(background: bool = False) -> None:
+    """
+    Builds the compressed static assets, the course search and prerequisite
+    indexes and the catalog and finals index of each WARMUP_TERMS term, so
+    that no first request pays for them.
+    """
+    terms = [term for term in map(parse_term, WARMUP_TERMS.split(",")) if term] or [default_term()]
+    tasks = [
+        (warm_static_assets, ()),
+        (warm_course_search_index, ()),
+        (warm_prerequisite_index, ()),
+    ] + [(_warm_term, (term,)) for term in dict.fromkeys(terms)]
+    for target, args in tasks:
+        if background:
+            threading.Thread(target=target, args=args, daemon=True).start()
+        else:
+            target(*args)
 
-@app.route('/favicon.ico')
-def serve_favicon():
-    return send_from_directory(INTERFACE_FOLDER, 'favicon.ico', mimetype='image/vnd.microsoft.icon')
+
+def start_warmup(mode: str = APP_WARMUP) -> None:
+    """
+    Starts the warmup selected by `mode` (see APP_WARMUP). Called by the server
+    entry points (gunicorn.conf.py, __main__ below), never on import.
+    """
+    if mode == "sync":
+        warm_caches()
+    elif mode == "background":
+        warm_caches(background=True)
+
+
+def create_app(warmup: str = "off") -> Flask:
+    """
+    Builds the Flask app. Importing this module has no side effects beyond
+    create_app() below: Supabase clients, catalogs and indexes are created on
+    first use or by start_warmup() (or the `warmup` mode given here).
+    """
+    configure_logging()
+
+    app = Flask(__name__, static_folder=None)
+    if not app.debug:
+        require_session_secret()
+    CORS(app, expose_headers=['Server-Timing'])
+    init_instrumentation(app)
+
+    app.register_blueprint(user_bp, url_prefix='/user_bp')
+    app.register_blueprint(course_bp, url_prefix='/courses_bp')
+    app.register_blueprint(section_bp, url_prefix='/sections_bp')
+    app.register_blueprint(export_bp, url_prefix='/export_bp')
+    app.register_blueprint(prereq_bp, url_prefix='/api_bp')
+    app.register_blueprint(requirements_bp, url_prefix='/requirements_bp')
+    app.register_blueprint(admin_bp, url_prefix='/admin_bp')
+    app.register_blueprint(floor_plans_bp, url_prefix='/floor_plans_bp')
+
+    @app.route('/')
+    def serve_index():
+        return asset_response('index.html')
+
+    @app.route('/static/<version>/<path:filename>')
+    def serve_versioned_static_files(version, filename):
+        return asset_response(filename, version)
+
+    @app.route('/<path:filename>')
+    def serve_static_files(filename):
+        return asset_response(filename)
+
+    @app.route('/favicon.ico')
+    def serve_favicon():
+        return asset_response('favicon.ico')
+
+    start_warmup(warmup)
+    return app
+
+
+# No warmup on import: the server entry points start it.
+app = create_app(warmup="off")
 
 if __name__ == '__main__':
+    start_warmup()
     port = int(os.environ.get('PORT', 5001))
     app.run(host='0.0.0.0', port=port, debug=False)
-
@@ -0,0 +1,91 @@
+"""
+Import-time budget of the app: imports `app` in a fresh interpreter with the
+warmup off and fails when the import takes longer than the budget, queries
+Supabase or leaves threads running. No network or credentials needed.
+
+    cd my_app/back-end
+    python -m benchmarks.import_budget                 # budget from IMPORT_BUDGET_MS (default 1000)
+    python -m benchmarks.import_budget --budget-ms 600 --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+# Runs in the child: any Supabase access during the import is recorded instead of sent.
+_CHILD = """
+import json, threading
+from services import repository
+
+used = []
+
+class NoClient:
+    def __getattr__(self, name):
+        used.append(name)
+        raise RuntimeError("Supabase used while importing the app")
+
+repository.set_client(NoClient())
+import app
+print(json.dumps({"supabase_calls": used, "threads": [t.name for t in threading.enumerate()
+                                                    if t is not threading.main_thread()]}))
+"""
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Total import time in ms and self time per top-level package from -X importtime output.
+    """
+    total_us = 0
+    by_package: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        self_us = int(self_us)
+        # " app" is a top-level import, "   flask" one nested in it.
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative_us)  # top-level import: its cumulative time covers its children
+        package = name.strip().split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + self_us / 1000
+    return total_us / 1000, by_package
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, APP_WARMUP="off", LOG_LEVEL="WARNING")
+    env.setdefault("SESSION_SECRET", "import-budget")
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", _CHILD], cwd=BACKEND_DIR, env=env,
+                           capture_output=True, text=True)
+    if child.returncode != 0:
+        print(child.stderr.splitlines()[-1] if child.stderr else "import failed")
+        return 1
+    report = json.loads(child.stdout.strip().splitlines()[-1])
+    total_ms, by_package = parse_importtime(child.stderr)
+
+    print(f"import app: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for package, ms in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<24}{ms:>8.1f} ms")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.0f} ms > budget {args.budget_ms:.0f} ms")
+    if report["supabase_calls"]:
+        failures.append(f"Supabase used at import time: {', '.join(report['supabase_calls'])}")
+    if report["threads"]:
+        failures.append(f"threads started at import time: {', '.join(report['threads'])}")
+    for line in failures:
+        print(f"FAIL {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
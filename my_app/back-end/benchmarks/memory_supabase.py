@@ -0,0 +1,224 @@
+import copy
+import fnmatch
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from postgrest.exceptions import APIError
+
+# Columns filled in on insert when missing, like the serial primary keys in Supabase.
+PRIMARY_KEYS = {"users": "user_id", "sections": "section_id", "courses": "id", "requirement_groups": "id"}
+
+
+class MemoryResponse:
+    __slots__ = ("data", "count")
+
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class MemoryQuery:
+    """
+    The subset of the postgrest-py request builder the services use, evaluated
+    against in-memory tables. Results go through a JSON round trip, as they
+    would when decoded from a PostgREST response.
+    """
+
+    def __init__(self, client: "MemoryClient", table: str):
+        self._client = client
+        self._table = table
+        self.path = f"/{table}"
+        self.http_method = "GET"
+        self._columns: Optional[List[str]] = None
+        self._filters: List[Callable[[dict], bool]] = []
+        self._eq: Optional[tuple] = None
+        self._order: List[tuple] = []
+        self._range: Optional[tuple] = None
+        self._limit: Optional[int] = None
+        self._single: Optional[str] = None
+        self._payload: Any = None
+
+    # --- verbs
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "MemoryQuery":
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def insert(self, rows) -> "MemoryQuery":
+        self.http_method = "POST"
+        self._payload = rows
+        return self
+
+    def update(self, values: dict) -> "MemoryQuery":
+        self.http_method = "PATCH"
+        self._payload = values
+        return self
+
+    def delete(self) -> "MemoryQuery":
+        self.http_method = "DELETE"
+        return self
+
+    # --- filters
+
+    def eq(self, column: str, value) -> "MemoryQuery":
+        if self._eq is None:
+            self._eq = (column, value)  # answered from the column index
+        else:
+            self._filters.append(lambda row: _equal(row.get(column), value))
+        return self
+
+    def neq(self, column: str, value) -> "MemoryQuery":
+        self._filters.append(lambda row: not _equal(row.get(column), value))
+        return self
+
+    def gt(self, column: str, value) -> "MemoryQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def gte(self, column: str, value) -> "MemoryQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def lt(self, column: str, value) -> "MemoryQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) < value)
+        return self
+
+    def lte(self, column: str, value) -> "MemoryQuery":
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) <= value)
+        return self
+
+    def in_(self, column: str, values) -> "MemoryQuery":
+        wanted = {str(value) for value in values}
+        self._filters.append(lambda row: str(row.get(column)) in wanted)
+        return self
+
+    def like(self, column: str, pattern: str) -> "MemoryQuery":
+        glob = pattern.replace("%", "*")
+        self._filters.append(lambda row: fnmatch.fnmatchcase(str(row.get(column) or ""), glob))
+        return self
+
+    def ilike(self, column: str, pattern: str) -> "MemoryQuery":
+        glob = pattern.replace("%", "*").lower()
+        self._filters.append(lambda row: fnmatch.fnmatchcase(str(row.get(column) or "").lower(), glob))
+        return self
+
+    # --- modifiers
+
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = False) -> "MemoryQuery":
+        # "a,b" is PostgREST's multi-column order in a single parameter.
+        self._order.extend((name.strip(), desc) for name in column.split(","))
+        return self
+
+    def range(self, start: int, end: int) -> "MemoryQuery":
+        self._range = (start, end)
+        return self
+
+    def limit(self, size: int) -> "MemoryQuery":
+        self._limit = size
+        return self
+
+    def single(self) -> "MemoryQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "MemoryQuery":
+        self._single = "maybe"
+        return self
+
+    # --- execution
+
+    def _matches(self, rows: List[dict]) -> List[dict]:
+        if self._eq is not None:
+            rows = self._client.lookup(self._table, *self._eq)
+        return [row for row in rows if all(f(row) for f in self._filters)]
+
+    def execute(self) -> MemoryResponse:
+        client = self._client
+        with client.lock:
+            rows = client.tables.setdefault(self._table, [])
+            if self.http_method == "POST":
+                result = client.insert(self._table, self._payload)
+            elif self.http_method == "PATCH":
+                result = self._matches(rows)
+                for row in result:
+                    row.update(self._payload)
+                client.changed(self._table)
+            elif self.http_method == "DELETE":
+                result = self._matches(rows)
+                removed = {id(row) for row in result}
+                client.tables[self._table] = [row for row in rows if id(row) not in removed]
+                client.changed(self._table)
+            else:
+                result = self._matches(rows)
+                for column, desc in reversed(self._order):
+                    result.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+                if self._range is not None:
+                    result = result[self._range[0]:self._range[1] + 1]
+                if self._limit is not None:
+                    result = result[:self._limit]
+                if self._columns is not None:
+                    result = [{column: row.get(column) for column in self._columns} for row in result]
+            payload = json.dumps(result, default=str)
+
+        data = json.loads(payload)
+        if self._single is not None:
+            if len(data) > 1 or (self._single == "single" and not data):
+                raise APIError({"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned"})
+            data = data[0] if data else None
+        return MemoryResponse(data)
+
+
+def _equal(a, b) -> bool:
+    # PostgREST compares the filter text against the column, so 5 and "5" are the same key.
+    return a == b or str(a) == str(b)
+
+
+class MemoryClient:
+    """
+    Stand-in for supabase.Client over in-memory tables, for the offline
+    benchmarks. Equality filters use a per-column hash index that is rebuilt
+    after writes to the table.
+    """
+
+    def __init__(self, tables: Dict[str, List[dict]]):
+        self.tables = {name: copy.deepcopy(rows) for name, rows in tables.items()}
+        self.lock = threading.RLock()
+        self._indexes: Dict[tuple, Dict[str, List[dict]]] = {}
+
+    def table(self, name: str) -> MemoryQuery:
+        return MemoryQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[dict] = None):
+        # Database functions are not emulated; callers fall back to plain queries.
+        raise APIError({"code": "PGRST202", "message": f"Could not find the function public.{fn}"})
+
+    def lookup(self, table: str, column: str, value) -> List[dict]:
+        index = self._indexes.get((table, column))
+        if index is None:
+            index = {}
+            for row in self.tables.get(table, []):
+                index.setdefault(str(row.get(column)), []).append(row)
+            self._indexes[(table, column)] = index
+        return index.get(str(value), [])
+
+    def changed(self, table: str) -> None:
+        for key in [key for key in self._indexes if key[0] == table]:
+            del self._indexes[key]
+
+    def insert(self, table: str, payload) -> List[dict]:
+        rows = copy.deepcopy(payload if isinstance(payload, list) else [payload])
+        existing = self.tables.setdefault(table, [])
+        key = PRIMARY_KEYS.get(table)
+        if key is not None:
+            next_id = max((row.get(key) or 0 for row in existing), default=0) + 1
+            for row in rows:
+                if row.get(key) is None:
+                    row[key] = next_id
+                    next_id += 1
+        existing.extend(rows)
+        self.changed(table)
+        return rows
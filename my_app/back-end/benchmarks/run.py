@@ -0,0 +1,215 @@
+"""
+Offline benchmarks of the hot endpoints against a synthetic catalog and an
+in-memory Supabase stand-in; no network or credentials needed.
+
+    cd my_app/back-end
+    python -m benchmarks.run                     # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline   # record a new baseline on this machine
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+_QUERIES_RE = re.compile(r'desc="(\d+) queries')
+# Latency differences below this are scheduler noise, whatever the ratio.
+MIN_DELTA_MS = 5.0
+
+Request = Tuple[str, str, Optional[dict]]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile.
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def build_scenarios(tables: Dict[str, List[dict]], major: str) -> Dict[str, Callable[[random.Random], Request]]:
+    from benchmarks.synthetic_catalog import CURRENT_TERM, STUDENT_PASSWORD
+
+    student_ids = [row["user_id"] for row in tables["users"]]
+    course_codes = sorted({row["code"] for row in tables["courses"]})
+    with_prereqs = sorted({row["course_code"] for row in tables["prerequisites"]}) or course_codes
+    searches = sorted({(row["subject"], row["course_code"]) for row in tables["sections"] if row["term"] == CURRENT_TERM})
+    subjects = sorted({subject for subject, _ in searches})
+
+    def search(rng: random.Random) -> Request:
+        if rng.random() < 0.5:
+            return "GET", f"/sections_bp/search?subject={rng.choice(subjects)}&term={CURRENT_TERM}", None
+        subject, code = rng.choice(searches)
+        return "GET", f"/sections_bp/search?subject={subject}&course_code={code}&term={CURRENT_TERM}", None
+
+    return {
+        "next_semester_plan": lambda rng: (
+            "GET", f"/user_bp/{rng.choice(student_ids)}/next_semester_plan?major={major}&term={CURRENT_TERM}", None),
+        "next_requirements": lambda rng: (
+            "GET", f"/user_bp/{rng.choice(student_ids)}/next_requirements?major={major}", None),
+        "prereq_graph": lambda rng: (
+            "GET", f"/api_bp/graph?course={rng.choice(with_prereqs)}&all={rng.choice(('true', 'false'))}", None),
+        "sections_search": search,
+        "login": lambda rng: (
+            "POST", "/user_bp/login",
+            {"user_name": f"student{rng.choice(student_ids)}", "password": STUDENT_PASSWORD}),
+    }
+
+
+def run_scenario(app, make_request: Callable[[random.Random], Request], requests: int,
+                 warmup: int, concurrency: int, seed: int) -> dict:
+    """
+    Sends warmup + requests requests from `concurrency` threads, each with its own
+    test client; reports throughput, latency percentiles and Supabase queries per request.
+    """
+    rng = random.Random(seed)
+    planned = [make_request(rng) for _ in range(warmup + requests)]
+    local = threading.local()
+
+    def send(request: Request) -> Tuple[float, int, int]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        method, url, body = request
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        m = _QUERIES_RE.search(response.headers.get("Server-Timing", ""))
+        return elapsed, response.status_code, int(m.group(1)) if m else 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, planned[:warmup]))
+        started = time.perf_counter()
+        results = list(pool.map(send, planned[warmup:]))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(elapsed for elapsed, _, _ in results)
+    return {
+        "requests": len(results),
+        "errors": sum(1 for _, status, _ in results if status >= 400),
+        "throughput": round(len(results) / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round(sum(queries for _, _, queries in results) / max(1, len(results)), 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Regressions against the baseline: p50 or throughput worse by more than tolerance,
+    p99 by more than twice that (and by at least MIN_DELTA_MS), or more Supabase
+    queries per request.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current["p50_ms"] > max(base["p50_ms"] * (1 + tolerance), base["p50_ms"] + MIN_DELTA_MS):
+            regressions.append(f"{name}: p50 {current['p50_ms']} ms > baseline {base['p50_ms']} ms")
+        if current["p99_ms"] > max(base["p99_ms"] * (1 + 2 * tolerance), base["p99_ms"] + MIN_DELTA_MS):
+            regressions.append(f"{name}: p99 {current['p99_ms']} ms > baseline {base['p99_ms']} ms")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['throughput']}/s < baseline {base['throughput']}/s")
+        if current["queries_per_request"] > max(base["queries_per_request"] * 1.1, base["queries_per_request"] + 0.5):
+            regressions.append(f"{name}: {current['queries_per_request']} queries/request "
+                               f"> baseline {base['queries_per_request']}")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} failed requests")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=800)
+    parser.add_argument("--sections", type=int, default=3000, help="sections in the current term")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4,
+                        help="cost of the synthetic password hashes (production uses 12)")
+    parser.add_argument("--scenarios", help="comma-separated subset of scenarios")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    # Before the app is imported: matching rounds avoid rehash-on-login writes, and logs stay quiet.
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("SESSION_SECRET", "benchmark")
+
+    from benchmarks.memory_supabase import MemoryClient
+    from benchmarks.synthetic_catalog import MAJOR_PROGRAM, generate_catalog
+    from services.repository import set_client
+
+    config = {key: getattr(args, key) for key in
+              ("courses", "sections", "students", "seed", "requests", "warmup", "concurrency", "bcrypt_rounds")}
+    started = time.perf_counter()
+    tables = generate_catalog(args.courses, args.sections, args.students, args.seed, args.bcrypt_rounds)
+    set_client(MemoryClient(tables))
+    print(f"Synthetic catalog: {len(tables['courses'])} courses, {len(tables['sections'])} sections, "
+          f"{len(tables['users'])} students, {len(tables['enrollments'])} enrollments "
+          f"({time.perf_counter() - started:.1f}s)")
+
+    from app import app
+
+    scenarios = build_scenarios(tables, MAJOR_PROGRAM)
+    if args.scenarios:
+        wanted = [name.strip() for name in args.scenarios.split(",")]
+        unknown = [name for name in wanted if name not in scenarios]
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(scenarios)})")
+        scenarios = {name: scenarios[name] for name in wanted}
+
+    results = {}
+    print(f"{'scenario':<20}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'queries':>10}{'errors':>8}")
+    for i, (name, make_request) in enumerate(scenarios.items()):
+        result = run_scenario(app, make_request, args.requests, args.warmup, args.concurrency, args.seed + i)
+        results[name] = result
+        print(f"{name:<20}{result['throughput']:>10}{result['p50_ms']:>10}{result['p99_ms']:>10}"
+              f"{result['queries_per_request']:>10}{result['errors']:>8}")
+
+    report = {"config": config, "scenarios": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"Baseline was recorded with {baseline.get('config')}; rerun with the same options "
+              f"or record a new one with --update-baseline")
+        return 2
+
+    regressions = compare(results, baseline["scenarios"], args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
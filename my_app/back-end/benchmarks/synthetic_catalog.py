@@ -0,0 +1,172 @@
+import random
+from typing import Dict, List
+
+import bcrypt
+
+CURRENT_TERM = "Fall 2025"
+HISTORY_TERMS = ("Fall 2024", "Spring 2025")
+CORE_PROGRAM = "University Core Requirements"
+MAJOR_PROGRAM = "B.S. Computer Science - Data Science Concentration"
+STUDENT_PASSWORD = "benchmark-password"
+
+SUBJECTS = ("CPSC", "MATH", "PHIL", "ENGL", "BIOL", "CHEM", "PHYS", "HIST", "ECON", "RELI", "COMM", "PSYC")
+# Core attribute -> subjects whose courses carry it.
+CORE_ATTRIBUTES = {
+    "Philosophy": ("PHIL",),
+    "Writing": ("ENGL",),
+    "Religious Studies": ("RELI",),
+    "Scientific Inquiry": ("BIOL", "CHEM", "PHYS"),
+    "Social & Behavioral Sciences": ("ECON", "PSYC", "HIST"),
+    "Communication": ("COMM",),
+}
+# Standard Gonzaga meeting patterns (days, time_slot).
+MEETING_PATTERNS = (
+    ("MWF", "8:00 AM - 8:50 AM"), ("MWF", "9:00 AM - 9:50 AM"), ("MWF", "10:00 AM - 10:50 AM"),
+    ("MWF", "11:00 AM - 11:50 AM"), ("MWF", "1:10 PM - 2:00 PM"), ("MWF", "2:10 PM - 3:00 PM"),
+    ("MWF", "3:10 PM - 4:00 PM"), ("TR", "8:00 AM - 9:15 AM"), ("TR", "9:25 AM - 10:40 AM"),
+    ("TR", "10:50 AM - 12:05 PM"), ("TR", "1:50 PM - 3:05 PM"), ("TR", "3:15 PM - 4:30 PM"),
+    ("MTWF", "10:00 AM - 10:50 AM"), ("M", "6:00 PM - 8:30 PM"), ("", "TBA"),
+)
+# Course numbers 101-498 per subject.
+MAX_COURSES = len(SUBJECTS) * 390
+BUILDINGS = ("Herak", "College Hall", "Jepson", "Hughes", "Tilford", "Hemmingson")
+
+
+def generate_catalog(courses: int = 800, sections: int = 3000, students: int = 200,
+                     seed: int = 42, bcrypt_rounds: int = 4) -> Dict[str, List[dict]]:
+    """
+    Deterministic tables shaped like the production Supabase schema:
+    courses with a prerequisite DAG (prerequisites only point to lower-numbered
+    courses), `sections` sections in the current term plus the history terms,
+    a Core and a Major program, and students with a few terms of enrollments.
+    All students share STUDENT_PASSWORD, hashed once with bcrypt_rounds.
+    """
+    if courses > MAX_COURSES:
+        raise ValueError(f"At most {MAX_COURSES} distinct course codes can be generated")
+    rng = random.Random(seed)
+
+    course_rows = []
+    codes_by_subject: Dict[str, List[str]] = {subject: [] for subject in SUBJECTS}
+    used_codes = set()
+    while len(course_rows) < courses:
+        subject = SUBJECTS[len(course_rows) % len(SUBJECTS)]
+        number = rng.choice((100, 100, 200, 200, 300, 400)) + rng.randrange(1, 99)
+        code = f"{subject} {number}"
+        if code in used_codes:
+            continue
+        used_codes.add(code)
+        codes_by_subject[subject].append(code)
+        course_rows.append({
+            "id": len(course_rows) + 1,
+            "code": code,
+            "title": f"{subject.title()} Topics {number}",
+            "credits": rng.choice((3, 3, 3, 4)),
+            "subject": subject,
+            "course_code": str(number),
+        })
+    for codes in codes_by_subject.values():
+        codes.sort(key=lambda code: int(code.split()[1]))
+
+    prerequisite_rows = []
+    for row in course_rows:
+        number = int(row["course_code"])
+        if number < 200:
+            continue
+        lower = [code for code in codes_by_subject[row["subject"]] if int(code.split()[1]) // 100 < number // 100]
+        if not lower:
+            continue
+        picked = rng.sample(lower, min(len(lower), rng.choice((1, 1, 2, 3))))
+        requirements = [{"course": code, "min_grade": rng.choice(("D", "C", None))} for code in picked]
+        if len(requirements) == 1:
+            schema = requirements[0]
+        else:
+            schema = {"type": rng.choice(("and", "or")), "requirements": requirements}
+        prerequisite_rows.append({"course_code": row["code"], "prerequisite_schema": schema})
+
+    core_by_subject = {subject: attr for attr, subjects in CORE_ATTRIBUTES.items() for subject in subjects}
+    section_rows = []
+    section_numbers: Dict[tuple, int] = {}
+    crn = 10000
+
+    def add_sections(term: str, count: int) -> None:
+        nonlocal crn
+        for i in range(count):
+            course = course_rows[i % len(course_rows)] if i < len(course_rows) else rng.choice(course_rows)
+            days, time_slot = rng.choice(MEETING_PATTERNS)
+            attributes = []
+            if course["subject"] in core_by_subject and int(course["course_code"]) < 300:
+                attributes.append(f"Core: {core_by_subject[course['subject']]}")
+            if rng.random() < 0.05:
+                attributes.append("Honors")
+            crn += 1
+            key = (term, course["code"])
+            section_numbers[key] = section_numbers.get(key, 0) + 1
+            seats = rng.choice((20, 24, 30, 35, 60))
+            taken = rng.randrange(0, seats + 1)
+            section_rows.append({
+                "section_id": len(section_rows) + 1,
+                "crn": str(crn),
+                "course_id": course["code"],
+                "term": term,
+                "section": f"{section_numbers[key]:02d}",
+                "attribute": ", ".join(attributes),
+                "credits": course["credits"],
+                "subject": course["subject"],
+                "course_code": course["course_code"],
+                "days": days,
+                "time_slot": time_slot,
+                "instructor_id": f"Instructor {rng.randrange(1, max(2, courses // 4))}",
+                "classroom": f"{rng.choice(BUILDINGS)} {rng.randrange(100, 400)}",
+                "rm": seats - taken,
+                "act": taken,
+            })
+
+    add_sections(CURRENT_TERM, sections)
+    for term in HISTORY_TERMS:
+        add_sections(term, max(len(course_rows), sections // 2))
+
+    program_rows = [{"program_id": 1, "degree_program": CORE_PROGRAM},
+                    {"program_id": 2, "degree_program": MAJOR_PROGRAM}]
+    group_rows = []
+    requirement_course_rows = []
+    for json_id, attribute in enumerate(CORE_ATTRIBUTES, start=1):
+        group_rows.append({"id": len(group_rows) + 1, "program_id": 1, "name": f"{attribute} Core",
+                           "json_group_id": json_id, "req_credits": 3 if json_id > 2 else 6, "note": None})
+    major_groups = (
+        ("Lower Division", ["CPSC"], (100, 200), 18, None),
+        ("Mathematics", ["MATH"], (100, 300), 12, "Can double count with (1)"),
+        ("Upper Division", ["CPSC"], (300, 500), 15, None),
+        ("Data Science Electives", ["CPSC", "MATH", "ECON"], (300, 500), 9, None),
+    )
+    for json_id, (name, subjects, (low, high), req_credits, note) in enumerate(major_groups, start=1):
+        group_id = len(group_rows) + 1
+        group_rows.append({"id": group_id, "program_id": 2, "name": name, "json_group_id": json_id,
+                           "req_credits": req_credits, "note": note})
+        for subject in subjects:
+            for code in codes_by_subject[subject]:
+                if low <= int(code.split()[1]) < high:
+                    requirement_course_rows.append({"group_id": group_id, "course_code": code})
+
+    password = bcrypt.hashpw(STUDENT_PASSWORD.encode("utf-8"), bcrypt.gensalt(bcrypt_rounds)).decode("utf-8")
+    user_rows = []
+    enrollment_rows = []
+    history = [s for s in section_rows if s["term"] in HISTORY_TERMS]
+    for user_id in range(1, students + 1):
+        user_rows.append({"user_id": user_id, "user_name": f"student{user_id}", "email": f"student{user_id}@zagmail.edu",
+                          "name": f"Student {user_id}", "password": password})
+        for section in rng.sample(history, min(len(history), rng.randrange(4, 16))):
+            enrollment_rows.append({"user_id": user_id, "section_id": section["section_id"], "in_process": False})
+
+    professor_rows = [{"id": i, "name": f"Instructor {i}"} for i in range(1, max(2, courses // 4))]
+
+    return {
+        "courses": course_rows,
+        "prerequisites": prerequisite_rows,
+        "sections": section_rows,
+        "programs": program_rows,
+        "requirement_groups": group_rows,
+        "requirement_courses": requirement_course_rows,
+        "users": user_rows,
+        "enrollments": enrollment_rows,
+        "professors": professor_rows,
+    }
@@ -0,0 +1,59 @@
+import hmac
+import os
+from flask import Blueprint, request, jsonify
+from services.response_cache import response_cache
+from services.term_catalog import invalidate_term_catalogs
+from services.course_search import get_course_search_index
+from services.prereq_service import get_prerequisite_index
+from services.requirements_service import invalidate_program_requirements
+from services.password_hasher import password_pool_metrics
+
+admin_bp = Blueprint('admin_bp', __name__)
+
+
+def is_admin_request() -> bool:
+    token = os.getenv('ADMIN_TOKEN')
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+@admin_bp.route('/cache/purge', methods=['POST'])
+def purge_cache():
+    """
+    Drops cached catalog responses after the catalog was edited.
+    Requires the X-Admin-Token header to match the ADMIN_TOKEN environment variable.
+
+    The caches live in each worker process, so this purges only the worker that
+    serves the request (its pid is returned). Other gunicorn workers keep their
+    entries until the TTLs run out (RESPONSE_CACHE_TTL, TERM_CATALOG_TTL, ...).
+    Restart the workers (e.g. kill -HUP the master) for an immediate, global purge.
+
+    Body (JSON, optional):
+        prefix: str  - only purge routes starting with this path, e.g. "/courses_bp/"
+        data: bool   - also mark the in-process term catalogs, course search and
+                       prerequisite indexes and program requirements stale (default true)
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+
+    data = request.get_json(silent=True) or {}
+    prefix = data.get('prefix')
+    removed = response_cache.purge(prefix)
+
+    if data.get('data', True):
+        invalidate_term_catalogs()
+        get_course_search_index().invalidate()
+        get_prerequisite_index().invalidate()
+        invalidate_program_requirements()
+
+    return jsonify({"success": True, "purged": removed, "scope": "worker", "pid": os.getpid()}), 200
+
+
+@admin_bp.route('/password-pool', methods=['GET'])
+def password_pool():
+    """
+    Queue depth and hash latency of the bcrypt worker pool.
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify(password_pool_metrics()), 200
@@ -1,16 +1,50 @@
-from flask import Blueprint, jsonify
-from services.db_service import DatabaseService
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.db_service import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, DatabaseService
+from services.course_search import DEFAULT_LIMIT
+from services.response_cache import cached_response
+from services.row_stream import NDJSON_MIMETYPE, json_envelope_chunks, ndjson_chunks, primed
 
 course_bp = Blueprint('course_bp', __name__)
 
+def _table_response(get_page, iter_pages, error):
+    """
+    A whole table in one of three shapes:
+    ?after=&limit= one keyset page {"data": [...], "next": cursor} (next is null on the last page);
+    ?format=ndjson every row after `after` as NDJSON, streamed page by page;
+    otherwise {"success": true, "data": [...]}, serialized page by page into one cacheable body.
+    """
+    try:
+        after = request.args.get('after') or None
+        after = int(after) if after is not None else None
+        limit = min(max(int(request.args.get('limit') or DEFAULT_PAGE_LIMIT), 1), MAX_PAGE_LIMIT)
+    except ValueError:
+        return jsonify({"success": False, "error": "after and limit must be integers"}), 400
+
+    ndjson = request.args.get('format') == 'ndjson'
+    if not ndjson and (after is not None or request.args.get('limit')):
+        page = get_page(after, limit)
+        if page is None:
+            return jsonify({"success": False, "error": error}), 500
+        rows, cursor = page
+        return jsonify({"success": True, "data": rows, "next": cursor}), 200
+
+    try:
+        if ndjson:
+            pages = primed(iter_pages(after))
+            return Response(stream_with_context(ndjson_chunks(pages)), mimetype=NDJSON_MIMETYPE)
+        body = b"".join(json_envelope_chunks(iter_pages(after), {"success": True}))
+    except Exception as e:
+        print(f"Error fetching rows: {str(e)}")
+        return jsonify({"success": False, "error": error}), 500
+    return Response(body, mimetype='application/json')
+
 @course_bp.route('/', methods=['GET'])
+@cached_response
 def get_courses():
-    courses = DatabaseService.get_courses()
-    if courses is not None:
-        return jsonify({"success": True, "data": courses}), 200
-    return jsonify({"success": False, "error": "Failed to fetch courses"}), 500
+    return _table_response(DatabaseService.get_courses_page, DatabaseService.iter_course_pages, "Failed to fetch courses")
 
 @course_bp.route('/sections/<course_id>', methods=['GET'])
+@cached_response
 def get_sections(course_id):
     sections = DatabaseService.get_sections(course_id)
     if sections is not None:
@@ -18,17 +52,18 @@ def get_sections(course_id):
     return jsonify({"success": False, "error": "Failed to fetch sections"}), 500
 
 @course_bp.route('/professors', methods=['GET'])
+@cached_response
 def get_professors():
-    professors = DatabaseService.get_professors()
-    if professors is not None:
-        return jsonify({"success": True, "data": professors}), 200
-    return jsonify({"success": False, "error": "Failed to fetch professors"}), 500
+    return _table_response(DatabaseService.get_professors_page, DatabaseService.iter_professor_pages, "Failed to fetch professors")
 
 @course_bp.route('/search', methods=['GET'])
 def search_courses():
-    from flask import request
     query = request.args.get('query', '')
     if not query:
         return jsonify([])
-    results = DatabaseService.search_courses(query)
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_LIMIT)), 1), 100)
+    except ValueError:
+        return jsonify({"success": False, "error": "limit must be an integer"}), 400
+    results = DatabaseService.search_courses(query, limit)
     return jsonify(results)
@@ -1,18 +1,103 @@
-from flask import Blueprint, jsonify
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from services.calendar_export import ICS_MIMETYPE, term_dates, user_calendar
+from services.schedule_pdf import PDF_MIMETYPE, schedule_pdf, schedule_pdf_archive
+from services.session_tokens import bearer_user_id
+from services.terms import default_term, parse_term
+from .admin_controller import is_admin_request
 
 export_bp = Blueprint('export_bp', __name__)
 
-@export_bp.route('/apple-calendar', methods=['POST'])
-def export_to_apple_calendar():
+MAX_BATCH_PDFS = 500
+
+def _request_term():
+    """
+    (term, requested) from ?term= or the JSON body's "term"/"semester" ("Fall 2025"),
+    the default term when none is given; term is None when the value names no known term.
+    """
+    data = request.get_json(silent=True) or {}
+    requested = request.args.get('term') or data.get('term') or data.get('semester') or default_term()
+    term = parse_term(requested)
+    if term is None or term_dates(term) is None:
+        return None, requested
+    return term, requested
+
+def _file_response(etag, chunks, mimetype, filename):
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _calendar_response():
+    """
+    The signed-in user's enrolled sections for a term as an .ics file.
+    """
+    user_id = bearer_user_id(request.headers.get('Authorization'))
+    if user_id is None:
+        return jsonify({"error": "Authentication required"}), 401
+    term, requested = _request_term()
+    if term is None:
+        return jsonify({"error": f"Unknown term '{requested}'"}), 400
+
     try:
-        return jsonify({"success": "Calendar export initiated"}), 200
+        etag, chunks = user_calendar(user_id, term)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        print(f"Error exporting calendar: {str(e)}")
+        return jsonify({"error": "Failed to export calendar"}), 500
+    return _file_response(etag, chunks, ICS_MIMETYPE, f"GU_Schedule_{term.replace(' ', '_')}.ics")
+
+@export_bp.route('/apple-calendar', methods=['GET', 'POST'])
+def export_to_apple_calendar():
+    return _calendar_response()
 
-@export_bp.route('/google-calendar', methods=['POST'])
+@export_bp.route('/google-calendar', methods=['GET', 'POST'])
 def export_to_google_calendar():
+    # Google Calendar imports the same file (Settings > Import & export).
+    return _calendar_response()
+
+@export_bp.route('/pdf', methods=['GET', 'POST'])
+def export_to_pdf():
+    """
+    The signed-in user's weekly grid for a term as a vector PDF.
+    """
+    user_id = bearer_user_id(request.headers.get('Authorization'))
+    if user_id is None:
+        return jsonify({"error": "Authentication required"}), 401
+    term, requested = _request_term()
+    if term is None:
+        return jsonify({"error": f"Unknown term '{requested}'"}), 400
+
     try:
-        return jsonify({"success": "Calendar export initiated"}), 200
+        etag, chunks = schedule_pdf(user_id, term)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500 
\ No newline at end of file
+        print(f"Error exporting PDF: {str(e)}")
+        return jsonify({"error": "Failed to export PDF"}), 500
+    return _file_response(etag, chunks, PDF_MIMETYPE, f"GU_Schedule_{term.replace(' ', '_')}.pdf")
+
+@export_bp.route('/pdf/batch', methods=['POST'])
+def export_pdf_batch():
+    """
+    Schedules of many students as one ZIP of PDFs, for advisors.
+    Requires X-Admin-Token. Body: {"student_ids": [1, 2, ...], "term": "Fall 2025"}
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+    data = request.get_json(silent=True) or {}
+    try:
+        student_ids = list(dict.fromkeys(int(sid) for sid in data.get('student_ids') or []))
+    except (TypeError, ValueError):
+        return jsonify({"error": "student_ids must be a list of integers"}), 400
+    if not student_ids:
+        return jsonify({"error": "student_ids is required"}), 400
+    if len(student_ids) > MAX_BATCH_PDFS:
+        return jsonify({"error": f"At most {MAX_BATCH_PDFS} students per archive"}), 400
+    term, requested = _request_term()
+    if term is None:
+        return jsonify({"error": f"Unknown term '{requested}'"}), 400
+
+    response = Response(stream_with_context(schedule_pdf_archive(student_ids, term)), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename="GU_Schedules_{term.replace(" ", "_")}.zip"'
+    return response
@@ -0,0 +1,40 @@
+from flask import Blueprint, jsonify, request, send_file
+from services.floor_plans import TILE_FORMATS, TilesUnavailable, list_floor_plans, page_tile, tile_width
+
+floor_plans_bp = Blueprint('floor_plans_bp', __name__)
+
+TILE_MAX_AGE = 24 * 60 * 60
+
+@floor_plans_bp.route('/', methods=['GET'])
+def get_floor_plans():
+    """
+    Floor plans with their (range-servable) PDF URL, page count and tile options.
+    """
+    try:
+        return jsonify(list_floor_plans())
+    except Exception as e:
+        print(f"Error listing floor plans: {str(e)}")
+        return jsonify({"error": "Failed to list floor plans"}), 500
+
+@floor_plans_bp.route('/<plan>/pages/<int:page>.<fmt>', methods=['GET'])
+def get_floor_plan_tile(plan, page, fmt):
+    """
+    One page of a floor plan as a PNG or WebP image, for mobile clients.
+    ?width=<px> is rounded up to the nearest pre-rendered width.
+    """
+    try:
+        width = request.args.get('width')
+        width = int(width) if width else None
+    except ValueError:
+        return jsonify({"error": "width must be an integer"}), 400
+
+    try:
+        path = page_tile(plan, page, tile_width(width), fmt)
+    except TilesUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print(f"Error rendering floor plan tile: {str(e)}")
+        return jsonify({"error": "Failed to render floor plan page"}), 500
+    if path is None:
+        return jsonify({"error": "Floor plan page not found"}), 404
+    return send_file(path, mimetype=TILE_FORMATS[fmt], conditional=True, max_age=TILE_MAX_AGE)
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.requirements_service import get_merged_requirements_for_student
+from services.cohort_audit_service import MAX_COHORT_SIZE, get_cohort_requirements_audit
+from .admin_controller import is_admin_request
 
 requirements_bp = Blueprint('requirements_bp', __name__)
 
@@ -39,8 +41,7 @@ def get_student_requirements():
             student_id=student_id,
             major_program_name=major_program,
             core_program_name=core_program,
-            full_view=False,
-            debug=False
+            full_view=False
         )
         
         return jsonify(result), 200
@@ -50,4 +51,76 @@ def get_student_requirements():
         return jsonify({
             'error': 'Internal server error',
             'message': 'An error occurred while retrieving student requirements'
-        }), 500 
\ No newline at end of file
+        }), 500
+
+@requirements_bp.route('/cohort-audit', methods=['GET'])
+def get_cohort_audit():
+    """
+    Core and major progress for every student in a cohort, computed in bulk.
+    Requires X-Admin-Token (academic records of many students).
+
+    Query Parameters:
+        major_program: str - The major program name
+        core_program: str (optional) - The core program name (defaults to "University Core Requirements")
+        student_ids: str (optional) - Comma-separated student IDs, at most 500;
+                     defaults to one page of the students with enrollments
+        after: int (optional) - Page cursor: the "next" value of the previous page
+        limit: int (optional) - Students per page (1-500, default 500)
+
+    Returns:
+        JSON with one core/major requirements entry per student and the "next" page cursor
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Forbidden"}), 403
+    try:
+        major_program = request.args.get('major_program')
+        core_program = request.args.get('core_program', 'University Core Requirements')
+        raw_ids = request.args.get('student_ids')
+
+        if not major_program:
+            return jsonify({
+                'error': 'Missing required parameters',
+                'message': 'major_program is required'
+            }), 400
+
+        student_ids = None
+        if raw_ids:
+            try:
+                student_ids = [int(x) for x in raw_ids.split(',') if x.strip()]
+            except ValueError:
+                return jsonify({
+                    'error': 'Invalid parameter',
+                    'message': 'student_ids must be a comma-separated list of integers'
+                }), 400
+            if len(set(student_ids)) > MAX_COHORT_SIZE:
+                return jsonify({
+                    'error': 'Invalid parameter',
+                    'message': f'At most {MAX_COHORT_SIZE} student_ids per audit'
+                }), 400
+
+        try:
+            after = request.args.get('after') or None
+            after = int(after) if after is not None else None
+            limit = min(max(int(request.args.get('limit') or MAX_COHORT_SIZE), 1), MAX_COHORT_SIZE)
+        except ValueError:
+            return jsonify({
+                'error': 'Invalid parameter',
+                'message': 'after and limit must be integers'
+            }), 400
+
+        result = get_cohort_requirements_audit(
+            major_program_name=major_program,
+            core_program_name=core_program,
+            student_ids=student_ids,
+            after=after,
+            limit=limit
+        )
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        print(f"Error getting cohort audit: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': 'An error occurred while retrieving the cohort audit'
+        }), 500
@@ -1,22 +1,88 @@
 
 from flask import Blueprint, request, jsonify
-from services.section_service import search_sections
+from services.section_service import search_sections, check_section_conflicts, check_final_exams
+from services.response_cache import cached_response
+from services.term_catalog import cached_terms
+from services.terms import current_term, default_term, resolve_term
 
 section_bp = Blueprint('section_bp', __name__)
 
 @section_bp.route('/search', methods=['GET'])
+@cached_response
 def search():
     """
     Endpoint for filtering sections in real time.
     Example of usage (query params):
-    GET /sections/search?subject=CPSC&course_code=101&attribute=Core&instructor=Smith
+    GET /sections/search?subject=CPSC&course_code=101&attribute=Core&instructor=Smith&term=Spring 2026
+    Without term, the default (registration) term is searched.
     """
     subject = request.args.get('subject')
     course_code = request.args.get('course_code')
     attribute = request.args.get('attribute')
     instructor = request.args.get('instructor')
 
-    term = "Fall 2025"
+    term = resolve_term(request.args.get('term'))
+    if term is None:
+        return jsonify({"error": "term must look like 'Fall 2025'"}), 400
 
     result = search_sections(subject, course_code, attribute, instructor, term)
     return jsonify(result), 200
+
+
+@section_bp.route('/conflicts', methods=['GET'])
+def conflicts():
+    """
+    Checks a list of sections for overlapping meeting times.
+    Example of usage (query params):
+    GET /sections_bp/conflicts?crns=12345,12346,12400&term=Fall 2025
+    """
+    crns = [c.strip() for c in request.args.get('crns', '').split(',') if c.strip()]
+    if not crns:
+        return jsonify({"error": "crns is required"}), 400
+
+    term = resolve_term(request.args.get('term'))
+    if term is None:
+        return jsonify({"error": "term must look like 'Fall 2025'"}), 400
+
+    try:
+        result = check_section_conflicts(crns, term)
+    except Exception as e:
+        print(f"Error checking section conflicts: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+    return jsonify(result), 200
+
+
+@section_bp.route('/finals', methods=['GET'])
+def finals():
+    """
+    Final exam times of a schedule and the exams that fall into the same slot.
+    Example of usage (query params):
+    GET /sections_bp/finals?crns=12345,12346,12400&term=Fall 2025
+    """
+    crns = [c.strip() for c in request.args.get('crns', '').split(',') if c.strip()]
+    if not crns:
+        return jsonify({"error": "crns is required"}), 400
+
+    term = resolve_term(request.args.get('term'))
+    if term is None:
+        return jsonify({"error": "term must look like 'Fall 2025'"}), 400
+
+    try:
+        result = check_final_exams(crns, term)
+    except Exception as e:
+        print(f"Error checking final exams: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+    return jsonify(result), 200
+
+
+@section_bp.route('/terms', methods=['GET'])
+def terms():
+    """
+    Term used when a request names none, the term in session, and the terms
+    whose catalogs this worker currently holds.
+    """
+    return jsonify({
+        "default": default_term(),
+        "current": current_term(),
+        "cached": cached_terms()
+    }), 200
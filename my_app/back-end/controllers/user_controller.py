@@ -1,12 +1,30 @@
 
 from flask import Blueprint, request, jsonify
-from services.user_service import create_user, check_login, add_class_enrollment, get_user_enrollments
-from .combo import get_merged_requirements_for_student, plan_next_semester_bruteforce
+from services.user_service import create_user, check_login, add_class_enrollment, add_class_enrollments, get_user_enrollments
+from services.password_hasher import PasswordHasherBusy
+from services.session_tokens import issue_session_token, bearer_user_id
+from services.terms import resolve_term
+from .combo import get_merged_requirements_for_student
+from services.schedule_optimizer import NEXT_SEMESTER_PLAN_TIME_BUDGET, plan_schedule_options
 import re
 from .get_prerequisites_utils import get_course_prerequisites
 
 user_bp = Blueprint('user_bp', __name__)
 
+MAX_BULK_ENROLLMENTS = 50
+
+def _session_user_id():
+    """
+    user_id from the "Authorization: Bearer <token>" header issued at login, or None.
+    """
+    return bearer_user_id(request.headers.get('Authorization'))
+
+def _busy_response(e: PasswordHasherBusy):
+    response = jsonify({"error": str(e)})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
 @user_bp.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -18,7 +36,10 @@ def register():
     if not user_name or not email or not password or not name:
         return jsonify({"error": "Missing required fields (user_name, email, password, name)"}), 400
 
-    result = create_user(user_name, email, password, name)
+    try:
+        result = create_user(user_name, email, password, name)
+    except PasswordHasherBusy as e:
+        return _busy_response(e)
     if "error" in result:
         return jsonify(result), 400
     return jsonify(result), 201
@@ -32,16 +53,26 @@ def login():
     if not user_name or not password:
         return jsonify({"error": "Missing user_name or password"}), 400
 
-    result = check_login(user_name, password)
+    try:
+        result = check_login(user_name, password)
+    except PasswordHasherBusy as e:
+        return _busy_response(e)
     if "error" in result:
         return jsonify(result), 401
+    result["token"] = issue_session_token(result["data"]["user_id"])
     return jsonify(result), 200
 
 @user_bp.route('/add_class', methods=['POST'])
 def add_class():
+    user_id = _session_user_id()
+    if user_id is None:
+        return jsonify({"error": "Authentication required"}), 401
     data = request.get_json()
+    body_user_id = data.get('user_id')
+    if body_user_id is not None and str(body_user_id) != str(user_id):
+        return jsonify({"error": "Cannot add classes for another user"}), 403
     result = add_class_enrollment(
-        user_id=data.get('user_id'),
+        user_id=user_id,
         in_process=data.get('in_process', False),
         section_id=data.get('section_id'),
         crn=data.get('crn'),
@@ -53,8 +84,44 @@ def add_class():
         return jsonify(result), 400
     return jsonify(result), 200
 
+@user_bp.route('/add_classes', methods=['POST'])
+def add_classes():
+    """
+    Body: {"items": [{"section_id" | "crn" | "course_id"+"term"+"section", "in_process"?}, ...]}.
+    Returns one {"success"} / {"error"} per item, in the same order.
+    """
+    user_id = _session_user_id()
+    if user_id is None:
+        return jsonify({"error": "Authentication required"}), 401
+    data = request.get_json(silent=True) or {}
+    body_user_id = data.get('user_id')
+    if body_user_id is not None and str(body_user_id) != str(user_id):
+        return jsonify({"error": "Cannot add classes for another user"}), 403
+    items = data.get('items')
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify({"error": "items must be a non-empty list of objects"}), 400
+    if len(items) > MAX_BULK_ENROLLMENTS:
+        return jsonify({"error": f"At most {MAX_BULK_ENROLLMENTS} items per request"}), 400
+
+    try:
+        results = add_class_enrollments(user_id, items)
+    except Exception as e:
+        print(f"Error adding classes: {str(e)}")
+        return jsonify({"error": "Failed to add classes"}), 500
+    enrolled = sum(1 for result in results if 'success' in result)
+    return jsonify({
+        "results": results,
+        "enrolled": enrolled,
+        "failed": len(results) - enrolled
+    }), 200
+
 @user_bp.route('/<int:user_id>/enrollments', methods=['GET'])
 def get_user_enrollments_route(user_id):
+    session_user_id = _session_user_id()
+    if session_user_id is None:
+        return jsonify({"error": "Authentication required"}), 401
+    if session_user_id != user_id:
+        return jsonify({"error": "Cannot view another user's enrollments"}), 403
     result = get_user_enrollments(user_id)
     return jsonify(result)
 
@@ -66,8 +133,7 @@ def get_next_requirements(user_id):
         student_id=user_id,
         major_program_name=major,
         core_program_name=core,
-        full_view=False,
-        debug=False
+        full_view=False
     )
     return jsonify(result)
 
@@ -75,18 +141,55 @@ def get_next_requirements(user_id):
 def get_next_semester_plan(user_id):
     major = request.args.get('major', 'B.S. Computer Science - Data Science Concentration')
     core = request.args.get('core', 'University Core Requirements')
-    term = request.args.get('term', 'Fall 2025')
+    term = resolve_term(request.args.get('term'))
+    if term is None:
+        return jsonify({"error": "term must look like 'Fall 2025'"}), 400
     max_credits = int(request.args.get('max_credits', 18))
-    plan = plan_next_semester_bruteforce(
+    result = plan_schedule_options(
         student_id=user_id,
         major_program_name=major,
         core_program_name=core,
         next_term=term,
         max_credits_per_semester=max_credits,
-        debug=True
+        top_k=1,
+        time_budget=NEXT_SEMESTER_PLAN_TIME_BUDGET
     )
+    plan = result["options"][0]["courses"] if result["options"] else []
     return jsonify(plan)
 
+@user_bp.route('/<int:user_id>/schedule_options', methods=['GET'])
+def get_schedule_options(user_id):
+    major = request.args.get('major', 'B.S. Computer Science - Data Science Concentration')
+    core = request.args.get('core', 'University Core Requirements')
+    term = resolve_term(request.args.get('term'))
+    if term is None:
+        return jsonify({"error": "term must look like 'Fall 2025'"}), 400
+    try:
+        max_credits = int(request.args.get('max_credits', 18))
+        target_credits = request.args.get('target_credits')
+        target_credits = int(target_credits) if target_credits else None
+        top_k = int(request.args.get('top_k', 5))
+        time_budget_ms = request.args.get('time_budget_ms')
+        time_budget_ms = int(time_budget_ms) if time_budget_ms else None
+    except ValueError:
+        return jsonify({"error": "max_credits, target_credits, top_k and time_budget_ms must be integers"}), 400
+
+    options = {}
+    if time_budget_ms is not None:
+        options["time_budget"] = max(0, min(time_budget_ms, 10000)) / 1000.0
+
+    result = plan_schedule_options(
+        student_id=user_id,
+        major_program_name=major,
+        core_program_name=core,
+        next_term=term,
+        max_credits_per_semester=max_credits,
+        target_credits=target_credits,
+        top_k=max(1, min(top_k, 20)),
+        **options
+    )
+    return jsonify(result)
+
 def get_course_level(course_code):
     m = re.match(r"([A-Z]+)\s*(\d+)", course_code)
     if not m:
@@ -0,0 +1,36 @@
+"""
+gunicorn settings, read from the working directory by `gunicorn app:app` (see Procfile).
+
+GUNICORN_PRELOAD=1 imports the app once in the master and warms the caches there
+(APP_WARMUP=sync) before the workers are forked, so the workers share the static
+assets, search and prerequisite indexes and term catalog copy-on-write instead of
+each building its own. Supabase clients and thread pools are still per worker:
+the services drop the master's copies after the fork (os.register_at_fork).
+
+Without preload, each worker starts the APP_WARMUP warmup (background threads
+by default) once it has loaded the app. Importing `app` itself never warms.
+"""
+import gc
+import os
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+if preload_app:
+    os.environ.setdefault("APP_WARMUP", "sync")
+
+
+def when_ready(server):
+    if preload_app:
+        from app import APP_WARMUP, start_warmup
+        # Threads do not survive the fork, so the master always warms synchronously.
+        start_warmup("off" if APP_WARMUP == "off" else "sync")
+        # Moves the warmed objects out of the cyclic GC's reach, so collections in
+        # the workers do not write to (and thereby copy) the shared pages.
+        gc.freeze()
+        server.log.info("Preloaded app; %d objects frozen for the workers", gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from app import start_warmup
+        start_warmup()
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+from services.repository import fetch_in, supabase
+from services.meeting_times import parse_time_slot
+from services.response_cache import BytesCache
+
+ICS_CACHE_SIZE = int(os.getenv("ICS_CACHE_SIZE", "1024"))
+ICS_MIMETYPE = "text/calendar"
+# Bump when the generated file changes shape, so cached files and client ETags are dropped.
+ICS_FORMAT_VERSION = "1"
+
+CALENDAR_TZID = "America/Los_Angeles"
+PRODID = "-//Gonzaga University//GU Smart Enroll//EN"
+# Columns that appear in a VEVENT; the calendar's version is a hash of exactly these.
+_CALENDAR_FIELDS = ("section_id", "course_id", "subject", "course_code", "section", "crn",
+                    "instructor_id", "classroom", "days", "time_slot")
+
+# RFC 5545 definition of US Pacific time (rules in effect since 2007).
+_VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    f"TZID:{CALENDAR_TZID}",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:-0800",
+    "TZOFFSETTO:-0700",
+    "TZNAME:PDT",
+    "DTSTART:19700308T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:-0700",
+    "TZOFFSETTO:-0800",
+    "TZNAME:PST",
+    "DTSTART:19701101T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+)
+
+# Same term ranges as getSemesterDates in interface/js/utility.js: (start month, day), (end month, day).
+TERM_DATES = {
+    "Spring": ((1, 15), (5, 15)),
+    "Summer": ((5, 20), (8, 10)),
+    "Fall": ((8, 20), (12, 15)),
+}
+
+_BYDAY = {"M": "MO", "T": "TU", "W": "WE", "R": "TH", "F": "FR", "S": "SA", "U": "SU"}
+_WEEKDAY = {"M": 0, "T": 1, "W": 2, "R": 3, "F": 4, "S": 5, "U": 6}
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    # n-th given weekday of the month; n = -1 is the last one.
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def term_holidays(season: str, year: int) -> List[date]:
+    """
+    Days without classes in a term; they become EXDATEs of the weekly meetings.
+    """
+    if season == "Fall":
+        thanksgiving = _nth_weekday(year, 11, 3, 4)
+        return [_nth_weekday(year, 9, 0, 1)] + [thanksgiving + timedelta(days=d) for d in (-1, 0, 1)]
+    if season == "Spring":
+        spring_break = _nth_weekday(year, 3, 0, 2)
+        return [_nth_weekday(year, 1, 0, 3), _nth_weekday(year, 2, 0, 3)] + \
+            [spring_break + timedelta(days=d) for d in range(5)]
+    if season == "Summer":
+        return [_nth_weekday(year, 5, 0, -1), date(year, 7, 4)]
+    return []
+
+
+def term_dates(term: str) -> Optional[Tuple[date, date]]:
+    season, _, year = term.partition(" ")
+    if season not in TERM_DATES or not year.isdigit():
+        return None
+    (start_month, start_day), (end_month, end_day) = TERM_DATES[season]
+    return date(int(year), start_month, start_day), date(int(year), end_month, end_day)
+
+
+def _pacific_utc_offset(moment: datetime) -> timedelta:
+    # Matches _VTIMEZONE: daylight time from the 2nd Sunday of March to the 1st Sunday of November, 2:00.
+    dst_start = datetime.combine(_nth_weekday(moment.year, 3, 6, 2), datetime.min.time()) + timedelta(hours=2)
+    dst_end = datetime.combine(_nth_weekday(moment.year, 11, 6, 1), datetime.min.time()) + timedelta(hours=2)
+    return timedelta(hours=-7) if dst_start <= moment < dst_end else timedelta(hours=-8)
+
+
+def _escape(text) -> str:
+    return str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line: str) -> str:
+    """
+    RFC 5545 line folding: at most 75 octets per line, continuation lines start with a space.
+    """
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1  # do not split a UTF-8 sequence
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _local(day: date, minutes: int) -> str:
+    return f"{day:%Y%m%d}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def section_vevent(section: dict, term: str, dtstamp: str) -> Optional[List[str]]:
+    """
+    One VEVENT for all weekly meetings of a section over the term: an RRULE on the
+    section's weekdays and an EXDATE for every holiday meeting. None for TBA sections.
+    """
+    dates = term_dates(term)
+    span = parse_time_slot(section.get("time_slot"))
+    days = [ch for ch in (section.get("days") or "").upper() if ch in _BYDAY]
+    if dates is None or span is None or not days:
+        return None
+    start_date, end_date = dates
+    weekdays = {_WEEKDAY[ch] for ch in days}
+
+    first = start_date
+    while first.weekday() not in weekdays:
+        first += timedelta(days=1)
+    if first > end_date:
+        return None
+
+    last_local = datetime.combine(end_date, datetime.min.time()) + timedelta(hours=23, minutes=59, seconds=59)
+    until = (last_local - _pacific_utc_offset(last_local)).strftime("%Y%m%dT%H%M%SZ")
+    season, _, year = term.partition(" ")
+    exdates = [
+        _local(day, span[0]) for day in term_holidays(season, int(year))
+        if first <= day <= end_date and day.weekday() in weekdays
+    ]
+
+    course = section.get("course_id") or f"{section.get('subject', '')} {section.get('course_code', '')}".strip()
+    summary = f"{course}-{section['section']}" if section.get("section") else course
+    description = [f"{course} - {term}"]
+    if section.get("crn"):
+        description.append(f"CRN {section['crn']}")
+    if section.get("instructor_id"):
+        description.append(f"Instructor: {section['instructor_id']}")
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:section-{section.get('section_id')}-{term.replace(' ', '').lower()}@gu-smart-enroll",
+        f"DTSTAMP:{dtstamp}",
+        f"SUMMARY:{_escape(summary)}",
+        f"LOCATION:{_escape(section.get('classroom') or 'Gonzaga University')}",
+        f"DESCRIPTION:{_escape(chr(10).join(description))}",
+        f"DTSTART;TZID={CALENDAR_TZID}:{_local(first, span[0])}",
+        f"DTEND;TZID={CALENDAR_TZID}:{_local(first, span[1])}",
+        f"RRULE:FREQ=WEEKLY;BYDAY={','.join(_BYDAY[ch] for ch in days)};UNTIL={until}",
+    ]
+    if exdates:
+        lines.append(f"EXDATE;TZID={CALENDAR_TZID}:{','.join(exdates)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def generate_ics(sections: List[dict], term: str) -> Iterator[bytes]:
+    """
+    The calendar file as a stream of chunks: header, one VEVENT per section, footer.
+    """
+    dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    head = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH", f"X-WR-CALNAME:{_escape(f'GU Schedule {term}')}", f"X-WR-TIMEZONE:{CALENDAR_TZID}"]
+    yield "".join(_fold(line) for line in head + list(_VTIMEZONE)).encode("utf-8")
+    for section in sorted(sections, key=lambda s: (str(s.get("course_id")), str(s.get("section")))):
+        lines = section_vevent(section, term, dtstamp)
+        if lines:
+            yield "".join(_fold(line) for line in lines).encode("utf-8")
+    yield _fold("END:VCALENDAR").encode("utf-8")
+
+
+def enrolled_section_ids(user_id: int) -> List:
+    rows = supabase.table("enrollments").select("section_id").eq("user_id", user_id).execute().data or []
+    return sorted({row["section_id"] for row in rows}, key=str)
+
+
+def enrolled_sections(section_ids: List, term: str) -> List[dict]:
+    return fetch_in("sections", "*", "section_id", section_ids, where={"term": term})
+
+
+def calendar_version(sections: List[dict], term: str) -> str:
+    """
+    Hash of everything the calendar shows: it changes when a class is added or
+    dropped and when a section's time, room or instructor is edited.
+    """
+    rows = sorted(json.dumps([s.get(field) for field in _CALENDAR_FIELDS], default=str) for s in sections)
+    payload = json.dumps([ICS_FORMAT_VERSION, term, rows])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Keyed by content version: any change to the shown sections makes a new key, so entries are never invalidated.
+_ics_cache = BytesCache(ICS_CACHE_SIZE)
+
+
+def calendar_etag(user_id: int, term: str, version: str) -> str:
+    return hashlib.sha256(f"{ICS_FORMAT_VERSION}:{user_id}:{term}:{version}".encode("utf-8")).hexdigest()[:32]
+
+
+def user_calendar(user_id: int, term: str) -> Tuple[str, Iterator[bytes]]:
+    """
+    (etag, chunks) of the user's calendar for a term. A cached file is returned whole;
+    otherwise the file is generated while it is being sent and cached once complete.
+    """
+    sections = enrolled_sections(enrolled_section_ids(user_id), term)
+    version = calendar_version(sections, term)
+    key = (version,)
+    etag = calendar_etag(user_id, term, version)
+
+    body = _ics_cache.get(key)
+    if body is not None:
+        return etag, iter((body,))
+
+    def stream() -> Iterator[bytes]:
+        chunks = []
+        for chunk in generate_ics(sections, term):
+            chunks.append(chunk)
+            yield chunk
+        _ics_cache.put(key, b"".join(chunks))
+
+    return etag, stream()
@@ -0,0 +1,222 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from services.repository import PAGE_SIZE, fetch_in, supabase
+from services.requirements_service import get_program_requirements
+from services.term_catalog import parse_core_attributes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Students per audit: an explicit list may not be longer, the implicit cohort is paged by it.
+MAX_COHORT_SIZE = 500
+
+
+def enrolled_student_page(after: Optional[int] = None, limit: int = MAX_COHORT_SIZE) -> Tuple[List[int], Optional[int]]:
+    """
+    Keyset page of the students with enrollments: up to `limit` user ids greater
+    than `after`, ascending, and the cursor of the next page (None after the last).
+    Only the enrollment rows of these students (plus at most one page) are read.
+    """
+    student_ids: List[int] = []
+    start = 0
+    while True:
+        query = supabase.table("enrollments").select("user_id").order("user_id,section_id")
+        if after is not None:
+            query = query.gt("user_id", after)
+        page = query.range(start, start + PAGE_SIZE - 1).execute().data or []
+        for row in page:
+            if not student_ids or student_ids[-1] != row["user_id"]:
+                if len(student_ids) == limit:
+                    return student_ids, student_ids[-1]
+                student_ids.append(row["user_id"])
+        if len(page) < PAGE_SIZE:
+            return student_ids, None
+        start += PAGE_SIZE
+
+
+def _credit_vector(values: list) -> "np.ndarray":
+    import numpy as np
+    if all(isinstance(v, int) for v in values):
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=np.float64)
+
+
+def get_cohort_requirements_audit(
+    major_program_name: str,
+    core_program_name: str = "University Core Requirements",
+    student_ids: Optional[List[int]] = None,
+    after: Optional[int] = None,
+    limit: int = MAX_COHORT_SIZE
+) -> dict:
+    """
+    Core/Major progress for a whole cohort in one pass.
+
+    Enrollments, sections and course credits for the cohort are fetched in
+    bulk and turned into boolean student x course and student x section
+    incidence matrices. Taken credits for every requirement group are then
+    matrix-vector products, so the per-student result is identical to
+    get_merged_requirements_for_student without N x groups round-trips.
+
+    :param major_program_name: Major program name (programs.degree_program)
+    :param core_program_name:  Core program name
+    :param student_ids:        Students to audit (at most MAX_COHORT_SIZE); if omitted, one page
+                               of the students with enrollments (see enrolled_student_page)
+    :param after, limit:       Cursor and size of that page
+    :return: {"major_program": ..., "core_program": ..., "students": [
+                 {"student_id": ..., "core_requirements": {...}, "major_requirements": {...}}, ...],
+              "next": cursor of the next page, or None}
+    """
+    # numpy is imported on first use, so importing this module (e.g. for MAX_COHORT_SIZE) stays cheap.
+    import numpy as np
+
+    next_cursor = None
+    if student_ids is None:
+        student_ids, next_cursor = enrolled_student_page(after, limit)
+    else:
+        student_ids = list(dict.fromkeys(student_ids))
+        if len(student_ids) > MAX_COHORT_SIZE:
+            raise ValueError(f"At most {MAX_COHORT_SIZE} students per audit")
+    enrollments = fetch_in("enrollments", "user_id, section_id", "user_id", student_ids, order=("section_id",)) if student_ids else []
+
+    section_ids = sorted({row["section_id"] for row in enrollments})
+    sections = {
+        row["section_id"]: row
+        for row in fetch_in("sections", "section_id, course_id, term, section, attribute", "section_id", section_ids)
+    }
+
+    # Students without enrollments get the same empty result as the per-student function.
+    enrolled_students = {row["user_id"] for row in enrollments}
+
+    # Section instances are keyed by (course_id, term, section), as in the per-student evaluation.
+    instance_index: Dict[tuple, int] = {}
+    instance_attrs: List[List[str]] = []
+    course_index: Dict[str, int] = {}
+    student_instances: Dict[int, set] = {sid: set() for sid in student_ids}
+    for row in enrollments:
+        sec = sections.get(row["section_id"])
+        if sec is None:
+            continue
+        key = (sec["course_id"], sec["term"], sec["section"])
+        k = instance_index.get(key)
+        if k is None:
+            k = instance_index[key] = len(instance_attrs)
+            instance_attrs.append([])
+        instance_attrs[k] = parse_core_attributes(sec.get("attribute"))
+        course_index.setdefault(sec["course_id"], len(course_index))
+        student_instances[row["user_id"]].add(k)
+
+    core_program = get_program_requirements(core_program_name)
+    major_program = get_program_requirements(major_program_name)
+
+    courses = list(course_index)
+    course_credits = {}
+    if (core_program or major_program) and courses:
+        course_credits = {
+            row["code"]: row["credits"]
+            for row in fetch_in("courses", "code, credits", "code", courses)
+        }
+
+    instance_keys = list(instance_index)
+    instance_course = np.array([course_index[key[0]] for key in instance_keys], dtype=np.int64)
+    credit_values = [course_credits.get(code, 0) for code in courses]
+    credit_by_course = _credit_vector(credit_values)
+    credit_by_instance = credit_by_course[instance_course] if len(instance_keys) else credit_by_course[:0]
+
+    n_students, n_instances, n_courses = len(student_ids), len(instance_keys), len(courses)
+    taken_instances = np.zeros((n_students, n_instances), dtype=bool)
+    for i, sid in enumerate(student_ids):
+        taken_instances[i, list(student_instances[sid])] = True
+    taken_courses = np.zeros((n_students, n_courses), dtype=bool)
+    if n_instances:
+        rows, cols = np.nonzero(taken_instances)
+        taken_courses[rows, instance_course[cols]] = True
+
+    def course_mask(codes) -> np.ndarray:
+        mask = np.zeros(n_courses, dtype=bool)
+        for code in codes:
+            c = course_index.get(code)
+            if c is not None:
+                mask[c] = True
+        return mask
+
+    def courses_of(matrix_row: np.ndarray) -> List[str]:
+        return sorted(courses[c] for c in np.flatnonzero(matrix_row))
+
+    def courses_of_instances(matrix_row: np.ndarray) -> List[str]:
+        return sorted({courses[instance_course[k]] for k in np.flatnonzero(matrix_row)})
+
+    core_results: List[dict] = [{} for _ in student_ids]
+    if core_program is not None:
+        for group in core_program.groups:
+            if group.is_core:
+                attr = group.expected_attribute
+                instance_mask = np.array(
+                    [bool(attr) and attr in attrs for attrs in instance_attrs], dtype=bool
+                )
+                available_val = f"CORE {group.required_credits}"
+            else:
+                instance_mask = course_mask(group.course_codes)[instance_course] if n_instances \
+                    else np.zeros(0, dtype=bool)
+                available_val = None
+            allocated = taken_instances & instance_mask
+            taken_credits = allocated @ credit_by_instance if n_instances else np.zeros(n_students, dtype=np.int64)
+            for i in range(n_students):
+                credits = taken_credits[i].item()
+                core_results[i][group.name] = {
+                    "json_id": group.json_id,
+                    "required_credits": group.required_credits,
+                    "taken_credits": credits,
+                    "remaining_credits": max(0, group.required_credits - credits),
+                    "taken_courses_in_group": courses_of_instances(allocated[i]),
+                    "available_courses": available_val if group.is_core else list(group.sorted_course_codes),
+                    "expected_attribute": group.expected_attribute
+                }
+
+    major_results: List[dict] = [{} for _ in student_ids]
+    if major_program is not None:
+        processed_groups = []
+        for group in major_program.groups:
+            allowed = np.zeros((n_students, n_courses), dtype=bool)
+            excluded = np.zeros((n_students, n_courses), dtype=bool)
+            for prev_json_id, prev_allocated in processed_groups:
+                if prev_json_id in group.double_count_groups:
+                    allowed |= prev_allocated
+                else:
+                    excluded |= prev_allocated
+
+            potential = course_mask(group.course_codes)
+            allocated = taken_courses & potential & (~excluded | allowed)
+            taken_credits = allocated @ credit_by_course
+            processed_groups.append((group.json_id, allocated))
+
+            for i in range(n_students):
+                credits = taken_credits[i].item()
+                # available - allocated == potential - taken, since allocations only hold taken courses
+                taken_row = taken_courses[i]
+                major_results[i][group.name] = {
+                    "json_id": group.json_id,
+                    "required_credits": group.required_credits,
+                    "taken_credits": credits,
+                    "remaining_credits": max(0, group.required_credits - credits),
+                    "taken_courses_in_group": courses_of(allocated[i]),
+                    "available_courses": [
+                        code for code in group.sorted_course_codes
+                        if code not in course_index or not taken_row[course_index[code]]
+                    ],
+                    "double_count_groups": sorted(group.double_count_groups)
+                }
+
+    students = []
+    for i, sid in enumerate(student_ids):
+        enrolled = sid in enrolled_students
+        students.append({
+            "student_id": sid,
+            "core_requirements": core_results[i] if enrolled else {},
+            "major_requirements": major_results[i] if enrolled else {}
+        })
+
+    return {
+        "major_program": major_program_name,
+        "core_program": core_program_name,
+        "students": students,
+        "next": next_cursor
+    }
@@ -0,0 +1,276 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from services.repository import supabase
+from services.records import CourseRecord, intern_text
+from services.term_catalog import parse_core_attributes
+
+COURSE_SEARCH_TTL = float(os.getenv("COURSE_SEARCH_TTL", "300"))
+PAGE_SIZE = 1000
+MAX_PREFIX_LENGTH = 16
+GRAM_SIZE = 2
+DEFAULT_LIMIT = 25
+
+# Field weights: a hit on the course code outranks a hit in the title,
+# which outranks instructor/attribute hits; prefix hits outrank infix hits.
+FIELD_WEIGHTS = {
+    "subject": 8.0,
+    "course_code": 8.0,
+    "title": 4.0,
+    "instructor": 2.0,
+    "attribute": 1.0,
+}
+INFIX_FACTOR = 0.25
+EXACT_CODE_BONUS = 100.0
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+[a-z]*")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Lower-cased word tokens; letters and digits are split, so "CPSC122" -> ["cpsc", "122"].
+    """
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _grams(token: str) -> Set[str]:
+    return {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+def _fetch_all(table: str, columns: str, order_by: str) -> List[dict]:
+    rows = []
+    start = 0
+    while True:
+        page = supabase.table(table).select(columns).order(order_by) \
+            .range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+class _CourseDoc:
+    """
+    One indexed course: its record (returned to the client as a row dict) and
+    the token -> weight map that was put into the postings.
+    """
+
+    __slots__ = ("code", "record", "tokens")
+
+    def __init__(self, code: str, record: CourseRecord, tokens: Dict[str, float]):
+        self.code = code
+        self.record = record
+        self.tokens = tokens
+
+
+def _build_doc(row: dict, instructors: Set[str], attributes: Set[str]) -> _CourseDoc:
+    tokens: Dict[str, float] = {}
+
+    def add(text, weight):
+        for token in tokenize(text):
+            if tokens.get(token, 0.0) < weight:
+                # Tokens like "cpsc" repeat across hundreds of courses and postings.
+                tokens[intern_text(token)] = weight
+
+    add(row.get("subject"), FIELD_WEIGHTS["subject"])
+    add(row.get("course_code"), FIELD_WEIGHTS["course_code"])
+    add(row.get("code"), FIELD_WEIGHTS["course_code"])
+    add(row.get("title"), FIELD_WEIGHTS["title"])
+    for name in instructors:
+        add(name, FIELD_WEIGHTS["instructor"])
+    for attr in attributes:
+        add(attr, FIELD_WEIGHTS["attribute"])
+    return _CourseDoc(row.get("code") or f"{row.get('subject')} {row.get('course_code')}", CourseRecord(row), tokens)
+
+
+class CourseSearchIndex:
+    """
+    In-memory inverted index over courses for the search box.
+
+    Every token of a course's subject, code, title, instructors and section
+    attributes is indexed under all of its prefixes (for type-ahead) and its
+    bigrams (for matches inside a word, like the old ILIKE '%q%'). Refreshes
+    rebuild only the postings of courses whose indexed text changed; the
+    Supabase fetch happens outside the postings lock, so searches keep being
+    served while a refresh is loading.
+    """
+
+    def __init__(self, ttl: float = COURSE_SEARCH_TTL):
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._postings_lock = threading.Lock()
+        self._docs: Dict[str, _CourseDoc] = {}
+        self._prefixes: Dict[str, Dict[str, float]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+
+    def _load_docs(self) -> Dict[str, _CourseDoc]:
+        courses = _fetch_all("courses", "*", "code")
+        instructors: Dict[str, Set[str]] = {}
+        attributes: Dict[str, Set[str]] = {}
+        for sec in _fetch_all("sections", "section_id, course_id, instructor_id, attribute", "section_id"):
+            cid = sec.get("course_id")
+            if sec.get("instructor_id"):
+                instructors.setdefault(cid, set()).add(sec["instructor_id"])
+            for attr in parse_core_attributes(sec.get("attribute")):
+                attributes.setdefault(cid, set()).add(attr)
+
+        docs = {}
+        for row in courses:
+            code = row.get("code")
+            doc = _build_doc(row, instructors.get(code, set()), attributes.get(code, set()))
+            docs[doc.code] = doc
+        return docs
+
+    def _add_postings(self, doc: _CourseDoc) -> None:
+        for token, weight in doc.tokens.items():
+            for i in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                posting = self._prefixes.setdefault(token[:i], {})
+                if posting.get(doc.code, 0.0) < weight:
+                    posting[doc.code] = weight
+            for gram in _grams(token):
+                self._grams.setdefault(gram, set()).add(doc.code)
+
+    def _remove_postings(self, doc: _CourseDoc) -> None:
+        for token in doc.tokens:
+            for i in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                posting = self._prefixes.get(token[:i])
+                if posting is not None:
+                    posting.pop(doc.code, None)
+                    if not posting:
+                        del self._prefixes[token[:i]]
+            for gram in _grams(token):
+                codes = self._grams.get(gram)
+                if codes is not None:
+                    codes.discard(doc.code)
+                    if not codes:
+                        del self._grams[gram]
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Reloads courses and sections and patches the postings of changed courses.
+        :return: (number of courses re-indexed, number removed)
+        """
+        new_docs = self._load_docs()
+
+        # Prefix postings keep only the best weight per course, so a changed
+        # course is removed completely and re-added rather than diffed by token.
+        with self._postings_lock:
+            changed, removed = self._apply(new_docs)
+        self.loaded_at = time.monotonic()
+        return len(changed), len(removed)
+
+    def _apply(self, new_docs: Dict[str, _CourseDoc]) -> Tuple[List[_CourseDoc], List[_CourseDoc]]:
+        changed = [doc for code, doc in new_docs.items()
+                   if code not in self._docs or self._docs[code].tokens != doc.tokens]
+        removed = [doc for code, doc in self._docs.items() if code not in new_docs]
+
+        for doc in removed:
+            self._remove_postings(doc)
+        for doc in changed:
+            old = self._docs.get(doc.code)
+            if old is not None:
+                self._remove_postings(old)
+            self._add_postings(doc)
+
+        self._docs = new_docs
+        return changed, removed
+
+    def _ensure_fresh(self) -> None:
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return
+        # Once built, a stale index keeps answering while another thread refreshes it.
+        if not self._lock.acquire(blocking=self.loaded_at is None):
+            return
+        try:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                if self.loaded_at is None:
+                    raise
+                # Keep serving the stale index until Supabase answers again.
+                print(f"Error refreshing course search index: {str(e)}")
+                self.loaded_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def invalidate(self) -> None:
+        """
+        Marks the index stale; the next search triggers an incremental refresh.
+        """
+        if self.loaded_at is not None:
+            self.loaded_at = float("-inf")
+
+    def _match_term(self, term: str) -> Dict[str, float]:
+        scores = dict(self._prefixes.get(term[:MAX_PREFIX_LENGTH], {}))
+        if len(term) > MAX_PREFIX_LENGTH:
+            scores = {code: w for code, w in scores.items()
+                      if any(t.startswith(term) for t in self._docs[code].tokens)}
+
+        if len(term) >= GRAM_SIZE:
+            candidates = None
+            for gram in _grams(term):
+                codes = self._grams.get(gram, set())
+                candidates = codes if candidates is None else candidates & codes
+                if not candidates:
+                    break
+            for code in candidates or ():
+                if code in scores:
+                    continue
+                weights = [w for t, w in self._docs[code].tokens.items() if term in t]
+                if weights:
+                    scores[code] = max(weights) * INFIX_FACTOR
+        return scores
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[dict]:
+        """
+        Courses matching every term of the query, best first.
+        A term matches a course when it is a prefix of (or, for 2+ characters,
+        contained in) one of the course's tokens.
+        """
+        self._ensure_fresh()
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._postings_lock:
+            scores: Optional[Dict[str, float]] = None
+            for term in sorted(terms, key=len, reverse=True):
+                matches = self._match_term(term)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {code: s + matches[code] for code, s in scores.items() if code in matches}
+                if not scores:
+                    return []
+
+            normalized = " ".join(terms)
+            ranked = []
+            for code, score in scores.items():
+                if " ".join(tokenize(code)) == normalized:
+                    score += EXACT_CODE_BONUS
+                ranked.append((-score, code))
+            ranked.sort()
+            docs = [self._docs[code] for _, code in ranked[:limit]]
+        return [doc.record.to_row() for doc in docs]
+
+
+_index = CourseSearchIndex()
+
+
+def get_course_search_index() -> CourseSearchIndex:
+    return _index
+
+
+def warm_course_search_index() -> None:
+    """
+    Builds the index ahead of the first search request.
+    """
+    try:
+        _index._ensure_fresh()
+    except Exception as e:
+        print(f"Error building course search index: {str(e)}")
@@ -1,18 +1,68 @@
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from services.repository import supabase
+from services.course_search import get_course_search_index, DEFAULT_LIMIT
+
+# Supabase returns at most 1000 rows per request (the API's max-rows), so
+# whole tables are read in pages of this size.
+PAGE_SIZE = 1000
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = PAGE_SIZE
+# Unique, indexed column each paginated table is ordered and resumed by.
+KEYSET_COLUMNS = {
+    "courses": "id",
+    "professors": "id",
+}
+
+
+def fetch_page(table: str, after: Optional[Any] = None, limit: int = PAGE_SIZE) -> Tuple[List[Dict], Optional[Any]]:
+    """
+    Keyset page of `table`: up to `limit` rows whose key is greater than `after`,
+    in key order, and the cursor of the next page (None after the last page).
+    Unlike offsets, the cursor stays valid and cheap however deep the page is.
+    """
+    key = KEYSET_COLUMNS[table]
+    query = supabase.from_(table).select('*').order(key)
+    if after is not None:
+        query = query.gt(key, after)
+    rows = query.limit(limit).execute().data or []
+    cursor = rows[-1][key] if len(rows) == limit else None
+    return rows, cursor
+
+
+def iter_pages(table: str, after: Optional[Any] = None) -> Iterator[List[Dict]]:
+    """
+    Pages of every row of `table` after `after`, read from Supabase one at a time
+    as the caller consumes them. Errors are raised to the caller.
+    """
+    while True:
+        rows, after = fetch_page(table, after)
+        if rows:
+            yield rows
+        if after is None:
+            return
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 class DatabaseService:
     @staticmethod
     def get_courses():
         try:
-            response = supabase.from_('courses').select('*').execute()
-            return response.data
+            return [row for page in iter_pages('courses') for row in page]
         except Exception as e:
             print(f"Error fetching courses: {str(e)}")
             return None
 
+    @staticmethod
+    def get_courses_page(after=None, limit=DEFAULT_PAGE_LIMIT):
+        try:
+            return fetch_page('courses', after, limit)
+        except Exception as e:
+            print(f"Error fetching courses page: {str(e)}")
+            return None
+
+    @staticmethod
+    def iter_course_pages(after=None):
+        return iter_pages('courses', after)
+
     @staticmethod
     def get_sections(course_id):
         try:
@@ -25,24 +75,27 @@ class DatabaseService:
     @staticmethod
     def get_professors():
         try:
-            response = supabase.from_('professors').select('*').execute()
-            return response.data
+            return [row for page in iter_pages('professors') for row in page]
         except Exception as e:
             print(f"Error fetching professors: {str(e)}")
             return None
 
     @staticmethod
-    def search_courses(query):
+    def get_professors_page(after=None, limit=DEFAULT_PAGE_LIMIT):
+        try:
+            return fetch_page('professors', after, limit)
+        except Exception as e:
+            print(f"Error fetching professors page: {str(e)}")
+            return None
+
+    @staticmethod
+    def iter_professor_pages(after=None):
+        return iter_pages('professors', after)
+
+    @staticmethod
+    def search_courses(query, limit=DEFAULT_LIMIT):
         try:
-            response = supabase.from_('courses').select('*').ilike('subject', f'%{query}%').execute()
-            results = response.data or []
-            response2 = supabase.from_('courses').select('*').ilike('course_code', f'%{query}%').execute()
-            if response2.data:
-                existing_ids = {c['id'] for c in results if 'id' in c}
-                for c in response2.data:
-                    if 'id' in c and c['id'] not in existing_ids:
-                        results.append(c)
-            return results
+            return get_course_search_index().search(query, limit)
         except Exception as e:
             print(f"Error searching courses: {str(e)}")
-            return []
\ No newline at end of file
+            return []
@@ -0,0 +1,182 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
+from services.meeting_times import parse_time_slot
+from services.term_catalog import TermCatalog, get_term_catalog
+
+# Exam periods of a finals day, in minutes after midnight.
+EXAM_PERIODS = ((480, 600), (630, 750), (780, 900), (930, 1050), (1080, 1200))
+EVENING_START = 18 * 60
+
+# The university's finals rules, as published in the finals table (interface/js/finals.js):
+# (meeting group, class start times, exam day 1-4 after the study day, exam period).
+FINALS_RULES = (
+    ("MWF", ("8:00 AM",), 1, 0),
+    ("TR", ("9:00 AM", "9:25 AM"), 1, 1),
+    ("MWF", ("11:00 AM",), 1, 2),
+    ("TR", ("1:50 PM", "2:10 PM", "2:40 PM"), 1, 3),
+    ("MWF", ("3:10 PM",), 1, 4),
+    ("MWF", ("9:00 AM",), 2, 0),
+    ("TR", ("10:50 AM",), 2, 1),
+    ("TR", ("3:15 PM",), 2, 2),
+    ("MWF", ("2:10 PM",), 2, 3),
+    ("MWF", ("4:10 PM",), 2, 4),
+    ("MWF", ("10:00 AM",), 3, 0),
+    ("TR", ("8:00 AM",), 3, 1),
+    ("MWF", ("1:10 PM",), 3, 2),
+    ("TR", ("12:25 PM",), 3, 3),
+    ("TR", ("4:10 PM", "4:40 PM"), 3, 4),
+)
+# Evening classes are grouped by day only; classes without a meeting time take the "Arranged" slot.
+EVENING_RULES = {"M or W": (4, 0), "T or R": (4, 1)}
+ARRANGED_RULE = (4, 2)
+
+
+class ExamSlot(NamedTuple):
+    rule: str
+    day: int
+    period: int
+
+
+def _clock(text: str) -> int:
+    moment = datetime.strptime(text, "%I:%M %p")
+    return moment.hour * 60 + moment.minute
+
+
+def _format_clock(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'am' if hour < 12 else 'pm'}"
+
+
+# (meeting group, start minute) -> exam slot; built once at import.
+_RULE_TABLE: Dict[Tuple[str, int], ExamSlot] = {
+    (group, _clock(start)): ExamSlot(f"{group} {_format_clock(_clock(start))}", day, period)
+    for group, starts, day, period in FINALS_RULES
+    for start in starts
+}
+
+
+def meeting_group(days: Optional[str]) -> Optional[str]:
+    """
+    "MWF" for classes meeting on Monday, Wednesday or Friday (MW, MTWF, ...), "TR" for
+    Tuesday/Thursday-only classes, None otherwise.
+    """
+    days = (days or "").upper()
+    if any(ch in days for ch in "MWF"):
+        return "MWF"
+    if any(ch in days for ch in "TR"):
+        return "TR"
+    return None
+
+
+def exam_slot(days: Optional[str], time_slot: Optional[str]) -> Optional[ExamSlot]:
+    """
+    Exam slot of a meeting pattern by the finals rules, or None when the rules do not
+    cover it (e.g. a noon MWF class); those exams are set by the instructor.
+    """
+    span = parse_time_slot(time_slot)
+    if span is None or not (days or "").strip():
+        return ExamSlot("Arranged", *ARRANGED_RULE)
+    start = span[0]
+    days = days.upper()
+    if start >= EVENING_START:
+        if "M" in days or "W" in days:
+            return ExamSlot(f"M or W {_format_clock(start)}", *EVENING_RULES["M or W"])
+        if "T" in days or "R" in days:
+            return ExamSlot(f"T or R {_format_clock(start)}", *EVENING_RULES["T or R"])
+        return None
+    group = meeting_group(days)
+    return _RULE_TABLE.get((group, start)) if group else None
+
+
+def study_day(term: str) -> Optional[date]:
+    """
+    The study day that opens finals week: the second Monday of December in Fall and the
+    first Monday of May in Spring (Dec 9, 2024 and May 5, 2025). Summer has no finals week.
+    """
+    season, _, year = term.partition(" ")
+    if not year.isdigit():
+        return None
+    if season == "Fall":
+        first, nth = date(int(year), 12, 1), 2
+    elif season == "Spring":
+        first, nth = date(int(year), 5, 1), 1
+    else:
+        return None
+    return first + timedelta(days=(0 - first.weekday()) % 7 + 7 * (nth - 1))
+
+
+class FinalsIndex:
+    """
+    Exam slot of every section of a term, keyed by CRN.
+
+    Built in one pass over the term's TermCatalog and rebuilt only when the
+    catalog has reloaded, so a schedule's exams and exam conflicts are plain
+    dictionary lookups.
+    """
+
+    def __init__(self, term: str):
+        self.term = term
+        self.study_day = study_day(term)
+        self.catalog_loaded_at: Optional[float] = None
+        self._by_crn: Dict[str, Optional[ExamSlot]] = {}
+
+    def rebuild(self, catalog: Optional[TermCatalog] = None) -> None:
+        catalog = catalog or get_term_catalog(self.term)
+        sections = catalog.sections()
+        by_crn: Dict[str, Optional[ExamSlot]] = {}
+        # Many sections share a meeting pattern; each pattern is resolved once.
+        patterns: Dict[Tuple[str, str], Optional[ExamSlot]] = {}
+        for section in sections:
+            if section.crn is None:
+                continue
+            key = (section.days or "", section.time_slot or "")
+            if key not in patterns:
+                patterns[key] = exam_slot(*key)
+            by_crn[str(section.crn)] = patterns[key]
+        self._by_crn = by_crn
+        self.catalog_loaded_at = catalog.loaded_at
+
+    def is_current(self, catalog: Optional[TermCatalog] = None) -> bool:
+        loaded_at = (catalog or get_term_catalog(self.term)).loaded_at
+        return self.catalog_loaded_at is not None and loaded_at == self.catalog_loaded_at
+
+    def slot_for_crn(self, crn) -> Optional[ExamSlot]:
+        return self._by_crn.get(str(crn))
+
+    def exam_time(self, slot: ExamSlot) -> dict:
+        """
+        JSON form of an exam slot: rule, date and clock times.
+        """
+        start, end = EXAM_PERIODS[slot.period]
+        exam_date = self.study_day + timedelta(days=slot.day) if self.study_day else None
+        return {
+            "rule": slot.rule,
+            "date": exam_date.isoformat() if exam_date else None,
+            "day": f"{exam_date:%A}, {exam_date:%b} {exam_date.day}, {exam_date.year}" if exam_date else None,
+            "start": f"{start // 60:02d}:{start % 60:02d}",
+            "end": f"{end // 60:02d}:{end % 60:02d}",
+            "time": f"{_format_clock(start)} to {_format_clock(end)}",
+        }
+
+
+_indexes_lock = threading.Lock()
+
+
+def get_finals_index(term: str) -> FinalsIndex:
+    """
+    Returns the finals index for `term`, building it on first use and after the
+    term catalog reloads. It is kept with the catalog, so it shares its eviction.
+    """
+    catalog = get_term_catalog(term)
+    catalog.sections()  # reloads the catalog first if its TTL has passed
+    index = catalog.indexes.get("finals")
+    if index is not None and index.is_current(catalog):
+        return index
+    with _indexes_lock:
+        index = catalog.indexes.get("finals")
+        if index is None or not index.is_current(catalog):
+            index = FinalsIndex(term)
+            index.rebuild(catalog)
+            catalog.indexes["finals"] = index
+    return index
@@ -0,0 +1,149 @@
+import functools
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from services.static_assets import get_static_assets
+
+FLOOR_PLAN_TILE_DIR = os.getenv("FLOOR_PLAN_TILE_DIR", os.path.join(tempfile.gettempdir(), "gu-floor-plan-tiles"))
+# Tile widths in pixels; requested widths are rounded up to one of these so the disk cache stays small.
+TILE_WIDTHS = (480, 960, 1440, 1920)
+TILE_FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+# Keys are the data-plan values of the floor-plan buttons in the map view.
+FLOOR_PLANS = {
+    "Herak1": ("Herak Center", "assets/Floor Plans/Herak Center.pdf"),
+    "Jepson1": ("Jepson 1st Floor", "assets/Floor Plans/Jepson1stFloor.pdf"),
+    "JepsonB": ("Jepson Basement", "assets/Floor Plans/JepsonBasementpdf.pdf"),
+}
+
+_PAGE_RE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+_page_counts: Dict[str, int] = {}
+_render_locks: Dict[str, threading.Lock] = {}
+_render_locks_guard = threading.Lock()
+
+
+class TilesUnavailable(Exception):
+    pass
+
+
+# The renderers are imported on first use rather than at worker start: PyMuPDF
+# alone takes longer to import than the rest of the app.
+@functools.lru_cache(maxsize=None)
+def _pymupdf():
+    try:
+        import pymupdf
+    except ImportError:  # optional: without it tiles are unavailable and clients embed the PDF
+        return None
+    return pymupdf
+
+
+@functools.lru_cache(maxsize=None)
+def _pil_image():
+    try:
+        from PIL import Image
+    except ImportError:  # optional: needed for WebP tiles only
+        return None
+    return Image
+
+
+def tile_width(requested: Optional[int]) -> int:
+    if requested is None:
+        return TILE_WIDTHS[1]
+    return next((width for width in TILE_WIDTHS if requested <= width), TILE_WIDTHS[-1])
+
+
+def _plan_file(plan: str):
+    entry = FLOOR_PLANS.get(plan)
+    if entry is None:
+        return None
+    return get_static_assets().get_mapped(entry[1])
+
+
+def page_count(plan: str) -> Optional[int]:
+    """
+    Number of pages of a floor plan; counted once per PDF version.
+    """
+    mapped = _plan_file(plan)
+    if mapped is None:
+        return None
+    if mapped.etag not in _page_counts:
+        pymupdf = _pymupdf()
+        if pymupdf is not None:
+            with pymupdf.open(mapped.full_path) as doc:
+                _page_counts[mapped.etag] = doc.page_count
+        else:
+            # Page objects are not inside compressed object streams in these files.
+            with open(mapped.full_path, "rb") as f:
+                _page_counts[mapped.etag] = len(_PAGE_RE.findall(f.read()))
+    return _page_counts[mapped.etag]
+
+
+def list_floor_plans() -> List[dict]:
+    assets = get_static_assets()
+    plans = []
+    for plan, (name, path) in FLOOR_PLANS.items():
+        if assets.get_mapped(path) is None:
+            continue
+        plans.append({
+            "plan": plan,
+            "name": name,
+            "pdf_url": assets.url_for(path),
+            "pages": page_count(plan),
+            "tiles": _pymupdf() is not None,
+            "formats": [fmt for fmt in TILE_FORMATS if fmt == "png" or _pil_image() is not None],
+            "widths": list(TILE_WIDTHS),
+        })
+    return plans
+
+
+def _render_lock(key: str) -> threading.Lock:
+    with _render_locks_guard:
+        return _render_locks.setdefault(key, threading.Lock())
+
+
+def page_tile(plan: str, page: int, width: int, fmt: str) -> Optional[str]:
+    """
+    Path of the rendered tile of one page, rendering it on first request.
+    Tiles are cached on disk under FLOOR_PLAN_TILE_DIR and keyed by the PDF's
+    content hash, so an updated floor plan never serves old tiles.
+    None when the plan or page does not exist; raises TilesUnavailable when
+    the renderer (PyMuPDF, or Pillow for WebP) is not installed.
+    """
+    mapped = _plan_file(plan)
+    if mapped is None or fmt not in TILE_FORMATS:
+        return None
+    pages = page_count(plan)
+    if not pages or not 1 <= page <= pages:
+        return None
+
+    path = os.path.join(FLOOR_PLAN_TILE_DIR, mapped.etag, f"{page}-{width}.{fmt}")
+    if os.path.exists(path):
+        return path
+    pymupdf, Image = _pymupdf(), _pil_image()
+    if pymupdf is None or (fmt == "webp" and Image is None):
+        raise TilesUnavailable(f"{fmt} tiles are not available on this server")
+
+    with _render_lock(path):
+        if os.path.exists(path):
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with pymupdf.open(mapped.full_path) as doc:
+            pdf_page = doc[page - 1]
+            scale = width / pdf_page.rect.width
+            pixmap = pdf_page.get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+            # Written under a temporary name and renamed, so a half-written tile is never served.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=f".{fmt}")
+            os.close(fd)
+            try:
+                if fmt == "png":
+                    pixmap.save(tmp_path, output="png")
+                else:
+                    Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples) \
+                        .save(tmp_path, "WEBP", quality=80)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+    return path
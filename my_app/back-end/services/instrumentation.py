@@ -0,0 +1,309 @@
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from flask import Flask, Response, g, request
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" writes one JSON object per log line; anything else is plain text.
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") != "0"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+logger = logging.getLogger(__name__)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """
+    Monotonic counter with labels, rendered in the Prometheus text format.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount: float = 1.0, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value:g}"
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels, rendered in the Prometheus text format.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {total:g}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+
+_registry: List = []
+
+HTTP_REQUESTS = Counter("gu_http_requests_total", "HTTP requests by route, method and status.",
+                        ("endpoint", "method", "status"))
+HTTP_SECONDS = Histogram("gu_http_request_seconds", "Time to build the HTTP response.", ("endpoint",))
+REQUEST_QUERIES = Histogram("gu_http_request_db_queries", "Supabase queries made by one HTTP request.",
+                            ("endpoint",), buckets=QUERY_COUNT_BUCKETS)
+DB_QUERIES = Counter("gu_db_queries_total", "Supabase queries by table, method and outcome.",
+                     ("table", "method", "outcome"))
+DB_SECONDS = Histogram("gu_db_query_seconds", "Supabase query latency, retries included.", ("table",))
+DB_ROWS = Counter("gu_db_rows_total", "Rows returned by Supabase.", ("table",))
+DB_BYTES = Counter("gu_db_response_bytes_total", "Response body bytes received from Supabase.", ("table",))
+SERVICE_SECONDS = Histogram("gu_service_seconds", "Duration of instrumented service functions.", ("function",))
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """
+    Supabase traffic and service timings of one HTTP request. Shared with the
+    fan-out threads of the request through the context, hence the lock.
+    """
+
+    __slots__ = ("started", "queries", "rows", "bytes", "db_seconds", "timings", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.rows = 0
+        self.bytes = 0
+        self.db_seconds = 0.0
+        # function name -> [calls, seconds]
+        self.timings: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def add_query(self, rows: int, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.rows += rows
+            self.db_seconds += seconds
+
+    def add_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.timings.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            parts = [
+                f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows} rows, '
+                f'{self.bytes} bytes"'
+            ]
+            parts += [
+                f'{name};dur={seconds * 1000:.1f}' + (f';desc="{calls} calls"' if calls > 1 else "")
+                for name, (calls, seconds) in self.timings.items()
+            ]
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+
+_current_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def _table_label(path: str) -> str:
+    # "/sections" and "/rest/v1/sections" -> "sections"; "/rpc/fn" -> "rpc/fn"
+    path = path.split("/rest/v1/", 1)[-1].strip("/")
+    return path or "unknown"
+
+
+def record_query(path: str, method: str, rows: int, seconds: float, ok: bool = True) -> None:
+    """
+    Called by the repository for every executed query, retries included.
+    """
+    table = _table_label(path)
+    DB_QUERIES.inc(1, table, method or "unknown", "ok" if ok else "error")
+    DB_SECONDS.observe(seconds, table)
+    if rows:
+        DB_ROWS.inc(rows, table)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add_query(rows, seconds)
+
+
+def record_response_bytes(response) -> None:
+    """
+    httpx response hook of the Supabase session: counts the body size of every answer.
+    """
+    response.read()
+    size = len(response.content)
+    DB_BYTES.inc(size, _table_label(response.request.url.path))
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.add_bytes(size)
+
+
+def timed(fn):
+    """
+    Records the duration of a service function in gu_service_seconds and in the
+    Server-Timing header of the current request.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            SERVICE_SECONDS.observe(elapsed, name)
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.add_timing(name, elapsed)
+    return wrapper
+
+
+class _JsonFormatter(logging.Formatter):
+    _RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # Fields passed with extra={...} become top-level keys.
+        entry.update({key: value for key, value in vars(record).items() if key not in self._RESERVED})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging() -> None:
+    """
+    Root logging setup: level from LOG_LEVEL (DEBUG shows the planners' traces),
+    text or JSON lines from LOG_FORMAT.
+    """
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(_JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Per-request query accounting, the Server-Timing header and the /metrics endpoint.
+    """
+
+    @app.before_request
+    def _start_request_stats():
+        stats = RequestStats()
+        g.request_stats = stats
+        g.request_stats_token = _current_stats.set(stats)
+
+    @app.after_request
+    def _finish_request_stats(response: Response) -> Response:
+        stats = g.get("request_stats")
+        if stats is None:
+            return response
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        HTTP_REQUESTS.inc(1, endpoint, request.method, response.status_code)
+        HTTP_SECONDS.observe(time.perf_counter() - stats.started, endpoint)
+        REQUEST_QUERIES.observe(stats.queries, endpoint)
+        if SERVER_TIMING:
+            response.headers["Server-Timing"] = stats.server_timing()
+        logger.debug("request done", extra={
+            "endpoint": endpoint, "status": response.status_code, "queries": stats.queries,
+            "rows": stats.rows, "db_ms": round(stats.db_seconds * 1000, 1),
+        })
+        return response
+
+    @app.teardown_request
+    def _reset_request_stats(_error=None):
+        token = g.pop("request_stats_token", None)
+        if token is not None:
+            try:
+                _current_stats.reset(token)
+            except ValueError:
+                # Streamed responses tear down from the generator, in another context.
+                _current_stats.set(None)
+
+    @app.route("/metrics")
+    def metrics():
+        if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,87 @@
+import re
+from typing import Optional, Tuple
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+DAY_CODES = "MTWRFSU"
+
+_TIME_RANGE_RE = re.compile(
+    r"(\d{1,2}):(\d{2})\s*([AaPp][Mm])?\s*-\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])?"
+)
+
+
+def _to_minutes(hours: str, minutes: str, period: Optional[str]) -> int:
+    h = int(hours)
+    if period:
+        period = period.upper()
+        if period == "PM" and h < 12:
+            h += 12
+        if period == "AM" and h == 12:
+            h = 0
+    return h * 60 + int(minutes)
+
+
+def parse_time_slot(time_slot: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    "10:00 AM - 10:50 AM" -> (600, 650) in minutes after midnight, or None for TBA.
+    A missing AM/PM on the start time is taken from the end time ("1:15 - 2:30 PM").
+    """
+    m = _TIME_RANGE_RE.search(time_slot or "")
+    if not m:
+        return None
+    end_period = m.group(6)
+    start_period = m.group(3) or end_period
+    start = _to_minutes(m.group(1), m.group(2), start_period)
+    end = _to_minutes(m.group(4), m.group(5), end_period)
+    if m.group(3) is None and end_period and end_period.upper() == "PM" and start > end:
+        # "11:30 - 12:45 PM": the start is really in the morning.
+        start -= 12 * 60
+    if end <= start:
+        return None
+    return start, end
+
+
+def parse_meeting_mask(days: Optional[str], time_slot: Optional[str]) -> int:
+    """
+    Packs a section's weekly meetings into one int: bit (day * SLOTS_PER_DAY + slot)
+    is set for every 5-minute slot the section meets. Two sections conflict
+    exactly when their masks share a bit. TBA sections get 0 and never conflict.
+    """
+    span = parse_time_slot(time_slot)
+    if span is None or not days:
+        return 0
+    first_slot = span[0] // SLOT_MINUTES
+    last_slot = -(-span[1] // SLOT_MINUTES)
+    day_bits = ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+    mask = 0
+    for ch in days.upper():
+        day = DAY_CODES.find(ch)
+        if day >= 0:
+            mask |= day_bits << (day * SLOTS_PER_DAY)
+    return mask
+
+
+def day_masks(mask: int) -> Tuple[int, ...]:
+    """
+    Splits a packed weekly mask into one SLOTS_PER_DAY-bit mask per weekday (M..U).
+    """
+    day_mask = (1 << SLOTS_PER_DAY) - 1
+    return tuple((mask >> (day * SLOTS_PER_DAY)) & day_mask for day in range(len(DAY_CODES)))
+
+
+def conflict_days(mask_a: int, mask_b: int) -> str:
+    """
+    Day codes on which two sections overlap, e.g. "MW"; empty when they do not conflict.
+    """
+    overlap = mask_a & mask_b
+    if not overlap:
+        return ""
+    return "".join(DAY_CODES[day] for day, bits in enumerate(day_masks(overlap)) if bits)
+
+
+def mask_to_hex(mask: int) -> str:
+    """
+    Hex form of a mask for JSON; the browser reads it back with BigInt("0x" + hex).
+    """
+    return format(mask, "x")
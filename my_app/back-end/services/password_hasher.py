@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", str(PASSWORD_POOL_WORKERS * 4)))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+PASSWORD_RETRY_AFTER = int(os.getenv("PASSWORD_RETRY_AFTER", "2"))
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the password pool already has PASSWORD_QUEUE_LIMIT jobs, or a job
+    did not finish within PASSWORD_HASH_TIMEOUT; controllers answer 429 with
+    Retry-After: retry_after.
+    """
+
+    def __init__(self, retry_after: int = PASSWORD_RETRY_AFTER):
+        super().__init__("Too many password operations in progress, try again shortly")
+        self.retry_after = retry_after
+
+
+# These two run inside the pool's worker processes.
+def _hashpw(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class _Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.completed: Dict[str, int] = {"hash": 0, "check": 0}
+        self.rejected = 0
+        self.timed_out = 0
+        self.latency_sum: Dict[str, float] = {"hash": 0.0, "check": 0.0}
+        self.latency_max: Dict[str, float] = {"hash": 0.0, "check": 0.0}
+
+
+_metrics = _Metrics()
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Created on first use, i.e. after gunicorn has forked the worker.
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=PASSWORD_POOL_WORKERS)
+    return _pool
+
+
+def _reset_after_fork() -> None:
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _run(op: str, fn, *args):
+    with _metrics.lock:
+        if _metrics.in_flight >= PASSWORD_QUEUE_LIMIT:
+            _metrics.rejected += 1
+            raise PasswordHasherBusy()
+        _metrics.in_flight += 1
+
+    start = time.monotonic()
+
+    def release(_future: Optional[Future] = None) -> None:
+        # The slot is held until the job itself ends, not until the caller stops
+        # waiting: a timed-out job still occupies a pool process.
+        elapsed = time.monotonic() - start
+        with _metrics.lock:
+            _metrics.in_flight -= 1
+            _metrics.completed[op] += 1
+            _metrics.latency_sum[op] += elapsed
+            _metrics.latency_max[op] = max(_metrics.latency_max[op], elapsed)
+
+    try:
+        future = _get_pool().submit(fn, *args)
+    except Exception:
+        release()
+        raise
+    future.add_done_callback(release)
+    try:
+        return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+    except FutureTimeoutError:
+        with _metrics.lock:
+            _metrics.timed_out += 1
+        raise PasswordHasherBusy()
+
+
+def hash_password(password: str) -> str:
+    """
+    bcrypt hash of the password with BCRYPT_ROUNDS, computed in the password pool.
+    """
+    return _run("hash", _hashpw, password.encode('utf-8'), BCRYPT_ROUNDS).decode('utf-8')
+
+
+def check_password(password: str, hashed: str) -> bool:
+    return _run("check", _checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """
+    True when the stored hash ("$2b$<cost>$...") was made with a different cost than BCRYPT_ROUNDS.
+    """
+    try:
+        return int(hashed.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+def password_pool_metrics() -> dict:
+    """
+    Queue depth, rejections and per-operation latency of the password pool.
+    """
+    with _metrics.lock:
+        return {
+            "workers": PASSWORD_POOL_WORKERS,
+            "queue_limit": PASSWORD_QUEUE_LIMIT,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "in_flight": _metrics.in_flight,
+            "rejected": _metrics.rejected,
+            "timed_out": _metrics.timed_out,
+            "operations": {
+                op: {
+                    "count": _metrics.completed[op],
+                    "avg_seconds": _metrics.latency_sum[op] / _metrics.completed[op] if _metrics.completed[op] else 0.0,
+                    "max_seconds": _metrics.latency_max[op],
+                }
+                for op in _metrics.completed
+            }
+        }
@@ -0,0 +1,178 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+Color = Tuple[float, float, float]
+
+# Base-14 fonts need no embedding; every PDF viewer has them.
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+
+_NARROW = set("fijlrtI.,:;'|!()[] -")
+_WIDE = set("mwMW@%")
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """
+    Approximate width of Helvetica text in points; close enough to decide
+    where to cut a label, without shipping the font metrics.
+    """
+    width = 0.0
+    for ch in text:
+        if ch in _NARROW:
+            width += 0.3
+        elif ch in _WIDE:
+            width += 0.85
+        elif ch.isupper() or ch.isdigit():
+            width += 0.64 if ch.isupper() else 0.556
+        else:
+            width += 0.52
+    return width * size * (1.05 if bold else 1.0)
+
+
+def fit_text(text: str, max_width: float, size: float, bold: bool = False) -> str:
+    """
+    text, cut with "..." so that it fits into max_width points.
+    """
+    if text_width(text, size, bold) <= max_width:
+        return text
+    while text and text_width(text + "...", size, bold) > max_width:
+        text = text[:-1]
+    return text + "..." if text else ""
+
+
+def _pdf_string(text: str) -> bytes:
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class PageCanvas:
+    """
+    Drawing operators for one page. Coordinates are points from the top-left
+    corner, as in the HTML grid; they are flipped to PDF's bottom-left origin here.
+    """
+
+    def __init__(self, width: float, height: float):
+        self.width = width
+        self.height = height
+        self._ops: List[bytes] = []
+
+    def _color(self, color: Color, stroke: bool) -> str:
+        return " ".join(_num(c) for c in color) + (" RG" if stroke else " rg")
+
+    def rect(self, x: float, y: float, w: float, h: float,
+             fill: Optional[Color] = None, stroke: Optional[Color] = None, line_width: float = 0.5) -> None:
+        ops = []
+        if fill is not None:
+            ops.append(self._color(fill, False))
+        if stroke is not None:
+            ops.append(self._color(stroke, True))
+            ops.append(f"{_num(line_width)} w")
+        ops.append(f"{_num(x)} {_num(self.height - y - h)} {_num(w)} {_num(h)} re")
+        ops.append("B" if fill is not None and stroke is not None else "f" if fill is not None else "S")
+        self._ops.append(" ".join(ops).encode("ascii"))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float,
+             color: Color = (0, 0, 0), line_width: float = 0.5) -> None:
+        self._ops.append(
+            f"{self._color(color, True)} {_num(line_width)} w "
+            f"{_num(x1)} {_num(self.height - y1)} m {_num(x2)} {_num(self.height - y2)} l S".encode("ascii")
+        )
+
+    def text(self, x: float, y: float, text: str, size: float = 8,
+             bold: bool = False, color: Color = (0, 0, 0)) -> None:
+        """
+        Draws text with its baseline at y.
+        """
+        font = "F2" if bold else "F1"
+        self._ops.append(
+            f"BT {self._color(color, False)} /{font} {_num(size)} Tf "
+            f"{_num(x)} {_num(self.height - y)} Td ".encode("ascii") + _pdf_string(text) + b" Tj ET"
+        )
+
+    def getvalue(self) -> bytes:
+        return b"\n".join(self._ops)
+
+
+class PdfWriter:
+    """
+    Minimal streaming PDF 1.4 writer for vector pages.
+
+    begin(), page() and close() each return the bytes to send next: a page's
+    compressed content stream is written out as soon as the page is drawn, and
+    only the object offsets are kept for the cross-reference table at the end.
+    The page tree and catalog are written last, once the page list is known.
+    """
+
+    def __init__(self, width: float = 792, height: float = 612):
+        self.width = width
+        self.height = height
+        self._position = 0
+        self._offsets: Dict[int, int] = {}
+        self._next_number = 3  # 1 = catalog, 2 = page tree
+        self._fonts: Dict[str, int] = {}
+        self._pages: List[int] = []
+
+    def _allocate(self) -> int:
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        data = f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+        self._offsets[number] = self._position
+        self._position += len(data)
+        return data
+
+    def new_page(self) -> PageCanvas:
+        return PageCanvas(self.width, self.height)
+
+    def begin(self) -> bytes:
+        header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._position = len(header)
+        chunks = [header]
+        for name, base_font in FONTS.items():
+            self._fonts[name] = self._allocate()
+            chunks.append(self._object(
+                self._fonts[name],
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} /Encoding /WinAnsiEncoding >>".encode("ascii")
+            ))
+        return b"".join(chunks)
+
+    def page(self, canvas: PageCanvas) -> bytes:
+        content = zlib.compress(canvas.getvalue())
+        stream_number = self._allocate()
+        page_number = self._allocate()
+        fonts = " ".join(f"/{name} {number} 0 R" for name, number in self._fonts.items())
+        self._pages.append(page_number)
+        return self._object(
+            stream_number,
+            f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + content + b"\nendstream"
+        ) + self._object(
+            page_number,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(self.width)} {_num(self.height)}] "
+            f"/Resources << /Font << {fonts} >> >> /Contents {stream_number} 0 R >>".encode("ascii")
+        )
+
+    def close(self, title: Optional[str] = None) -> bytes:
+        kids = " ".join(f"{number} 0 R" for number in self._pages)
+        chunks = [
+            self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode("ascii")),
+            self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        ]
+        info = ""
+        if title:
+            info_number = self._allocate()
+            chunks.append(self._object(info_number, b"<< /Title " + _pdf_string(title) + b" >>"))
+            info = f" /Info {info_number} 0 R"
+
+        size = self._next_number
+        xref = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        xref += [f"{self._offsets[number]:010d} 00000 n \n" for number in range(1, size)]
+        chunks.append("".join(xref).encode("ascii"))
+        chunks.append(
+            f"trailer\n<< /Size {size} /Root 1 0 R{info} >>\nstartxref\n{self._position}\n%%EOF\n".encode("ascii")
+        )
+        return b"".join(chunks)
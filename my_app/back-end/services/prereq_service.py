@@ -1,19 +1,218 @@
 import json
-from typing import Optional, Dict, Set, List
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-def build_prerequisite_graph(
-    course_code: str,
-    include_all_levels: bool = False,
-    visited: Optional[Set[str]] = None,
-    nodes: Optional[List[Dict]] = None,
-    edges: Optional[List[Dict]] = None
-) -> Dict:
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, List, Tuple
+from services.repository import supabase
+from services.instrumentation import timed
+
+PREREQ_INDEX_TTL = float(os.getenv("PREREQ_INDEX_TTL", "600"))
+PAGE_SIZE = 1000
+
+
+def _fetch_all(table: str, columns: str, order_by: str) -> List[Dict]:
+    rows = []
+    start = 0
+    while True:
+        resp = supabase.table(table) \
+            .select(columns) \
+            .order(order_by) \
+            .range(start, start + PAGE_SIZE - 1) \
+            .execute()
+        page = resp.data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def _requirement_edges(prereq_data: Dict) -> List[Tuple[str, str, Optional[str]]]:
     """
-    Рекурсивно строит граф пререквизитов для заданного course_code.
+    Разворачивает prerequisite_schema в список (child_course, relation, min_grade).
+    """
+    if "requirements" in prereq_data:
+        prereq_type = prereq_data.get("type", "and")
+        requirements = prereq_data.get("requirements", [])
+    else:
+        prereq_type = prereq_data.get("type", "and")
+        requirements = [prereq_data]
+
+    result = []
+    for req in requirements:
+        child_course = req.get("course")
+        if not child_course:
+            continue
+        result.append((child_course, prereq_type, req.get("min_grade")))
+    return result
+
+
+class PrerequisiteIndex:
+    """
+    Скомпилированный граф пререквизитов всего каталога.
+
+    Таблицы courses и prerequisites загружаются целиком (постранично) в
+    словарь смежности course_code -> [(child_course, relation, min_grade)],
+    после чего подграф любого курса строится в памяти и кэшируется.
+    Индекс перечитывается, когда он старше ttl секунд.
+    """
+
+    def __init__(self, ttl: float = PREREQ_INDEX_TTL):
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._titles: Dict[str, str] = {}
+        self._schemas: Dict[str, List] = {}
+        self._adjacency: Dict[str, List[Tuple[str, str, Optional[str]]]] = {}
+        self._subgraphs: Dict[Tuple[str, bool], Dict] = {}
+
+    def refresh(self) -> None:
+        courses = _fetch_all("courses", "code, title", "code")
+        prerequisites = _fetch_all("prerequisites", "course_code, prerequisite_schema", "course_code")
+
+        titles = {row["code"]: row.get("title", row["code"]) for row in courses}
+        schemas: Dict[str, List] = {}
+        adjacency: Dict[str, List[Tuple[str, str, Optional[str]]]] = {}
+        for record in prerequisites:
+            prereq_json = record.get("prerequisite_schema")
+            if isinstance(prereq_json, str):
+                prereq_json = json.loads(prereq_json)
+            schemas.setdefault(record["course_code"], []).append(prereq_json)
+            if prereq_json:
+                adjacency.setdefault(record["course_code"], []).extend(_requirement_edges(prereq_json))
+
+        self._titles = titles
+        self._schemas = schemas
+        self._adjacency = adjacency
+        self._subgraphs = {}
+        self.loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                if self.loaded_at is None:
+                    raise
+                print(f"Error refreshing prerequisite index: {str(e)}")
+                self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Помечает индекс устаревшим: следующий запрос перечитает таблицы (и сбросит кэш подграфов).
+        """
+        if self.loaded_at is not None:
+            self.loaded_at = float("-inf")
+
+    def title(self, course_code: str) -> str:
+        self._ensure_fresh()
+        return self._titles.get(course_code, course_code)
+
+    def schemas(self, course_code: str) -> List:
+        """
+        Все prerequisite_schema курса (уже разобранные из JSON) в порядке записей.
+        """
+        self._ensure_fresh()
+        return self._schemas.get(course_code, [])
+
+    def subgraph(self, course_code: str, include_all_levels: bool = False) -> Dict:
+        """
+        Итеративный BFS по словарю смежности с дедупликацией через множество.
+        Результат кэшируется на (course_code, include_all_levels) и
+        разделяется между запросами, поэтому изменять его нельзя.
+        Кэшируются только коды из каталога, так что произвольные ?course=
+        не раздувают кэш: он ограничен размером индекса.
+        """
+        self._ensure_fresh()
+        key = (course_code, include_all_levels)
+        cached = self._subgraphs.get(key)
+        if cached is not None:
+            return cached
+
+        titles = self._titles
+        nodes = [{"id": course_code, "name": titles.get(course_code, course_code)}]
+        edges = []
+        seen = {course_code}
+        queue = deque([course_code])
+
+        while queue:
+            current = queue.popleft()
+            for child_course, relation, min_grade in self._adjacency.get(current, ()):
+                if child_course not in seen:
+                    seen.add(child_course)
+                    nodes.append({"id": child_course, "name": titles.get(child_course, child_course)})
+                    if include_all_levels:
+                        queue.append(child_course)
+                edges.append({
+                    "source": child_course,
+                    "target": current,
+                    "relation": relation,
+                    "min_grade": min_grade
+                })
+
+        result = {"nodes": nodes, "edges": edges}
+        if course_code in titles or course_code in self._adjacency:
+            self._subgraphs[key] = result
+        return result
+
+
+_index = PrerequisiteIndex()
+
+
+def get_prerequisite_index() -> PrerequisiteIndex:
+    return _index
+
+
+def warm_prerequisite_index() -> None:
+    """
+    Loads the index ahead of the first graph request.
+    """
+    try:
+        _index._ensure_fresh()
+    except Exception as e:
+        print(f"Error building prerequisite index: {str(e)}")
+
+
+def extract_courses_from_schema(schema) -> list:
+    """
+    Рекурсивно извлекает коды курсов из prerequisite_schema (может быть AND/OR/одиночный)
+    """
+    courses = []
+    if isinstance(schema, dict):
+        if "course" in schema:
+            course = schema["course"].split(" Minimum Grade")[0].strip()
+            courses.append(course)
+        elif "requirements" in schema:
+            for req in schema["requirements"]:
+                courses.extend(extract_courses_from_schema(req))
+    elif isinstance(schema, list):
+        for item in schema:
+            courses.extend(extract_courses_from_schema(item))
+    return courses
+
+
+def get_course_prerequisites(course_code: str) -> list:
+    """
+    Возвращает список кодов курсов, которые являются prerequisites для данного course_code.
+    Схемы берутся из PrerequisiteIndex (таблица prerequisites, поле prerequisite_schema).
+    """
+    schemas = get_prerequisite_index().schemas(course_code)
+    if not schemas:
+        return []
+    schema = schemas[0]
+    if not schema:
+        return []
+    return extract_courses_from_schema(schema)
+
+
+@timed
+def build_prerequisite_graph(course_code: str, include_all_levels: bool = False) -> Dict:
+    """
+    Строит граф пререквизитов для заданного course_code по PrerequisiteIndex.
 
     Возвращает словарь вида:
         {
@@ -30,87 +229,9 @@ def build_prerequisite_graph(
 
     Параметры:
         course_code (str): Код курса (например, "CPSC 321").
-        include_all_levels (bool): Если True, то рекурсивно подтягивает все уровни пререквизитов.
-        visited (Set[str]): Множество уже посещённых курсов (для защиты от циклов).
-        nodes (List[Dict]): Список узлов (накопленный).
-        edges (List[Dict]): Список рёбер (накопленный).
+        include_all_levels (bool): Если True, то подтягивает все уровни пререквизитов.
     """
-
-    if visited is None:
-        visited = set()
-    if nodes is None:
-        nodes = []
-    if edges is None:
-        edges = []
-
-    if course_code in visited:
-        return {"nodes": nodes, "edges": edges}
-
-    visited.add(course_code)
-
-    course_info = supabase.table("courses").select("*").eq("code", course_code).execute()
-    if course_info.data and len(course_info.data) > 0:
-        course_title = course_info.data[0].get("title", course_code)
-    else:
-        course_title = course_code
-
-    if not any(n["id"] == course_code for n in nodes):
-        nodes.append({"id": course_code, "name": course_title})
-
-    response = supabase.table("prerequisites").select("*").eq("course_code", course_code).execute()
-    if not response.data:
-        return {"nodes": nodes, "edges": edges}
-
-    for record in response.data:
-        prereq_json = record.get("prerequisite_schema")
-        if not prereq_json:
-            continue
-
-        if isinstance(prereq_json, str):
-            prereq_data = json.loads(prereq_json)
-        else:
-            prereq_data = prereq_json
-
-        if "requirements" in prereq_data:
-            prereq_type = prereq_data.get("type", "and")
-            requirements = prereq_data.get("requirements", [])
-        else:
-            prereq_type = prereq_data.get("type", "and")
-            requirements = [prereq_data]
-
-        for req in requirements:
-            child_course = req.get("course")
-            min_grade = req.get("min_grade")
-
-            if not child_course:
-                continue
-
-            child_info = supabase.table("courses").select("*").eq("code", child_course).execute()
-            if child_info.data and len(child_info.data) > 0:
-                child_title = child_info.data[0].get("title", child_course)
-            else:
-                child_title = child_course
-
-            if not any(n["id"] == child_course for n in nodes):
-                nodes.append({"id": child_course, "name": child_title})
-
-            edges.append({
-                "source": child_course,
-                "target": course_code,
-                "relation": prereq_type,
-                "min_grade": min_grade
-            })
-
-            if include_all_levels:
-                build_prerequisite_graph(
-                    course_code=child_course,
-                    include_all_levels=True,
-                    visited=visited,
-                    nodes=nodes,
-                    edges=edges
-                )
-
-    return {"nodes": nodes, "edges": edges}
+    return get_prerequisite_index().subgraph(course_code, include_all_levels)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+from services.meeting_times import parse_meeting_mask
+
+
+def intern_text(value):
+    """
+    The shared copy of a repeated string (term, subject, instructor...), so that
+    thousands of records hold one object per distinct value instead of one each.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+# One shared frozenset per distinct set of absent columns (in practice: one per select()).
+_absent_sets: Dict[frozenset, frozenset] = {}
+
+
+class Record:
+    """
+    Compact, read-only stand-in for a Supabase row dict kept in a long-lived cache.
+
+    Known columns live in __slots__ (no per-row dict and key strings) and the
+    repeated text columns are interned; any other column the table returns is
+    kept in `extra`. get(), [], `in` and to_row() see exactly the columns the
+    row had (known columns it lacked are listed in `absent`), so services can
+    treat records and rows alike; attributes of absent columns read as None.
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: frozenset = frozenset()
+    _field_set: frozenset = frozenset()
+    __slots__ = ("extra", "absent")
+
+    def __init__(self, row: Dict[str, Any]):
+        interned = self.INTERNED
+        absent = []
+        for name in self.FIELDS:
+            if name in row:
+                value = row[name]
+                setattr(self, name, intern_text(value) if name in interned else value)
+            else:
+                setattr(self, name, None)
+                absent.append(name)
+        absent = frozenset(absent)
+        self.absent = _absent_sets.setdefault(absent, absent)
+        extra = {key: value for key, value in row.items() if key not in self._field_set}
+        self.extra = extra or None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def get(self, key: str, default=None):
+        if key in self._field_set:
+            return default if key in self.absent else getattr(self, key)
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str):
+        if key in self._field_set and key not in self.absent:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._field_set:
+            return key not in self.absent
+        return self.extra is not None and key in self.extra
+
+    def keys(self) -> Iterator[str]:
+        absent = self.absent
+        yield from (name for name in self.FIELDS if name not in absent)
+        if self.extra:
+            yield from self.extra
+
+    def to_row(self) -> Dict[str, Any]:
+        absent = self.absent
+        if absent:
+            row = {name: getattr(self, name) for name in self.FIELDS if name not in absent}
+        else:
+            row = {name: getattr(self, name) for name in self.FIELDS}
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_row()!r})"
+
+
+class SectionRecord(Record):
+    """
+    One row of `sections`, plus its meeting-time bitmask (see meeting_times).
+    """
+
+    FIELDS = ("section_id", "crn", "course_id", "term", "section", "attribute", "credits", "subject",
+              "course_code", "days", "time_slot", "instructor_id", "classroom", "rm", "act")
+    INTERNED = frozenset(("course_id", "term", "section", "attribute", "subject", "course_code", "days",
+                          "time_slot", "instructor_id", "classroom"))
+    __slots__ = FIELDS + ("meeting_mask",)
+
+    def __init__(self, row: Dict[str, Any], meeting_mask: Optional[int] = None):
+        super().__init__(row)
+        if meeting_mask is None:
+            meeting_mask = parse_meeting_mask(self.days, self.time_slot)
+        self.meeting_mask = meeting_mask
+
+
+class CourseRecord(Record):
+    """
+    One row of `courses`.
+    """
+
+    FIELDS = ("id", "code", "title", "credits", "subject", "course_code")
+    INTERNED = frozenset(("subject",))
+    __slots__ = FIELDS
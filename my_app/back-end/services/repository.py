@@ -0,0 +1,224 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+import httpx
+from postgrest.exceptions import APIError
+from supabase import create_client, Client, ClientOptions
+from credentials import SUPABASE_URL, SUPABASE_KEY
+from services.instrumentation import record_query, record_response_bytes
+
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "16"))
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "3"))
+SUPABASE_RETRY_BACKOFF = float(os.getenv("SUPABASE_RETRY_BACKOFF", "0.2"))
+# Rows per request (the API's max-rows) and ids per in_() filter (keeps the URL bounded).
+PAGE_SIZE = 1000
+IN_CHUNK_SIZE = 500
+
+# Failures where the request never reached PostgREST: safe to retry for any method.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# HTTP statuses / Postgres error classes worth another attempt.
+_TRANSIENT_STATUSES = {"429", "502", "503", "504"}
+_TRANSIENT_PG_CLASSES = ("08", "53", "57P01")
+_IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(SUPABASE_MAX_CONCURRENCY)
+
+
+def get_client() -> Client:
+    """
+    The process-wide Supabase client, created on first use.
+
+    It is created lazily, and dropped again in a forked child, so that each
+    gunicorn worker builds its own; all services in the worker then share
+    its HTTP keep-alive pool.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client(
+                    SUPABASE_URL,
+                    SUPABASE_KEY,
+                    options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+                )
+                _count_response_bytes(_client)
+    return _client
+
+
+def set_client(client: Optional[Client]) -> None:
+    """
+    Replaces the process-wide client, e.g. with the in-memory stand-in used by
+    benchmarks/. None goes back to creating a real client on next use.
+    """
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def _reset_after_fork() -> None:
+    # A client created before the fork (gunicorn --preload warms the caches in the
+    # master) would share its keep-alive sockets with every worker; each child
+    # starts over with its own client, lock and connection slots.
+    global _client, _client_lock, _slots
+    _client = None
+    _client_lock = threading.Lock()
+    _slots = threading.BoundedSemaphore(SUPABASE_MAX_CONCURRENCY)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _count_response_bytes(client: Client) -> None:
+    # Response sizes are only visible on the PostgREST HTTP session, so they are counted by a hook there.
+    session = getattr(getattr(client, "postgrest", None), "session", None)
+    if session is not None:
+        hooks = dict(session.event_hooks)
+        hooks["response"] = list(hooks.get("response", [])) + [record_response_bytes]
+        session.event_hooks = hooks
+
+
+def _is_transient(error: Exception, idempotent: bool) -> bool:
+    if isinstance(error, _CONNECT_ERRORS):
+        return True
+    if isinstance(error, httpx.TransportError):
+        # Timed out or dropped after sending: only repeat reads.
+        return idempotent
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if code in _TRANSIENT_STATUSES:
+            return idempotent or code == "429"
+        return idempotent and code.startswith(_TRANSIENT_PG_CLASSES)
+    return False
+
+
+def execute(builder):
+    """
+    Runs a PostgREST request builder under the process-wide concurrency
+    limit, retrying transient failures with exponential backoff and jitter.
+    Every call is recorded (latency including retries, rows) in the request's
+    query accounting and the Prometheus metrics.
+    """
+    method = str(getattr(builder, "http_method", "")).upper()
+    started = time.perf_counter()
+    try:
+        response = _execute_with_retries(builder, method in _IDEMPOTENT_METHODS)
+    except Exception:
+        record_query(getattr(builder, "path", ""), method, 0, time.perf_counter() - started, ok=False)
+        raise
+    data = getattr(response, "data", None)
+    rows = len(data) if isinstance(data, list) else int(data is not None)
+    record_query(getattr(builder, "path", ""), method, rows, time.perf_counter() - started)
+    return response
+
+
+def _execute_with_retries(builder, idempotent: bool):
+    attempt = 0
+    while True:
+        if not _slots.acquire(timeout=SUPABASE_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a free Supabase connection slot")
+        try:
+            return builder.execute()
+        except Exception as e:
+            if attempt >= SUPABASE_MAX_RETRIES or not _is_transient(e, idempotent):
+                raise
+            error = e
+        finally:
+            _slots.release()
+
+        delay = SUPABASE_RETRY_BACKOFF * (2 ** attempt)
+        delay += random.uniform(0, delay)
+        attempt += 1
+        logger.warning("Supabase request failed (%s), retry %d/%d in %.2fs", error, attempt, SUPABASE_MAX_RETRIES, delay)
+        time.sleep(delay)
+
+
+class Query:
+    """
+    Wraps a PostgREST builder: filter/modifier calls are passed through and
+    re-wrapped, and execute() goes through the repository's retry policy.
+    """
+
+    __slots__ = ("_builder",)
+
+    def __init__(self, builder):
+        self._builder = builder
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # e.g. the `not_` property, which returns the builder itself
+            return Query(attr) if hasattr(attr, "execute") else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            return Query(result) if hasattr(result, "execute") else result
+        return call
+
+    def execute(self):
+        return execute(self._builder)
+
+
+class Repository:
+    """
+    Data-access entry point for every service. Mirrors the subset of the
+    supabase Client API the services use (table/from_/rpc), so query code
+    stays `supabase.table(...).select(...).execute()`.
+    """
+
+    def table(self, name: str) -> Query:
+        return Query(get_client().table(name))
+
+    def from_(self, name: str) -> Query:
+        return Query(get_client().from_(name))
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> Query:
+        return Query(get_client().rpc(fn, params or {}))
+
+
+supabase = Repository()
+
+
+def fetch_paged(make_query) -> List[dict]:
+    """
+    Every row of the query make_query() builds, read PAGE_SIZE rows at a time.
+    The query must be ordered by a unique key, or pages may overlap.
+    """
+    rows = []
+    start = 0
+    while True:
+        page = make_query().range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+def fetch_in(table: str, columns: str, column: str, values: Sequence,
+             order: Sequence[str] = (), where: Optional[Dict] = None) -> List[dict]:
+    """
+    Rows of `table` whose `column` is in `values` (plus eq filters from `where`),
+    with the id list split into IN_CHUNK_SIZE chunks and each chunk paged.
+    `order` lists the columns that, after `column`, make the row order unique.
+    """
+    values = list(values)
+    rows = []
+    for i in range(0, len(values), IN_CHUNK_SIZE):
+        chunk = values[i:i + IN_CHUNK_SIZE]
+
+        def make_query():
+            query = supabase.table(table).select(columns).in_(column, chunk)
+            for key, value in (where or {}).items():
+                query = query.eq(key, value)
+            # One "a,b" order parameter: PostgREST's syntax for a multi-column sort.
+            return query.order(",".join((column, *order)))
+
+        rows.extend(fetch_paged(make_query))
+    return rows
@@ -1,215 +1,184 @@
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-def get_merged_requirements_for_student(
-    student_id: int,
-    major_program_name: str,
-    core_program_name: str = "University Core Requirements",
-    full_view: bool = False,
-    debug: bool = False
-) -> dict:
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from services.repository import supabase
+from services.term_catalog import parse_core_attributes
+from services.instrumentation import timed
+
+REQUIREMENTS_CACHE_TTL = float(os.getenv("REQUIREMENTS_CACHE_TTL", "600"))
+# Независимые чтения (данные студента, Core- и Major-программа) выполняются
+# параллельно в пуле потоков; REQUIREMENTS_FANOUT=0 возвращает последовательный режим.
+REQUIREMENTS_FANOUT = os.getenv("REQUIREMENTS_FANOUT", "1") != "0"
+REQUIREMENTS_FANOUT_WORKERS = int(os.getenv("REQUIREMENTS_FANOUT_WORKERS", "8"))
+PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+_fanout_executor: Optional[ThreadPoolExecutor] = None
+_fanout_lock = threading.Lock()
+
+
+def _get_fanout_executor() -> ThreadPoolExecutor:
+    # Пул создаётся при первом запросе, т.е. уже в воркере после fork.
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(max_workers=REQUIREMENTS_FANOUT_WORKERS,
+                                                      thread_name_prefix="requirements-fanout")
+    return _fanout_executor
+
+
+def _reset_after_fork() -> None:
+    # Потоки пула родителя в дочернем процессе не существуют.
+    global _fanout_executor, _fanout_lock
+    _fanout_executor = None
+    _fanout_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _expected_core_attribute(group_name: str) -> str:
+    lower_name = group_name.lower()
+    if lower_name.startswith("core "):
+        return group_name[5:].strip()
+    if lower_name.endswith(" core"):
+        return group_name[:-4].strip()
+    parts = group_name.split()
+    return " ".join(p for p in parts if p.lower() != "core").strip()
+
+
+def _double_count_groups(note: Optional[str]) -> List[int]:
+    note = note or ""
+    if "Can double count with" not in note:
+        return []
+    try:
+        parts = note.split("with")[-1].replace("(", "").replace(")", "").split(",")
+        return [int(x.strip()) for x in parts if x.strip().isdigit()]
+    except ValueError:
+        return []
+
+
+class RequirementGroup:
     """
-    Универсальная функция, объединяющая логику "Core" и "Major" в одном месте.
-    В выводе:
-      - Для Core-групп (название содержит "core") поле available_courses будет строкой вида "CORE X".
-      - Для не-Core групп available_courses будет списком доступных курсов.
-
-    :param student_id:        ID студента (user_id в таблице enrollments)
-    :param major_program_name: Название Major-программы (например, "B.S. Computer Science - Data Science Concentration")
-    :param core_program_name:  Название Core-программы (по умолчанию "University Core Requirements")
-    :param full_view:          Если True, выводит детальную информацию
-    :param debug:              Если True, печатает отладочные сообщения
-    :return: словарь вида:
-        {
-          "core_requirements": { ...результат для Core... },
-          "major_requirements": { ...результат для Major... }
-        }
+    Одна группа требований программы, уже разобранная из requirement_groups
+    и requirement_courses.
     """
 
-    resp_enroll = supabase.table("enrollments") \
-        .select("section_id") \
-        .eq("user_id", student_id) \
-        .execute()
-    if not resp_enroll.data:
-        if debug:
-            print(f"[DEBUG] Student {student_id} has no enrollments.")
-        return {
-            "core_requirements": {},
-            "major_requirements": {}
-        }
+    def __init__(self, row: dict, course_codes: set):
+        self.id = row["id"]
+        self.name = row["name"]
+        self.json_id = int(row.get("json_group_id", 0) or 0)
+        self.required_credits = row.get("req_credits", 0)
+        self.course_codes = frozenset(course_codes)
+        self.sorted_course_codes = tuple(sorted(self.course_codes))
+        self.is_core = "core" in self.name.lower()
+        self.expected_attribute = _expected_core_attribute(self.name) if self.is_core else None
+        self.double_count_groups = frozenset(_double_count_groups(row.get("note")))
 
-    enrolled_section_ids = [row["section_id"] for row in resp_enroll.data]
 
-    resp_secs = supabase.table("sections") \
-        .select("course_id, term, section, attribute") \
-        .in_("section_id", enrolled_section_ids) \
-        .execute()
-    student_sections = resp_secs.data or []
-
-    taken_classes_core = []
-    taken_courses_major = set()
+class ProgramRequirements:
+    """
+    Скомпилированная модель требований одной программы (degree_program).
 
-    for sec in student_sections:
-        c_id = sec["course_id"]
-        t = sec["term"]
-        s = sec["section"]
+    Загружается тремя запросами (programs, requirement_groups и один in_ по
+    всем group_id в requirement_courses) и переиспользуется между запросами,
+    так что оценка конкретного студента сводится к операциям над множествами.
+    """
 
-        taken_classes_core.append({
-            "course_id": c_id,
-            "term": t,
-            "section": s
-        })
-        taken_courses_major.add(c_id)
+    def __init__(self, degree_program: str, program_id: int, groups: List[RequirementGroup]):
+        self.degree_program = degree_program
+        self.program_id = program_id
+        self.groups = groups
 
-    taken_courses_major = list(taken_courses_major)
+    @classmethod
+    def load(cls, degree_program: str) -> Optional["ProgramRequirements"]:
+        resp_prog = supabase.table("programs").select("program_id") \
+            .eq("degree_program", degree_program).execute()
+        if not resp_prog.data:
+            return None
+        program_id = resp_prog.data[0]["program_id"]
 
-    core_requirements = {}
-    resp_core_prog = supabase.table("programs").select("program_id") \
-        .eq("degree_program", core_program_name).execute()
-    if not resp_core_prog.data:
-        if debug:
-            print(f"[DEBUG] Core program '{core_program_name}' not found.")
-    else:
-        core_program_id = resp_core_prog.data[0]["program_id"]
-        resp_core_groups = supabase.table("requirement_groups") \
+        resp_groups = supabase.table("requirement_groups") \
             .select("*") \
-            .eq("program_id", core_program_id) \
-            .execute()
-        core_groups = resp_core_groups.data or []
-
-        for g in core_groups:
-            g["json_id"] = g.get("json_group_id", 0)
-        core_groups.sort(key=lambda x: int(x["json_id"] or 0))
-
-        course_ids_for_core = {sec["course_id"] for sec in student_sections}
-        resp_cr = supabase.table("courses").select("code, credits") \
-            .in_("code", list(course_ids_for_core)) \
+            .eq("program_id", program_id) \
             .execute()
-        course_map_core = {row["code"]: row["credits"] for row in (resp_cr.data or [])}
-
-        taken_info_core = {}
-        for sec in student_sections:
-            c_id = sec["course_id"]
-            t = sec["term"]
-            s = sec["section"]
-            attr_str = sec.get("attribute", "") or ""
-            core_attrs = []
-            for part in attr_str.split(","):
-                part = part.strip()
-                if part.lower().startswith("core:"):
-                    extracted = part[5:].strip()
-                    core_attrs.append(extracted)
-
-            c_credits = course_map_core.get(c_id, 0)
-            taken_info_core[(c_id, t, s)] = {
-                "core_attrs": core_attrs,
-                "credits": c_credits
-            }
-
-        for group in core_groups:
-            group_name = group["name"]
-            group_json_id = int(group.get("json_id", 0))
-            required_credits = group.get("req_credits", 0)
-            group_id = group["id"]
+        group_rows = resp_groups.data or []
 
-            is_core_group = ("core" in group_name.lower())
+        codes_by_group: Dict[int, set] = {row["id"]: set() for row in group_rows}
+        if codes_by_group:
+            start = 0
+            while True:
+                resp_req = supabase.table("requirement_courses") \
+                    .select("group_id, course_code") \
+                    .in_("group_id", list(codes_by_group)) \
+                    .order("group_id") \
+                    .order("course_code") \
+                    .range(start, start + PAGE_SIZE - 1) \
+                    .execute()
+                page = resp_req.data or []
+                for row in page:
+                    codes_by_group.setdefault(row["group_id"], set()).add(row["course_code"])
+                if len(page) < PAGE_SIZE:
+                    break
+                start += PAGE_SIZE
+
+        groups = [RequirementGroup(row, codes_by_group[row["id"]]) for row in group_rows]
+        groups.sort(key=lambda g: g.json_id)
+        return cls(degree_program, program_id, groups)
+
+    def evaluate_core(self, taken_info: Dict[Tuple, dict]) -> dict:
+        """
+        Core-логика: группы с "core" в названии закрываются по атрибуту
+        секции ("Core: X"), остальные — по списку курсов группы.
+        """
+        requirements = {}
+        for group in self.groups:
             allocated_courses = []
             total_taken_credits = 0
 
-            if is_core_group:
-                lower_name = group_name.lower()
-                if lower_name.startswith("core "):
-                    expected_attribute = group_name[5:].strip()
-                elif lower_name.endswith(" core"):
-                    expected_attribute = group_name[:-4].strip()
-                else:
-                    parts = group_name.split()
-                    filtered_parts = [p for p in parts if p.lower() != "core"]
-                    expected_attribute = " ".join(filtered_parts).strip()
-
-                for key, info in taken_info_core.items():
+            if group.is_core:
+                expected_attribute = group.expected_attribute
+                for key, info in taken_info.items():
                     if expected_attribute and (expected_attribute in info["core_attrs"]):
                         allocated_courses.append(key[0])
                         total_taken_credits += info["credits"]
-
-                available_courses_val = f"CORE {required_credits}"
+                available_courses_val = f"CORE {group.required_credits}"
             else:
-                expected_attribute = None
-                resp_req = supabase.table("requirement_courses") \
-                    .select("course_code") \
-                    .eq("group_id", group_id) \
-                    .execute()
-                potential_codes = set()
-                for row in (resp_req.data or []):
-                    potential_codes.add(row["course_code"])
-
-                for (c_id, t, s), info in taken_info_core.items():
-                    if c_id in potential_codes:
+                for (c_id, t, s), info in taken_info.items():
+                    if c_id in group.course_codes:
                         allocated_courses.append(c_id)
                         total_taken_credits += info["credits"]
+                available_courses_val = list(group.sorted_course_codes)
 
-                potential_list = sorted(potential_codes)
-                available_courses_val = potential_list
-
-            remaining_credits = max(0, required_credits - total_taken_credits)
-            core_requirements[group_name] = {
-                "json_id": group_json_id,
-                "required_credits": required_credits,
+            requirements[group.name] = {
+                "json_id": group.json_id,
+                "required_credits": group.required_credits,
                 "taken_credits": total_taken_credits,
-                "remaining_credits": remaining_credits,
+                "remaining_credits": max(0, group.required_credits - total_taken_credits),
                 "taken_courses_in_group": sorted(set(allocated_courses)),
                 "available_courses": available_courses_val,
-                "expected_attribute": (expected_attribute if is_core_group else None)
+                "expected_attribute": group.expected_attribute
             }
 
-            if debug:
-                print(f"[DEBUG:CORE] {group_name} => allocated={allocated_courses}, total_credits={total_taken_credits}")
-
-    major_requirements = {}
-    resp_major_prog = supabase.table("programs").select("program_id") \
-        .eq("degree_program", major_program_name).execute()
-    if not resp_major_prog.data:
-        if debug:
-            print(f"[DEBUG] Major program '{major_program_name}' not found.")
-    else:
-        major_program_id = resp_major_prog.data[0]["program_id"]
-        resp_major_groups = supabase.table("requirement_groups") \
-            .select("*") \
-            .eq("program_id", major_program_id) \
-            .execute()
-        major_groups = resp_major_groups.data or []
-
-        for mg in major_groups:
-            mg["json_id"] = mg.get("json_group_id", 0)
-            note = mg.get("note", "") or ""
-            mg["double_count_groups"] = []
-            if "Can double count with" in note:
-                try:
-                    parts = note.split("with")[-1].replace("(", "").replace(")", "").split(",")
-                    mg["double_count_groups"] = [int(x.strip()) for x in parts if x.strip().isdigit()]
-                except ValueError:
-                    mg["double_count_groups"] = []
-
-        major_groups.sort(key=lambda x: int(x["json_id"] or 0))
-
-        resp_cr_maj = supabase.table("courses").select("code, credits") \
-            .in_("code", taken_courses_major).execute()
-        course_map_major = {row["code"]: row["credits"] for row in (resp_cr_maj.data or [])}
+            logger.debug("core group=%s allocated=%s credits=%s", group.name, allocated_courses, total_taken_credits)
+        return requirements
 
+    def evaluate_major(self, taken_courses: set, course_credits: Dict[str, int]) -> dict:
+        """
+        Major-логика: курс засчитывается только в одну группу, кроме групп,
+        явно разрешающих двойной зачёт ("Can double count with ...").
+        """
+        requirements = {}
         processed_groups = []
-        for group in major_groups:
-            group_name = group["name"]
-            group_json_id = int(group["json_id"] or 0)
-            required_credits = group.get("req_credits", 0)
-            group_id = group["id"]
-            allowed_for_double = set(group["double_count_groups"])
-
-            resp_req = supabase.table("requirement_courses") \
-                .select("course_code") \
-                .eq("group_id", group_id).execute()
-            potential_courses = set(r["course_code"] for r in (resp_req.data or []))
+        for group in self.groups:
+            allowed_for_double = group.double_count_groups
+            potential_courses = group.course_codes
 
             allowed_set = set()
             exclusion_set = set()
@@ -220,72 +189,222 @@ def get_merged_requirements_for_student(
                     exclusion_set |= allocated_set
 
             available_courses = (potential_courses - exclusion_set) | (allowed_set & potential_courses)
-            allocated_current = set()
-            for c_id in available_courses:
-                if c_id in taken_courses_major:
-                    allocated_current.add(c_id)
+            allocated_current = set(available_courses & taken_courses)
 
-            taken_credits = sum(course_map_major.get(c, 0) for c in allocated_current)
-            remaining_credits = max(0, required_credits - taken_credits)
+            taken_credits = sum(course_credits.get(c, 0) for c in allocated_current)
+            processed_groups.append((group.json_id, allocated_current))
 
-            processed_groups.append((group_json_id, allocated_current))
-
-            display_available = sorted(available_courses - allocated_current)
-            major_requirements[group_name] = {
-                "json_id": group_json_id,
-                "required_credits": required_credits,
+            requirements[group.name] = {
+                "json_id": group.json_id,
+                "required_credits": group.required_credits,
                 "taken_credits": taken_credits,
-                "remaining_credits": remaining_credits,
+                "remaining_credits": max(0, group.required_credits - taken_credits),
                 "taken_courses_in_group": sorted(allocated_current),
-                "available_courses": display_available,
+                "available_courses": sorted(available_courses - allocated_current),
                 "double_count_groups": sorted(allowed_for_double)
             }
 
-            if debug:
-                print(f"[DEBUG:MAJOR] {group_name} => allocated={allocated_current}, taken_credits={taken_credits}")
+            logger.debug("major group=%s allocated=%s credits=%s", group.name, sorted(allocated_current), taken_credits)
+        return requirements
 
-    if full_view:
-        print("\n========== CORE REQUIREMENTS ==========")
-        for grp_name, info in core_requirements.items():
-            print(f"Group: {grp_name}")
-            print(f"  JSON Group ID: {info['json_id']}")
-            print(f"  Required Credits: {info['required_credits']}")
-            print(f"  Taken Credits: {info['taken_credits']}")
-            print(f"  Remaining Credits: {info['remaining_credits']}")
-            print(f"  Courses Taken in Group: {', '.join(info['taken_courses_in_group'])}")
-
-            if isinstance(info["available_courses"], list):
-                if len(info["available_courses"]) > 0:
-                    print(f"  Available Courses: {', '.join(info['available_courses'])}")
-                else:
-                    print("  Available Courses: []")
-            else:
-                print(f"  Available Courses: {info['available_courses']}")
-
-            if info.get('expected_attribute'):
-                print(f"  (Core Attribute Used: {info['expected_attribute']})")
-            print("--------------------------------------------------")
-
-        print("\n========== MAJOR REQUIREMENTS ==========")
-        for grp_name, info in major_requirements.items():
-            print(f"Group: {grp_name}")
-            print(f"  JSON Group ID: {info['json_id']}")
-            print(f"  Required Credits: {info['required_credits']}")
-            print(f"  Taken Credits: {info['taken_credits']}")
-            print(f"  Remaining Credits: {info['remaining_credits']}")
-            print(f"  Courses Taken in Group: {', '.join(info['taken_courses_in_group'])}")
-
-            if isinstance(info["available_courses"], list):
-                if len(info["available_courses"]) > 0:
-                    print(f"  Available Courses: {', '.join(info['available_courses'])}")
-                else:
-                    print("  Available Courses: []")
 
-            if info['double_count_groups']:
-                print(f"  Can double count with groups: {info['double_count_groups']}")
-            print("--------------------------------------------------")
+_program_cache: Dict[str, Tuple[float, Optional[ProgramRequirements]]] = {}
+_program_cache_lock = threading.Lock()
+# Отдельная блокировка на программу, чтобы Core и Major грузились параллельно.
+_program_load_locks: Dict[str, threading.Lock] = {}
+
+
+def get_program_requirements(degree_program: str) -> Optional[ProgramRequirements]:
+    """
+    Возвращает скомпилированную модель программы из кэша процесса
+    (или None, если программы нет). Запись живёт REQUIREMENTS_CACHE_TTL секунд.
+    """
+    cached = _program_cache.get(degree_program)
+    if cached is not None and time.monotonic() - cached[0] < REQUIREMENTS_CACHE_TTL:
+        return cached[1]
+    with _program_cache_lock:
+        load_lock = _program_load_locks.setdefault(degree_program, threading.Lock())
+    with load_lock:
+        cached = _program_cache.get(degree_program)
+        if cached is not None and time.monotonic() - cached[0] < REQUIREMENTS_CACHE_TTL:
+            return cached[1]
+        program = ProgramRequirements.load(degree_program)
+        _program_cache[degree_program] = (time.monotonic(), program)
+        return program
+
+
+def invalidate_program_requirements(degree_program: Optional[str] = None) -> None:
+    """
+    Сбрасывает кэш требований после изменения таблиц programs,
+    requirement_groups или requirement_courses (всех программ, если имя не указано).
+    """
+    with _program_cache_lock:
+        if degree_program is None:
+            _program_cache.clear()
+        else:
+            _program_cache.pop(degree_program, None)
+
+
+def collect_taken_info(student_sections: List[dict], course_credits: Dict[str, int]) -> Dict[Tuple, dict]:
+    """
+    Ключ (course_id, term, section) -> Core-атрибуты и кредиты пройденной секции.
+    """
+    taken_info = {}
+    for sec in student_sections:
+        taken_info[(sec["course_id"], sec["term"], sec["section"])] = {
+            "core_attrs": parse_core_attributes(sec.get("attribute")),
+            "credits": course_credits.get(sec["course_id"], 0)
+        }
+    return taken_info
+
+
+def _log_requirements(core_requirements: dict, major_requirements: dict) -> None:
+    for title, requirements in (("core", core_requirements), ("major", major_requirements)):
+        for grp_name, info in requirements.items():
+            logger.info(
+                "%s group=%r json_id=%s required=%s taken=%s remaining=%s taken_courses=%s available=%s%s",
+                title, grp_name, info["json_id"], info["required_credits"], info["taken_credits"],
+                info["remaining_credits"], info["taken_courses_in_group"], info["available_courses"],
+                f" attribute={info['expected_attribute']!r}" if info.get("expected_attribute") else
+                f" double_count={info['double_count_groups']}" if info.get("double_count_groups") else ""
+            )
+
+
+def load_student_sections(student_id: int) -> Optional[List[dict]]:
+    """
+    Секции (course_id, term, section, attribute), на которые записан студент,
+    или None, если у студента нет ни одной записи в enrollments.
+    """
+    resp_enroll = supabase.table("enrollments") \
+        .select("section_id") \
+        .eq("user_id", student_id) \
+        .execute()
+    if not resp_enroll.data:
+        return None
+
+    enrolled_section_ids = [row["section_id"] for row in resp_enroll.data]
+
+    resp_secs = supabase.table("sections") \
+        .select("course_id, term, section, attribute") \
+        .in_("section_id", enrolled_section_ids) \
+        .execute()
+    return resp_secs.data or []
+
+
+def load_course_credits(course_codes) -> Dict[str, int]:
+    """
+    Кредиты курсов: code -> credits.
+    """
+    if not course_codes:
+        return {}
+    resp_cr = supabase.table("courses").select("code, credits") \
+        .in_("code", list(course_codes)) \
+        .execute()
+    return {row["code"]: row["credits"] for row in (resp_cr.data or [])}
+
+
+def evaluate_student_requirements(
+    student_sections: List[dict],
+    major_program_name: str,
+    core_program_name: str = "University Core Requirements",
+    course_credits: Optional[Dict[str, int]] = None
+) -> dict:
+    """
+    Оценивает Core и Major требования по уже загруженным секциям студента.
+    course_credits можно передать заранее загруженными (см. load_course_credits).
+    """
+    taken_courses = {sec["course_id"] for sec in student_sections}
+
+    core_program = get_program_requirements(core_program_name)
+    major_program = get_program_requirements(major_program_name)
+    if core_program is None:
+        logger.debug("core program %r not found", core_program_name)
+    if major_program is None:
+        logger.debug("major program %r not found", major_program_name)
+
+    if course_credits is None:
+        course_credits = {}
+        if core_program or major_program:
+            course_credits = load_course_credits(taken_courses)
+
+    core_requirements = {}
+    if core_program is not None:
+        core_requirements = core_program.evaluate_core(
+            collect_taken_info(student_sections, course_credits)
+        )
+
+    major_requirements = {}
+    if major_program is not None:
+        major_requirements = major_program.evaluate_major(taken_courses, course_credits)
 
     return {
         "core_requirements": core_requirements,
         "major_requirements": major_requirements
-    } 
\ No newline at end of file
+    }
+
+
+@timed
+def get_merged_requirements_for_student(
+    student_id: int,
+    major_program_name: str,
+    core_program_name: str = "University Core Requirements",
+    full_view: bool = False
+) -> dict:
+    """
+    Универсальная функция, объединяющая логику "Core" и "Major" в одном месте.
+    В выводе:
+      - Для Core-групп (название содержит "core") поле available_courses будет строкой вида "CORE X".
+      - Для не-Core групп available_courses будет списком доступных курсов.
+
+    Требования программ берутся из кэша ProgramRequirements, поэтому на тёплом
+    пути запросы к Supabase касаются только данных самого студента. На холодном
+    пути (при REQUIREMENTS_FANOUT) загрузка Core- и Major-программы идёт в пуле
+    потоков параллельно с цепочкой enrollments -> sections -> courses, так что
+    задержка равна самой длинной цепочке, а не сумме всех запросов.
+
+    :param student_id:        ID студента (user_id в таблице enrollments)
+    :param major_program_name: Название Major-программы (например, "B.S. Computer Science - Data Science Concentration")
+    :param core_program_name:  Название Core-программы (по умолчанию "University Core Requirements")
+    :param full_view:          Если True, пишет детальную информацию в лог (INFO);
+                               ход вычислений пишется на уровне DEBUG
+    :return: словарь вида:
+        {
+          "core_requirements": { ...результат для Core... },
+          "major_requirements": { ...результат для Major... }
+        }
+    """
+
+    course_credits = None
+    if REQUIREMENTS_FANOUT:
+        program_futures = [
+            # В контексте запроса, чтобы запросы потока попали в учёт запроса.
+            _get_fanout_executor().submit(contextvars.copy_context().run, get_program_requirements, name)
+            for name in (core_program_name, major_program_name)
+        ]
+        student_sections = load_student_sections(student_id)
+        if student_sections is not None:
+            course_credits = load_course_credits({sec["course_id"] for sec in student_sections})
+        # Ждём программы: дальше evaluate_student_requirements берёт их из кэша.
+        for future in program_futures:
+            future.result()
+    else:
+        student_sections = load_student_sections(student_id)
+
+    if student_sections is None:
+        logger.debug("student %s has no enrollments", student_id)
+        return {
+            "core_requirements": {},
+            "major_requirements": {}
+        }
+
+    result = evaluate_student_requirements(
+        student_sections,
+        major_program_name=major_program_name,
+        core_program_name=core_program_name,
+        course_credits=course_credits
+    )
+
+    if full_view:
+        _log_requirements(result["core_requirements"], result["major_requirements"])
+
+    return result
@@ -0,0 +1,140 @@
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import Response, make_response, request
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+CacheKey = Tuple[str, Tuple[Tuple[str, Tuple[str, ...]], ...]]
+
+
+class _CachedResponse:
+    __slots__ = ("created_at", "body", "mimetype", "etag")
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.created_at = time.monotonic()
+        self.body = body
+        self.mimetype = mimetype
+        # Strong validator: identical bytes <=> identical ETag.
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+
+class ResponseCache:
+    """
+    LRU of serialized GET responses with a TTL, keyed by route and
+    normalized query parameters.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, _CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[_CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.created_at >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: CacheKey, body: bytes, mimetype: str) -> _CachedResponse:
+        entry = _CachedResponse(body, mimetype)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def purge(self, path_prefix: Optional[str] = None) -> int:
+        """
+        Drops every entry (or those whose route starts with path_prefix).
+        :return: number of entries removed
+        """
+        with self._lock:
+            if path_prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [key for key in self._entries if key[0].startswith(path_prefix)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+
+response_cache = ResponseCache()
+
+
+class BytesCache:
+    """
+    Plain LRU of generated files (no TTL) for keys that already change with
+    their content, such as a hash of the data the file was built from.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _request_key() -> CacheKey:
+    # Parameter order and empty values do not change the result of these endpoints.
+    params = tuple(sorted(
+        (name, tuple(v.strip() for v in values))
+        for name, values in request.args.lists()
+        if any(v.strip() for v in values)
+    ))
+    return request.path, params
+
+
+def _to_response(entry: _CachedResponse) -> Response:
+    if request.if_none_match.contains_weak(entry.etag):
+        response = Response(status=304)
+    else:
+        response = Response(entry.body, mimetype=entry.mimetype)
+    response.set_etag(entry.etag)
+    # Browsers may keep the body but must revalidate, so a purge is seen on the next request.
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def cached_response(view):
+    """
+    Serves a read-only GET view from response_cache.
+    Only 200 responses are stored; clients get a strong ETag and a 304 on a matching If-None-Match.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = _request_key()
+        entry = response_cache.get(key)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            entry = response_cache.put(key, response.get_data(), response.mimetype)
+        return _to_response(entry)
+    return wrapper
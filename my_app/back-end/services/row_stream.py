@@ -0,0 +1,46 @@
+import json
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def primed(pages: Iterator[List[Dict]]) -> Iterator[List[Dict]]:
+    """
+    Reads the first page right away, so that a failing first query raises in the
+    view (and becomes an error status) instead of after the 200 has been sent.
+    """
+    first = next(pages, None)
+    return chain(() if first is None else (first,), pages)
+
+
+def ndjson_chunks(pages: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """
+    One JSON object per line, one chunk per page. A read failing mid-stream ends
+    the body with an {"error": ...} line, since the status is already sent.
+    """
+    try:
+        for page in pages:
+            yield "".join(_dumps(row) + "\n" for row in page).encode()
+    except Exception as e:
+        print(f"Error streaming rows: {str(e)}")
+        yield (_dumps({"error": "Stream interrupted"}) + "\n").encode()
+
+
+def json_envelope_chunks(pages: Iterable[List[Dict]], head: Dict, count_key: Optional[str] = None) -> Iterator[bytes]:
+    """
+    {**head, "data": [...rows]} (plus "count" under count_key, written last) page by page,
+    so the rows are never held in memory all at once. A failing read is raised to the
+    caller; streamed, that aborts the response and clients reject the truncated JSON.
+    """
+    opening = _dumps(head)[:-1]
+    yield f'{opening}{"," if head else ""}"data":['.encode()
+    count = 0
+    for page in pages:
+        yield (("," if count else "") + ",".join(map(_dumps, page))).encode()
+        count += len(page)
+    yield (f'],"{count_key}":{count}}}' if count_key else "]}").encode()
@@ -0,0 +1,281 @@
+import heapq
+import itertools
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from services.prereq_service import get_course_prerequisites
+from services.records import SectionRecord
+from services.requirements_service import load_student_sections, evaluate_student_requirements
+from services.term_catalog import get_term_catalog
+from services.terms import default_term
+from services.instrumentation import timed
+
+SCHEDULE_OPTIMIZER_TIME_BUDGET = float(os.getenv("SCHEDULE_OPTIMIZER_TIME_BUDGET", "2.0"))
+# Budget of the single-plan search behind /next_semester_plan, which is on the page-load path.
+NEXT_SEMESTER_PLAN_TIME_BUDGET = float(os.getenv("NEXT_SEMESTER_PLAN_TIME_BUDGET", "0.15"))
+MAX_CANDIDATES_PER_GROUP = 8
+
+COVERAGE_WEIGHT = 10.0
+CREDIT_WEIGHT = 3.0
+BALANCE_WEIGHT = 5.0
+CORE_RATIO_RANGE = (0.3, 0.5)
+
+LAB_SUBJECTS = {"BIOL", "CHEM", "PHYS"}
+
+logger = logging.getLogger(__name__)
+
+
+def _lab_pair(course_code: str) -> Optional[str]:
+    m = re.match(r"([A-Z]+)\s*(\d+)(L?)", course_code)
+    if not m or m.group(1) not in LAB_SUBJECTS:
+        return None
+    if m.group(3) == "L":
+        return f"{m.group(1)} {m.group(2)}"
+    return f"{m.group(1)} {m.group(2)}L"
+
+
+class _Candidate:
+    """
+    One course the student could take next term, with its conflict-free
+    section choices and the requirement group it counts toward.
+    """
+
+    def __init__(self, course_id: str, group_key: Tuple[str, str], options: List[Tuple[SectionRecord, int, int]]):
+        self.course_id = course_id
+        self.group_key = group_key
+        self.options = options
+        self.max_credits = max(credits for _, credits, _ in options)
+        self.corequisite: Optional[str] = None
+
+
+def _section_options(sections: List[SectionRecord]) -> List[Tuple[SectionRecord, int, int]]:
+    """
+    (section, credits, meeting mask) per section; sections that meet at the
+    same times for the same credits are interchangeable, so only the first is kept.
+    """
+    options = []
+    seen = set()
+    for sec in sections:
+        credits = sec.credits or 0
+        mask = sec.meeting_mask
+        if (mask, credits) in seen:
+            continue
+        seen.add((mask, credits))
+        options.append((sec, credits, mask))
+    return options
+
+
+def _collect_candidates(requirements: dict, taken_courses: set, catalog,
+                        max_candidates_per_group: int) -> Tuple[List[_Candidate], Dict[Tuple[str, str], int]]:
+    needs: Dict[Tuple[str, str], int] = {}
+    courses_by_group: Dict[Tuple[str, str], List[str]] = {}
+
+    for kind, reqs in (("major", requirements["major_requirements"]),
+                       ("core", requirements["core_requirements"])):
+        for group_name, info in reqs.items():
+            if info["remaining_credits"] <= 0:
+                continue
+            available = info["available_courses"]
+            if isinstance(available, str):
+                attr = info.get("expected_attribute")
+                codes = sorted({row.course_id for row in catalog.sections_with_core_attribute(attr)}) if attr else []
+            else:
+                codes = available
+            key = (kind, group_name)
+            needs[key] = info["remaining_credits"]
+            courses_by_group[key] = [c for c in codes if c not in taken_courses]
+
+    # Each course counts toward the open group that still needs the most credits.
+    best_group: Dict[str, Tuple[str, str]] = {}
+    for key, codes in courses_by_group.items():
+        for code in codes:
+            current = best_group.get(code)
+            if current is None or needs[key] > needs[current]:
+                best_group[code] = key
+
+    candidates = []
+    per_group: Dict[Tuple[str, str], int] = {}
+    for code in sorted(best_group):
+        key = best_group[code]
+        if per_group.get(key, 0) >= max_candidates_per_group:
+            continue
+        if not all(p in taken_courses for p in get_course_prerequisites(code)):
+            continue
+        options = _section_options(catalog.sections_for_course(code))
+        if not options:
+            continue
+        candidates.append(_Candidate(code, key, options))
+        per_group[key] = per_group.get(key, 0) + 1
+
+    by_course = {c.course_id: c for c in candidates}
+    for cand in list(candidates):
+        pair = _lab_pair(cand.course_id)
+        if pair and pair not in taken_courses:
+            if pair not in by_course:
+                candidates.remove(cand)
+            else:
+                cand.corequisite = pair
+
+    candidates.sort(key=lambda c: (-min(needs[c.group_key], c.max_credits), c.course_id))
+    return candidates, needs
+
+
+def _score(chosen: List[Tuple[_Candidate, SectionRecord, int]], needs: Dict[Tuple[str, str], int],
+           total_credits: int, target_credits: int) -> float:
+    credits_by_group: Dict[Tuple[str, str], int] = {}
+    n_core = 0
+    for cand, _, credits in chosen:
+        credits_by_group[cand.group_key] = credits_by_group.get(cand.group_key, 0) + credits
+        if cand.group_key[0] == "core":
+            n_core += 1
+    coverage = sum(min(needs[key], credits) for key, credits in credits_by_group.items())
+
+    ratio = n_core / len(chosen)
+    lo, hi = CORE_RATIO_RANGE
+    balance_penalty = max(0.0, lo - ratio, ratio - hi) * len(chosen)
+
+    return (COVERAGE_WEIGHT * coverage
+            - CREDIT_WEIGHT * abs(target_credits - total_credits)
+            - BALANCE_WEIGHT * balance_penalty)
+
+
+@timed
+def plan_schedule_options(
+    student_id: int,
+    major_program_name: str,
+    core_program_name: str = "University Core Requirements",
+    next_term: Optional[str] = None,
+    max_credits_per_semester: int = 18,
+    target_credits: Optional[int] = None,
+    top_k: int = 5,
+    time_budget: float = SCHEDULE_OPTIMIZER_TIME_BUDGET,
+    max_candidates_per_group: int = MAX_CANDIDATES_PER_GROUP
+) -> dict:
+    """
+    Returns the top_k conflict-free schedules for next_term (default_term() when not given).
+
+    Candidate courses come from the student's open Core/Major groups (with
+    prerequisites met and at least one section in the term). A depth-first
+    branch-and-bound enumerates course/section combinations: a section is
+    only tried when its meeting bitmask does not intersect the schedule's,
+    and a branch is cut when even perfect requirement coverage of the
+    remaining candidates could not beat the current k-th best score.
+    Schedules are scored on requirement coverage, distance from
+    target_credits and the Core/Major balance. The search stops after
+    time_budget seconds and returns the best schedules found so far, or
+    as soon as the k-th best reaches the upper bound of the whole tree.
+
+    :return: {"term": ..., "complete": bool, "options": [
+                 {"score": ..., "total_credits": ..., "courses": [
+                     {"section_id", "crn", "course_id", "credits", "group", "type", "days", "time_slot"}, ...]}, ...]}
+    """
+    if target_credits is None:
+        target_credits = max_credits_per_semester
+    next_term = next_term or default_term()
+
+    student_sections = load_student_sections(student_id) or []
+    taken_courses = {sec["course_id"] for sec in student_sections}
+    requirements = evaluate_student_requirements(
+        student_sections,
+        major_program_name=major_program_name,
+        core_program_name=core_program_name
+    )
+    catalog = get_term_catalog(next_term)
+    candidates, needs = _collect_candidates(requirements, taken_courses, catalog, max_candidates_per_group)
+
+    logger.debug("schedule search candidates=%s", [c.course_id for c in candidates])
+
+    n = len(candidates)
+    # suffix_credits[i][key]: credits the candidates from i onward could add to a group.
+    suffix_credits: List[Dict[Tuple[str, str], int]] = [dict() for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        suffix_credits[i] = dict(suffix_credits[i + 1])
+        key = candidates[i].group_key
+        suffix_credits[i][key] = suffix_credits[i].get(key, 0) + candidates[i].max_credits
+
+    best: List[Tuple[float, int, list, int]] = []
+    counter = itertools.count()
+    deadline = time.monotonic() + time_budget
+    state = {"timed_out": False}
+    chosen: List[Tuple[_Candidate, SectionRecord, int]] = []
+    covered: Dict[Tuple[str, str], int] = {}
+
+    def record(total_credits: int) -> None:
+        if not chosen:
+            return
+        in_schedule = {cand.course_id for cand, _, _ in chosen}
+        if any(cand.corequisite and cand.corequisite not in in_schedule for cand, _, _ in chosen):
+            return
+        score = _score(chosen, needs, total_credits, target_credits)
+        entry = (score, next(counter), list(chosen), total_credits)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        elif score > best[0][0]:
+            heapq.heapreplace(best, entry)
+
+    def bound(i: int, total_credits: int) -> float:
+        coverage = sum(min(needs[key], credits) for key, credits in covered.items())
+        extra = sum(
+            min(max(0, needs[key] - covered.get(key, 0)), credits)
+            for key, credits in suffix_credits[i].items()
+        )
+        return COVERAGE_WEIGHT * (coverage + min(extra, max_credits_per_semester - total_credits))
+
+    # No schedule scores above this, so once the k-th best reaches it the search is done.
+    root_bound = bound(0, 0)
+
+    def search(i: int, used_mask: int, total_credits: int) -> None:
+        if state["timed_out"] or (len(best) >= top_k and best[0][0] >= root_bound):
+            return
+        if time.monotonic() > deadline:
+            state["timed_out"] = True
+            return
+        if len(best) >= top_k and bound(i, total_credits) <= best[0][0]:
+            return
+        if i == n:
+            record(total_credits)
+            return
+
+        cand = candidates[i]
+        for sec, credits, mask in cand.options:
+            if used_mask & mask or total_credits + credits > max_credits_per_semester:
+                continue
+            chosen.append((cand, sec, credits))
+            covered[cand.group_key] = covered.get(cand.group_key, 0) + credits
+            search(i + 1, used_mask | mask, total_credits + credits)
+            covered[cand.group_key] -= credits
+            chosen.pop()
+        search(i + 1, used_mask, total_credits)
+
+    search(0, 0, 0)
+
+    options = []
+    for score, _, picked, total_credits in sorted(best, key=lambda e: (-e[0], e[1])):
+        options.append({
+            "score": round(score, 3),
+            "total_credits": total_credits,
+            "courses": [
+                {
+                    "section_id": sec.section_id,
+                    "crn": sec.crn,
+                    "course_id": cand.course_id,
+                    "credits": credits,
+                    "group": cand.group_key[1],
+                    "type": cand.group_key[0],
+                    "days": sec.days,
+                    "time_slot": sec.time_slot
+                }
+                for cand, sec, credits in picked
+            ]
+        })
+
+    logger.debug("schedule search %s, %d options", "timed out" if state["timed_out"] else "complete", len(options))
+
+    return {
+        "term": next_term,
+        "complete": not state["timed_out"],
+        "options": options
+    }
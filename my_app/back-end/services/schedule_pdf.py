@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import zipfile
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from services.repository import fetch_in
+from services.meeting_times import DAY_CODES, parse_time_slot
+from services.pdf_writer import PdfWriter, fit_text
+from services.response_cache import BytesCache
+from services.term_catalog import get_term_catalog
+
+PDF_CACHE_SIZE = int(os.getenv("PDF_CACHE_SIZE", "512"))
+PDF_MIMETYPE = "application/pdf"
+# Bump when the layout changes, so cached files and client ETags are dropped.
+PDF_FORMAT_VERSION = "1"
+
+PAGE_WIDTH, PAGE_HEIGHT = 792, 612  # US Letter, landscape
+MARGIN = 36
+TIME_COLUMN = 48
+GRID_TOP = 84
+DAY_NAMES = {"M": "Monday", "T": "Tuesday", "W": "Wednesday", "R": "Thursday",
+             "F": "Friday", "S": "Saturday", "U": "Sunday"}
+
+_PALETTE = [
+    (0.80, 0.87, 0.97), (0.85, 0.93, 0.83), (0.99, 0.89, 0.78), (0.93, 0.84, 0.95),
+    (0.99, 0.95, 0.76), (0.80, 0.93, 0.93), (0.97, 0.83, 0.84), (0.88, 0.88, 0.88),
+]
+_NAVY = (0.08, 0.16, 0.31)  # #142A50, the header colour of the web grid
+_GRID = (0.75, 0.75, 0.75)
+
+# Columns that appear on the page; the cache key is a hash of exactly these.
+_RENDERED_FIELDS = ("course_id", "subject", "course_code", "section", "days", "time_slot", "classroom", "instructor_id")
+
+
+def _course_label(section: dict) -> str:
+    course = section.get("course_id") or f"{section.get('subject', '')} {section.get('course_code', '')}".strip()
+    return f"{course}-{section['section']}" if section.get("section") else course
+
+
+def _format_minutes(minutes: int) -> str:
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def schedule_content_hash(sections: List[dict], term: str) -> str:
+    """
+    Hash of everything the PDF shows. Students with the same sections share one cached file.
+    """
+    rows = sorted(json.dumps([s.get(field) for field in _RENDERED_FIELDS], default=str) for s in sections)
+    payload = json.dumps([PDF_FORMAT_VERSION, term, rows])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _draw_schedule(writer: PdfWriter, sections: List[dict], term: str):
+    page = writer.new_page()
+    page.text(MARGIN, MARGIN + 14, f"Gonzaga University Schedule - {term}", size=16, bold=True, color=_NAVY)
+
+    meetings = []
+    unscheduled = []
+    for section in sorted(sections, key=lambda s: (_course_label(s), str(s.get("section_id")))):
+        span = parse_time_slot(section.get("time_slot"))
+        days = [ch for ch in (section.get("days") or "").upper() if ch in DAY_CODES]
+        if span is None or not days:
+            unscheduled.append(section)
+        else:
+            meetings.append((section, span, days))
+
+    used_days = {ch for _, _, days in meetings for ch in days}
+    columns = [ch for ch in DAY_CODES if ch in "MTWRF" or ch in used_days]
+    first_hour = min([8] + [span[0] // 60 for _, span, _ in meetings])
+    last_hour = max([17] + [-(-span[1] // 60) for _, span, _ in meetings])
+
+    grid_bottom = PAGE_HEIGHT - MARGIN - (14 * min(len(unscheduled), 4) + 10 if unscheduled else 0)
+    header_height = 18
+    top = GRID_TOP + header_height
+    hour_height = (grid_bottom - top) / (last_hour - first_hour)
+    column_width = (PAGE_WIDTH - 2 * MARGIN - TIME_COLUMN) / len(columns)
+    left = MARGIN + TIME_COLUMN
+
+    page.rect(left, GRID_TOP, column_width * len(columns), header_height, fill=_NAVY)
+    for i, ch in enumerate(columns):
+        x = left + i * column_width
+        page.text(x + 6, GRID_TOP + 12.5, DAY_NAMES[ch], size=9, bold=True, color=(1, 1, 1))
+        if i:
+            page.line(x, top, x, grid_bottom, color=_GRID)
+    for hour in range(first_hour, last_hour + 1):
+        y = top + (hour - first_hour) * hour_height
+        page.line(left, y, PAGE_WIDTH - MARGIN, y, color=_GRID)
+        if hour < last_hour:
+            page.text(MARGIN, y + 9, _format_minutes(hour * 60), size=7, color=(0.35, 0.35, 0.35))
+    page.rect(left, top, column_width * len(columns), grid_bottom - top, stroke=_GRID)
+
+    colors: Dict[str, tuple] = {}
+    for section, (start, end), days in meetings:
+        label = _course_label(section)
+        fill = colors.setdefault(section.get("course_id") or label, _PALETTE[len(colors) % len(_PALETTE)])
+        y = top + (start / 60 - first_hour) * hour_height
+        height = (end - start) / 60 * hour_height
+        lines = [
+            (label, 8, True),
+            (f"{_format_minutes(start)} - {_format_minutes(end)}", 7, False),
+            (section.get("classroom") or "", 7, False),
+            (section.get("instructor_id") or "", 7, False),
+        ]
+        for ch in days:
+            x = left + columns.index(ch) * column_width
+            page.rect(x + 1.5, y + 0.5, column_width - 3, height - 1, fill=fill, stroke=_NAVY, line_width=0.4)
+            baseline = y + 9
+            for text, size, bold in lines:
+                if not text or baseline > y + height - 2:
+                    break
+                page.text(x + 5, baseline, fit_text(text, column_width - 10, size, bold), size=size, bold=bold)
+                baseline += size + 2
+
+    if not sections:
+        page.text(left + 6, top + 20, f"No enrolled sections for {term}.", size=10, color=(0.35, 0.35, 0.35))
+    for i, section in enumerate(unscheduled[:4]):
+        more = f" (and {len(unscheduled) - 4} more)" if i == 3 and len(unscheduled) > 4 else ""
+        page.text(MARGIN, grid_bottom + 16 + 14 * i,
+                  f"Not on the grid: {_course_label(section)} ({section.get('time_slot') or 'TBA'}){more}", size=8)
+    return page
+
+
+def render_schedule_pdf(sections: List[dict], term: str) -> Iterator[bytes]:
+    """
+    The weekly grid of the given sections as a one-page vector PDF, yielded in chunks.
+    """
+    writer = PdfWriter(PAGE_WIDTH, PAGE_HEIGHT)
+    yield writer.begin()
+    yield writer.page(_draw_schedule(writer, sections, term))
+    yield writer.close(title=f"GU Schedule {term}")
+
+
+def _term_section_ids(term: str) -> Set[str]:
+    """
+    Ids (as str) of the term's sections, from the term catalog; kept with the
+    catalog and rebuilt when it reloads (a reload swaps in a new sections list).
+    """
+    catalog = get_term_catalog(term)
+    sections = catalog.sections()
+    cached = catalog.indexes.get("section_ids")
+    if cached is None or cached[0] is not sections:
+        cached = (sections, frozenset(str(section.section_id) for section in sections))
+        catalog.indexes["section_ids"] = cached
+    return cached[1]
+
+
+def load_schedules(user_ids: List[int], term: str) -> Dict[int, List[dict]]:
+    """
+    Enrolled sections of the term for every user, in two bulk (chunked, paged) queries.
+    Enrollments in other terms are dropped before the sections are read.
+    """
+    schedules: Dict[int, List[dict]] = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return schedules
+    enrollments = fetch_in("enrollments", "user_id, section_id", "user_id", list(user_ids), order=("section_id",))
+    term_section_ids = _term_section_ids(term)
+    enrollments = [row for row in enrollments if str(row["section_id"]) in term_section_ids]
+    section_ids = sorted({row["section_id"] for row in enrollments})
+    if not section_ids:
+        return schedules
+    sections = fetch_in("sections", "*", "section_id", section_ids, where={"term": term})
+    by_id = {str(s["section_id"]): s for s in sections}
+
+    for row in enrollments:
+        section = by_id.get(str(row["section_id"]))
+        user_id = int(row["user_id"])
+        if section is not None and user_id in schedules and section not in schedules[user_id]:
+            schedules[user_id].append(section)
+    return schedules
+
+
+# Keyed by content hash: identical schedules share an entry, and any change makes a new key.
+_pdf_cache = BytesCache(PDF_CACHE_SIZE)
+
+
+def _cached_pdf(sections: List[dict], term: str) -> Tuple[str, Optional[bytes]]:
+    content_hash = schedule_content_hash(sections, term)
+    return content_hash, _pdf_cache.get((content_hash,))
+
+
+def _render_and_cache(content_hash: str, sections: List[dict], term: str) -> Iterator[bytes]:
+    chunks = []
+    for chunk in render_schedule_pdf(sections, term):
+        chunks.append(chunk)
+        yield chunk
+    _pdf_cache.put((content_hash,), b"".join(chunks))
+
+
+def schedule_pdf(user_id: int, term: str) -> Tuple[str, Iterator[bytes]]:
+    """
+    (etag, chunks) of a user's schedule PDF. The etag is the content hash, so an
+    unchanged schedule is answered from the cache (or with a 304) without rendering.
+    """
+    sections = load_schedules([user_id], term)[user_id]
+    content_hash, body = _cached_pdf(sections, term)
+    if body is not None:
+        return content_hash, iter((body,))
+    return content_hash, _render_and_cache(content_hash, sections, term)
+
+
+class _ArchiveStream:
+    # Write-only file object for ZipFile; without tell()/seek() zipfile writes a streamable archive.
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def schedule_pdf_archive(user_ids: List[int], term: str) -> Iterator[bytes]:
+    """
+    ZIP archive with one schedule PDF per user, yielded file by file.
+    Schedules are loaded in bulk and each distinct schedule is rendered once.
+    """
+    schedules = load_schedules(user_ids, term)
+    stream = _ArchiveStream()
+    # PDF content streams are already compressed.
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+        for user_id in user_ids:
+            sections = schedules.get(user_id, [])
+            content_hash, body = _cached_pdf(sections, term)
+            if body is None:
+                body = b"".join(_render_and_cache(content_hash, sections, term))
+            archive.writestr(f"{user_id}_GU_Schedule_{term.replace(' ', '_')}.pdf", body)
+            yield stream.drain()
+    yield stream.drain()
@@ -1,68 +1,143 @@
-
-from typing import Optional
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+from typing import List, Optional
+from services.meeting_times import conflict_days, mask_to_hex
+from services.records import SectionRecord
+from services.term_catalog import get_term_catalog
+from services.finals_schedule import get_finals_index
+from services.terms import default_term
 
 def search_sections(subject: Optional[str] = None,
                     course_code: Optional[str] = None,
                     attribute: Optional[str] = None,
                     instructor: Optional[str] = None,
-                    term: Optional[str] = "Fall 2025") -> dict:
+                    term: Optional[str] = None) -> dict:
     """
-    Ищет записи в таблице 'sections' и возвращает данные в том формате,
-    который ожидает фронтенд (section_number, schedule, instructor и т.д.).
+    Ищет секции семестра term (по умолчанию default_term()) и возвращает данные
+    в том формате, который ожидает фронтенд (section_number, schedule, instructor и т.д.).
+    Секции берутся из кэша TermCatalog без запроса к Supabase.
+    meeting_mask — битовая маска времени занятий (hex), по ней фронтенд
+    проверяет пересечения в сетке расписания.
     """
+    term = term or default_term()
+    sections = get_term_catalog(term).search(subject, course_code, attribute, instructor)
+    return {"term": term, "data": [_search_result(section) for section in sections]}
+
+
+def _search_result(section: SectionRecord) -> dict:
+    # Формат, который ожидает фронтенд; строится только при ответе на запрос.
+    days = section.days or ''
+    time_slot = section.time_slot or ''
+    seats_avail = section.rm or 0
+    return {
+        "crn": section.crn,
+        "section_number": section.section or '',
+        "subject": section.subject or '',
+        "course_code": section.course_code or '',
+        "schedule": (days + ' ' + time_slot).strip() or 'Not specified',
+        "instructor": section.instructor_id or 'TBA',
+        "location": section.classroom or 'TBA',
+        "credits": section.credits or '?',
+        "seats_available": seats_avail,
+        "total_seats": seats_avail + (section.act or 0),
+        "meeting_mask": mask_to_hex(section.meeting_mask),
+    }
+
+
+def check_section_conflicts(crns: List[str], term: Optional[str] = None) -> dict:
+    """
+    Проверяет список CRN на пересечение по времени.
+    Маски берутся из TermCatalog, так что каждая пара — одна операция AND.
 
-    query = supabase.table('sections').select('*')
-
-    if term:
-        query = query.eq('term', term)
-    if subject:
-        query = query.eq('subject', subject)
-    if course_code:
-        query = query.eq('course_code', course_code)
-    if attribute:
-        query = query.ilike('attribute', f'%{attribute}%')
-    if instructor:
-        query = query.ilike('instructor_id', f'%{instructor}%')
-
-    response = query.execute()
-    raw_data = response.data
-
-    transformed_data = []
-    for row in raw_data:
-
-        days = row.get('days') or ''
-        time_slot = row.get('time_slot') or ''
-        schedule_str = (days + ' ' + time_slot).strip()
-        if not schedule_str:
-            schedule_str = 'Not specified'
-
-        seats_avail = row.get('rm') or 0
-        seats_used = row.get('act') or 0
-        total_seats = seats_avail + seats_used
-
-        new_row = {
-            "section_number": row.get('section') or '',
-            "subject": row.get('subject') or '',
-            "course_code": row.get('course_code') or '',
-
-            "schedule": schedule_str,
-
-            "instructor": row.get('instructor_id') or 'TBA',
-
-            "location": row.get('classroom') or 'TBA',
-
-            "credits": row.get('credits') or '?',
-
-            "seats_available": seats_avail,
-            "total_seats": total_seats,
-        }
-        transformed_data.append(new_row)
-
-    return {"data": transformed_data}
+    :return: {"term": ..., "has_conflict": bool,
+              "conflicts": [{"crn_a", "crn_b", "course_a", "course_b", "days"}, ...],
+              "unknown_crns": [...]}
+    """
+    term = term or default_term()
+    catalog = get_term_catalog(term)
+
+    found = []
+    unknown = []
+    for crn in dict.fromkeys(str(c) for c in crns):
+        section = catalog.section_by_crn(crn)
+        if section is None:
+            unknown.append(crn)
+        else:
+            found.append((crn, section, section.meeting_mask))
+
+    conflicts = []
+    for i, (crn_a, sec_a, mask_a) in enumerate(found):
+        for crn_b, sec_b, mask_b in found[i + 1:]:
+            if mask_a & mask_b:
+                conflicts.append({
+                    "crn_a": crn_a,
+                    "crn_b": crn_b,
+                    "course_a": sec_a.course_id,
+                    "course_b": sec_b.course_id,
+                    "days": conflict_days(mask_a, mask_b)
+                })
+
+    return {
+        "term": term,
+        "has_conflict": bool(conflicts),
+        "conflicts": conflicts,
+        "unknown_crns": unknown
+    }
+
+
+def check_final_exams(crns: List[str], term: Optional[str] = None) -> dict:
+    """
+    Время финальных экзаменов для списка CRN и пересечения между ними.
+    Слоты экзаменов заранее посчитаны в FinalsIndex, так что это поиск по словарю.
+    CRN, для которых правила не задают экзамен (например, MWF 12:00), попадают в "unscheduled".
+
+    :return: {"term": ..., "exams": [{"crn", "course_id", "section", "rule", "date", "day",
+              "start", "end", "time"}, ...], "has_conflict": bool,
+              "conflicts": [{"crn_a", "crn_b", "course_a", "course_b", "date", "time"}, ...],
+              "unscheduled": [...], "unknown_crns": [...]}
+    """
+    term = term or default_term()
+    catalog = get_term_catalog(term)
+    index = get_finals_index(term)
+
+    exams = []
+    by_slot = {}
+    unscheduled = []
+    unknown = []
+    for crn in dict.fromkeys(str(c) for c in crns):
+        section = catalog.section_by_crn(crn)
+        if section is None:
+            unknown.append(crn)
+            continue
+        slot = index.slot_for_crn(crn)
+        if slot is None:
+            unscheduled.append(crn)
+            continue
+        exam = {"crn": crn, "course_id": section.course_id, "section": section.section}
+        exam.update(index.exam_time(slot))
+        exams.append(exam)
+        by_slot.setdefault((slot.day, slot.period), []).append(exam)
+
+    conflicts = []
+    for same_slot in by_slot.values():
+        for i, exam_a in enumerate(same_slot):
+            for exam_b in same_slot[i + 1:]:
+                conflicts.append({
+                    "crn_a": exam_a["crn"],
+                    "crn_b": exam_b["crn"],
+                    "course_a": exam_a["course_id"],
+                    "course_b": exam_b["course_id"],
+                    "date": exam_a["date"],
+                    "time": exam_a["time"]
+                })
+
+    exams.sort(key=lambda exam: (exam["date"] or "", exam["start"]))
+    return {
+        "term": term,
+        "exams": exams,
+        "has_conflict": bool(conflicts),
+        "conflicts": conflicts,
+        "unscheduled": unscheduled,
+        "unknown_crns": unknown
+    }
 
 
 if __name__ == "__main__":
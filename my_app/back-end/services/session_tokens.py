@@ -0,0 +1,114 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+SESSION_TOKEN_TTL = int(os.getenv("SESSION_TOKEN_TTL", str(12 * 60 * 60)))
+SESSION_TOKEN_CACHE_SIZE = int(os.getenv("SESSION_TOKEN_CACHE_SIZE", "4096"))
+
+logger = logging.getLogger(__name__)
+
+_secret: Optional[bytes] = None
+_secret_lock = threading.Lock()
+_verified: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def require_session_secret() -> None:
+    """
+    Raises unless SESSION_SECRET is set. Every worker must sign with the same
+    secret, or tokens issued by one worker are rejected by the others.
+    """
+    if not os.getenv("SESSION_SECRET"):
+        raise RuntimeError("SESSION_SECRET must be set (any long random string shared by all workers)")
+
+
+def _session_secret() -> bytes:
+    global _secret
+    if _secret is None:
+        with _secret_lock:
+            if _secret is None:
+                value = os.getenv("SESSION_SECRET")
+                if not value:
+                    # Only reachable in debug mode (see create_app): tokens verify in this process only.
+                    logger.warning("SESSION_SECRET is not set, using a random per-process session secret")
+                    value = secrets.token_hex(32)
+                _secret = value.encode("utf-8")
+    return _secret
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_session_secret(), payload.encode("utf-8"), hashlib.sha256).digest())
+
+
+def issue_session_token(user_id: int) -> str:
+    """
+    Stateless session token "<payload>.<signature>": the payload carries the
+    user id and expiry, the signature is HMAC-SHA256 with SESSION_SECRET.
+    """
+    payload = _b64encode(json.dumps(
+        {"uid": user_id, "exp": int(time.time()) + SESSION_TOKEN_TTL},
+        separators=(",", ":")
+    ).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_session_token(token: Optional[str]) -> Optional[int]:
+    """
+    user_id of a valid, unexpired token, or None.
+    Verified tokens are kept in a small LRU, so repeat requests skip the HMAC and JSON decode.
+    """
+    if not token:
+        return None
+    now = int(time.time())
+
+    with _verified_lock:
+        cached = _verified.get(token)
+        if cached is not None:
+            if cached[1] > now:
+                _verified.move_to_end(token)
+                return cached[0]
+            del _verified[token]
+            return None
+
+    payload, _, signature = token.partition(".")
+    # Bytes, not str: compare_digest rejects non-ASCII str, and headers may carry any text.
+    if not signature or not hmac.compare_digest(signature.encode("utf-8"), _sign(payload).encode("ascii")):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+        user_id, expires = int(claims["uid"]), int(claims["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if expires <= now:
+        return None
+
+    with _verified_lock:
+        _verified[token] = (user_id, expires)
+        while len(_verified) > SESSION_TOKEN_CACHE_SIZE:
+            _verified.popitem(last=False)
+    return user_id
+
+
+def bearer_user_id(authorization: Optional[str]) -> Optional[int]:
+    """
+    user_id from an "Authorization: Bearer <token>" header value, or None.
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    return verify_session_token(authorization[len("Bearer "):].strip())
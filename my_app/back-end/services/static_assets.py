@@ -0,0 +1,272 @@
+import gzip
+import hashlib
+import mmap
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+from flask import Response, request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are built
+    brotli = None
+
+INTERFACE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'interface'))
+STATIC_PREFIX = "/static"
+STATIC_ASSETS_RELOAD = os.getenv("STATIC_ASSETS_RELOAD", "0") == "1"
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MIN_COMPRESS_BYTES = 512
+RANGE_CHUNK_BYTES = 64 * 1024
+
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+# Served straight from a memory map with Range support, so PDF viewers can fetch pages lazily.
+_RANGED = ("application/pdf",)
+# src="..." / href="..." in the HTML pages; only local, non-HTML targets are rewritten.
+_ASSET_REF_RE = re.compile(r'\b(src|href)="([^"#?:]+)"')
+
+
+class StaticAsset:
+    """
+    One file of interface/: its bytes and the precompressed variants worth sending.
+    """
+
+    __slots__ = ("path", "mimetype", "body", "etag", "encoded")
+
+    def __init__(self, path: str, body: bytes, mimetype: str):
+        self.path = path
+        self.mimetype = mimetype
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+        self.encoded: Dict[str, bytes] = {}
+        if len(body) >= MIN_COMPRESS_BYTES and mimetype.startswith(_COMPRESSIBLE):
+            variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                variants["br"] = brotli.compress(body, quality=11)
+            # Keep a variant only if it actually saves something.
+            self.encoded = {name: data for name, data in variants.items() if len(data) < len(body) * 0.9}
+
+    def variant(self, accept_encodings) -> Tuple[Optional[str], bytes, str]:
+        """
+        (Content-Encoding or None, body, etag) of the best variant the client accepts.
+        """
+        for encoding in ("br", "gzip"):
+            if encoding in self.encoded and accept_encodings[encoding]:
+                return encoding, self.encoded[encoding], f"{self.etag}-{encoding}"
+        return None, self.body, self.etag
+
+
+class MappedFile:
+    """
+    A file served by byte range without being loaded into the process.
+
+    When the WSGI server offers wsgi.file_wrapper (gunicorn), the body is the
+    file positioned at the range start and the server hands Content-Length
+    bytes to os.sendfile. Otherwise it is sliced from a read-only memory map.
+    """
+
+    __slots__ = ("path", "full_path", "mimetype", "size", "etag", "_map")
+
+    def __init__(self, path: str, full_path: str, mimetype: str, etag: str):
+        self.path = path
+        self.full_path = full_path
+        self.mimetype = mimetype
+        self.etag = etag
+        with open(full_path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def body(self, environ, start: int, stop: int):
+        file_wrapper = environ.get("wsgi.file_wrapper")
+        if file_wrapper is not None and stop > start:
+            f = open(self.full_path, "rb")
+            f.seek(start)
+            return file_wrapper(f, RANGE_CHUNK_BYTES)
+        return self._slices(start, stop)
+
+    def _slices(self, start: int, stop: int):
+        for position in range(start, stop, RANGE_CHUNK_BYTES):
+            yield self._map[position:min(position + RANGE_CHUNK_BYTES, stop)]
+
+
+class StaticAssets:
+    """
+    The interface/ tree loaded once into memory with gzip (and brotli) variants.
+
+    Every non-HTML file is also reachable under /static/<version>/..., where
+    version hashes the content of all of them: those URLs never change meaning
+    and are sent as immutable. HTML pages get their local script/style/image
+    references rewritten to the versioned URLs and are revalidated by ETag, so
+    a repeat visit costs one 304 for the page and nothing for its assets.
+    Relative ES module imports stay inside the same versioned prefix.
+    """
+
+    def __init__(self, root: str = INTERFACE_FOLDER):
+        self.root = root
+        self.signature = self._tree_signature()
+        files = self._read_files()
+
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            if not path.endswith(".html"):
+                digest.update(path.encode("utf-8") + b"\0" + files[path] + b"\0")
+        self.version = digest.hexdigest()[:12]
+
+        self.assets: Dict[str, StaticAsset] = {}
+        self.mapped: Dict[str, MappedFile] = {}
+        for path, body in files.items():
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            if mimetype.startswith(_RANGED):
+                etag = hashlib.sha256(body).hexdigest()[:20]
+                self.mapped[path] = MappedFile(path, os.path.join(self.root, path), mimetype, etag)
+                continue
+            if path.endswith(".html"):
+                body = self._rewrite_html(path, body.decode("utf-8"), files).encode("utf-8")
+            self.assets[path] = StaticAsset(path, body, mimetype)
+
+    def _walk(self):
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                full = os.path.join(directory, name)
+                yield os.path.relpath(full, self.root).replace(os.sep, "/"), full
+
+    def _tree_signature(self) -> Tuple[int, float]:
+        mtimes = [os.path.getmtime(full) for _, full in self._walk()]
+        return len(mtimes), max(mtimes, default=0.0)
+
+    def _read_files(self) -> Dict[str, bytes]:
+        files = {}
+        for path, full in self._walk():
+            with open(full, "rb") as f:
+                files[path] = f.read()
+        return files
+
+    def url_for(self, path: str) -> str:
+        return f"{STATIC_PREFIX}/{self.version}/{quote(path)}"
+
+    def _rewrite_html(self, page: str, html: str, files: Dict[str, bytes]) -> str:
+        base = posixpath.dirname(page)
+
+        def replace(m):
+            target = posixpath.normpath(posixpath.join(base, m.group(2)))
+            if target not in files or target.endswith(".html"):
+                return m.group(0)
+            return f'{m.group(1)}="{self.url_for(target)}"'
+        return _ASSET_REF_RE.sub(replace, html)
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.assets.get(posixpath.normpath(path).lstrip("/"))
+
+    def get_mapped(self, path: str) -> Optional[MappedFile]:
+        return self.mapped.get(posixpath.normpath(path).lstrip("/"))
+
+    def stale(self) -> bool:
+        return self._tree_signature() != self.signature
+
+
+_assets: Optional[StaticAssets] = None
+_assets_lock = threading.Lock()
+_checked_at = 0.0
+
+
+def get_static_assets() -> StaticAssets:
+    """
+    The process-wide asset store, built on first use. With STATIC_ASSETS_RELOAD=1
+    (local development) it is rebuilt when files under interface/ change.
+    """
+    global _assets, _checked_at
+    if _assets is not None and not STATIC_ASSETS_RELOAD:
+        return _assets
+    with _assets_lock:
+        if _assets is None:
+            _assets = StaticAssets()
+        elif STATIC_ASSETS_RELOAD and time.monotonic() - _checked_at > 1.0:
+            _checked_at = time.monotonic()
+            if _assets.stale():
+                _assets = StaticAssets()
+        return _assets
+
+
+def warm_static_assets() -> None:
+    """
+    Loads and compresses interface/ ahead of the first page request.
+    """
+    try:
+        get_static_assets()
+    except Exception as e:
+        print(f"Error loading static assets: {str(e)}")
+
+
+def asset_response(filename: str, version: Optional[str] = None) -> Response:
+    """
+    Serves a file of interface/ from memory in the best encoding the client accepts.
+    Under the current /static/<version>/ prefix it is cacheable forever; everything
+    else (HTML, unversioned or outdated URLs) is revalidated by ETag.
+    """
+    assets = get_static_assets()
+    immutable = version is not None and version == assets.version
+    mapped = assets.get_mapped(filename)
+    if mapped is not None:
+        return _ranged_response(mapped, immutable)
+
+    asset = assets.get(filename)
+    if asset is None:
+        # Not in the preloaded tree (e.g. added after startup): plain conditional file response.
+        return send_from_directory(INTERFACE_FOLDER, filename)
+
+    encoding, body, etag = asset.variant(request.accept_encodings)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=asset.mimetype)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    _set_cache_control(response, immutable)
+    return response
+
+
+def _set_cache_control(response: Response, immutable: bool) -> None:
+    if immutable:
+        response.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+
+
+def _ranged_response(mapped: MappedFile, immutable: bool) -> Response:
+    """
+    200, 206 (single byte range) or 416 for a memory-mapped file.
+    Multi-range requests get the whole file, which RFC 9110 allows.
+    """
+    if request.if_none_match.contains(mapped.etag):
+        response = Response(status=304)
+    else:
+        byte_range = request.range
+        if_range = request.if_range
+        if (if_range.etag is not None and if_range.etag != mapped.etag) or if_range.date is not None:
+            byte_range = None  # the client's copy is outdated (or only dated): send everything
+        span = None
+        if byte_range is not None and byte_range.units == "bytes" and len(byte_range.ranges) == 1:
+            span = byte_range.range_for_length(mapped.size)
+            if span is None:
+                response = Response(status=416)
+                response.headers["Content-Range"] = f"bytes */{mapped.size}"
+                response.set_etag(mapped.etag)
+                return response
+
+        start, stop = span or (0, mapped.size)
+        # direct_passthrough hands a file wrapper to the server untouched, so it can use sendfile.
+        response = Response(mapped.body(request.environ, start, stop), status=206 if span else 200,
+                            mimetype=mapped.mimetype, direct_passthrough=True)
+        response.content_length = stop - start
+        if span:
+            response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{mapped.size}"
+    response.headers["Accept-Ranges"] = "bytes"
+    response.set_etag(mapped.etag)
+    _set_cache_control(response, immutable)
+    return response
@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from services.repository import supabase
+from services.meeting_times import parse_meeting_mask
+from services.records import SectionRecord
+
+TERM_CATALOG_TTL = float(os.getenv("TERM_CATALOG_TTL", "300"))
+# Terms kept in memory per worker; the least recently used one is dropped beyond that.
+TERM_CACHE_SIZE = int(os.getenv("TERM_CACHE_SIZE", "4"))
+PAGE_SIZE = 1000
+
+
+def parse_core_attributes(attr_str: Optional[str]) -> List[str]:
+    """
+    Extracts Core attribute names from a section's comma-separated 'attribute'
+    column, e.g. "Core: Philosophy, Honors" -> ["Philosophy"].
+    """
+    core_attrs = []
+    for part in (attr_str or "").split(","):
+        part = part.strip()
+        if part.lower().startswith("core:"):
+            core_attrs.append(part[5:].strip())
+    return core_attrs
+
+
+class TermCatalog:
+    """
+    In-process snapshot of every section offered in one term.
+
+    All sections of the term are fetched with a single paged bulk query and
+    indexed by course_id, by Core attribute and by CRN, so planners and the
+    section search can answer without going back to Supabase. Sections are
+    held as compact SectionRecords; each meeting pattern's bitmask (see
+    meeting_times) is computed once per load and shared by its sections, so
+    conflict checks are a single AND. The snapshot is reloaded once it is
+    older than `ttl` seconds.
+
+    `indexes` holds what other services derive from the snapshot (e.g. the
+    finals index), so a term's whole shard is evicted together.
+    """
+
+    def __init__(self, term: str, ttl: float = TERM_CATALOG_TTL):
+        self.term = term
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self.indexes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._sections: List[SectionRecord] = []
+        self._by_course: Dict[str, List[SectionRecord]] = {}
+        self._by_core_attribute: Dict[str, List[SectionRecord]] = {}
+        self._by_crn: Dict[str, SectionRecord] = {}
+
+    def _fetch_sections(self) -> List[dict]:
+        rows = []
+        start = 0
+        while True:
+            resp = supabase.table("sections") \
+                .select("*") \
+                .eq("term", self.term) \
+                .order("section_id") \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute()
+            page = resp.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+    def refresh(self) -> None:
+        """
+        Reloads the term's sections and swaps in freshly built indexes.
+        """
+        sections = []
+        by_course: Dict[str, List[SectionRecord]] = {}
+        by_core_attribute: Dict[str, List[SectionRecord]] = {}
+        by_crn: Dict[str, SectionRecord] = {}
+        masks: Dict[tuple, int] = {}
+        core_attributes: Dict[str, List[str]] = {}
+        for row in self._fetch_sections():
+            pattern = (row.get("days"), row.get("time_slot"))
+            mask = masks.get(pattern)
+            if mask is None:
+                mask = masks[pattern] = parse_meeting_mask(*pattern)
+            section = SectionRecord(row, mask)
+            sections.append(section)
+            by_course.setdefault(section.course_id, []).append(section)
+            attrs = core_attributes.get(section.attribute)
+            if attrs is None:
+                attrs = core_attributes[section.attribute] = parse_core_attributes(section.attribute)
+            for attr in attrs:
+                by_core_attribute.setdefault(attr, []).append(section)
+            if section.crn is not None:
+                by_crn[str(section.crn)] = section
+
+        self._sections = sections
+        self._by_course = by_course
+        self._by_core_attribute = by_core_attribute
+        self._by_crn = by_crn
+        self.loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return
+        with self._lock:
+            if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                if self.loaded_at is None:
+                    raise
+                # Keep serving the stale snapshot until Supabase answers again.
+                print(f"Error refreshing term catalog for {self.term}: {str(e)}")
+                self.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Marks the snapshot stale; the next access reloads it (or keeps it if Supabase fails).
+        """
+        if self.loaded_at is not None:
+            self.loaded_at = float("-inf")
+
+    def sections(self) -> List[SectionRecord]:
+        self._ensure_fresh()
+        return self._sections
+
+    def sections_for_course(self, course_id: str) -> List[SectionRecord]:
+        self._ensure_fresh()
+        return self._by_course.get(course_id, [])
+
+    def first_section(self, course_id: str, busy_mask: int = 0) -> Optional[SectionRecord]:
+        """
+        First section of the course that does not overlap busy_mask
+        (the combined meeting mask of sections already chosen).
+        """
+        for section in self.sections_for_course(course_id):
+            if not section.meeting_mask & busy_mask:
+                return section
+        return None
+
+    def meeting_mask(self, section) -> int:
+        """
+        Meeting-time bitmask of a section: precomputed for the catalog's records,
+        parsed for plain row dicts.
+        """
+        mask = getattr(section, "meeting_mask", None)
+        if mask is None:
+            mask = parse_meeting_mask(section.get("days"), section.get("time_slot"))
+        return mask
+
+    def sections_with_core_attribute(self, attribute: str) -> List[SectionRecord]:
+        self._ensure_fresh()
+        return self._by_core_attribute.get(attribute, [])
+
+    def section_by_crn(self, crn) -> Optional[SectionRecord]:
+        self._ensure_fresh()
+        return self._by_crn.get(str(crn))
+
+    def search(self,
+               subject: Optional[str] = None,
+               course_code: Optional[str] = None,
+               attribute: Optional[str] = None,
+               instructor: Optional[str] = None) -> List[SectionRecord]:
+        """
+        In-memory equivalent of the eq/ilike filters used by search_sections.
+        """
+        attribute = attribute.lower() if attribute else None
+        instructor = instructor.lower() if instructor else None
+        course_code = str(course_code) if course_code else None
+
+        results = []
+        for section in self.sections():
+            if subject and section.subject != subject:
+                continue
+            if course_code and str(section.course_code) != course_code:
+                continue
+            if attribute and attribute not in (section.attribute or "").lower():
+                continue
+            if instructor and instructor not in (section.instructor_id or "").lower():
+                continue
+            results.append(section)
+        return results
+
+
+_catalogs: "OrderedDict[str, TermCatalog]" = OrderedDict()
+_catalogs_lock = threading.Lock()
+
+
+def invalidate_term_catalogs() -> None:
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+    for catalog in catalogs:
+        catalog.invalidate()
+
+
+def cached_terms() -> List[str]:
+    """
+    Terms with a catalog in this worker, most recently used last.
+    """
+    with _catalogs_lock:
+        return list(_catalogs)
+
+
+def get_term_catalog(term: str) -> TermCatalog:
+    """
+    Returns the process-wide catalog for `term`, creating it on first use.
+    At most TERM_CACHE_SIZE terms are kept; the least recently used one is
+    evicted (requests still holding it finish with their snapshot).
+    """
+    with _catalogs_lock:
+        catalog = _catalogs.get(term)
+        if catalog is not None:
+            _catalogs.move_to_end(term)
+            return catalog
+        catalog = _catalogs[term] = TermCatalog(term)
+        while len(_catalogs) > max(1, TERM_CACHE_SIZE):
+            _catalogs.popitem(last=False)
+    return catalog
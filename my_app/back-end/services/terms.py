@@ -0,0 +1,60 @@
+import os
+import re
+from datetime import date
+from typing import Optional
+
+SEASONS = ("Spring", "Summer", "Fall")
+# Term used when a request names none. Unset: the term after the current one,
+# i.e. the one students are registering for.
+DEFAULT_TERM = os.getenv("DEFAULT_TERM")
+
+_TERM_RE = re.compile(r"(Spring|Summer|Fall)\s*(\d{4})", re.IGNORECASE)
+
+
+def parse_term(text: Optional[str]) -> Optional[str]:
+    """
+    Normalized term name ("Fall 2025") found in text such as "fall 2025 ▼", or None.
+    """
+    m = _TERM_RE.search(text or "")
+    if not m:
+        return None
+    return f"{m.group(1).capitalize()} {m.group(2)}"
+
+
+def current_term(today: Optional[date] = None) -> str:
+    """
+    Term in session on `today`, with the same cut-offs as the semester picker
+    (interface/js/semester.js): Spring until May 17, Summer until August 16.
+    """
+    today = today or date.today()
+    if (today.month, today.day) <= (5, 17):
+        season = "Spring"
+    elif (today.month, today.day) <= (8, 16):
+        season = "Summer"
+    else:
+        season = "Fall"
+    return f"{season} {today.year}"
+
+
+def following_term(term: str) -> str:
+    """
+    The next regular term: Spring and Summer are followed by Fall, Fall by next Spring.
+    """
+    season, _, year = term.partition(" ")
+    if season == "Fall":
+        return f"Spring {int(year) + 1}"
+    return f"Fall {year}"
+
+
+def default_term() -> str:
+    return parse_term(DEFAULT_TERM) or following_term(current_term())
+
+
+def resolve_term(value: Optional[str]) -> Optional[str]:
+    """
+    Term named by a request parameter: the default term when it is missing,
+    None when it names no term (the caller answers 400).
+    """
+    if value is None or not value.strip():
+        return default_term()
+    return parse_term(value)
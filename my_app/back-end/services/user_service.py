@@ -1,22 +1,20 @@
-import bcrypt
-from supabase import create_client, Client
-from credentials import SUPABASE_URL, SUPABASE_KEY
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+from typing import Dict, List, Optional
+from services.repository import fetch_in, supabase
+from services.password_hasher import hash_password, check_password, needs_rehash, PasswordHasherBusy
 
 def create_user(user_name: str, email: str, password: str, name: str) -> dict:
     """
     Creates a new user in the 'users' table with a unique user_name, a hashed password, and a display name.
     Automatically assigns user_id (auto-increment).
     Returns the inserted user data or an error if user_name is already taken.
+    Raises PasswordHasherBusy when the password pool is saturated.
     """
 
     check_response = supabase.from_('users').select('*').eq('user_name', user_name).execute()
     if check_response.data:
         return {"error": f"user_name '{user_name}' is already in use."}
 
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    hashed_password = hash_password(password)
 
     insert_data = {
         "user_name": user_name,
@@ -37,6 +35,8 @@ def check_login(user_name: str, password: str) -> dict:
     Checks user's login credentials by comparing the provided password
     with the hashed password in the 'users' table (matched by user_name).
     Returns user data if successful, or an error otherwise.
+    Hashes made with an outdated BCRYPT_ROUNDS are upgraded after a successful login.
+    Raises PasswordHasherBusy when the password pool is saturated.
     """
     try:
         response = supabase.from_('users').select('*').eq('user_name', user_name).single().execute()
@@ -47,17 +47,56 @@ def check_login(user_name: str, password: str) -> dict:
         user_record = response.data
         stored_hashed_password = user_record['password']
 
-        if bcrypt.checkpw(password.encode('utf-8'), stored_hashed_password.encode('utf-8')):
+        if check_password(password, stored_hashed_password):
+            if needs_rehash(stored_hashed_password):
+                _rehash_password(user_record['user_id'], password)
             user_data = dict(user_record)
             user_data.pop('password', None)
             return {"data": user_data}
         else:
             return {"error": "Invalid credentials"}
 
+    except PasswordHasherBusy:
+        raise
     except Exception as e:
         print(f"Login error: {str(e)}")
         return {"error": "An error occurred during login"}
 
+def _rehash_password(user_id: int, password: str) -> None:
+    # Best effort: the login already succeeded, so a busy pool or failed update only postpones the upgrade.
+    try:
+        supabase.from_('users').update({"password": hash_password(password)}).eq('user_id', user_id).execute()
+    except Exception as e:
+        print(f"Password rehash for user {user_id} skipped: {str(e)}")
+
+_enroll_rpc_available = True
+
+def _enroll_sections_rpc(user_id: int, items: List[dict]) -> Optional[List[dict]]:
+    """
+    Один вызов Postgres-функции enroll_sections: поиск секции, проверка дубликата
+    и вставка выполняются атомарно. None, если функция ещё не установлена.
+    """
+    global _enroll_rpc_available
+    if not _enroll_rpc_available:
+        return None
+    try:
+        response = supabase.rpc("enroll_sections", {"p_user_id": user_id, "p_items": items}).execute()
+    except Exception as e:
+        if "PGRST202" not in str(e):
+            raise
+        print("enroll_sections is not installed (see sql/enroll_sections.sql), using per-query enrollment")
+        _enroll_rpc_available = False
+        return None
+    return response.data or []
+
+def _enrollment_item(in_process: bool, section_id=None, crn=None, course_id=None, term=None, section=None) -> dict:
+    item = {"in_process": bool(in_process)}
+    for key, value in (("section_id", section_id), ("crn", crn), ("course_id", course_id),
+                       ("term", term), ("section", section)):
+        if value is not None:
+            item[key] = value
+    return item
+
 def add_class_enrollment(
     user_id: int,
     in_process: bool,
@@ -77,6 +116,9 @@ def add_class_enrollment(
          - Если не находит, ищет другую секцию в том же term
          - Если не находит, ищет любую секцию по course_id (любой term)
 
+    Выполняется одним вызовом enroll_sections (один round-trip, без гонки между
+    проверкой дубликата и вставкой).
+
     :param user_id:    ID пользователя
     :param in_process: Флаг, указывающий, находится ли курс в процессе (True/False)
     :param section_id: (опционально) ID секции
@@ -86,160 +128,204 @@ def add_class_enrollment(
     :param section:    (опционально) Обозначение секции (например, "A", "B", "01")
     :return:           Словарь с результатом операции {"success": "..."} или {"error": "..."}
     """
+    item = _enrollment_item(in_process, section_id, crn, course_id, term, section)
+    results = _enroll_sections_rpc(user_id, [item])
+    if results is None:
+        results = _add_class_enrollments_queries(user_id, [item])
+    return results[0]
 
-    user_check = supabase.table("users").select("user_id").eq("user_id", user_id).execute()
-    if not user_check.data:
-        return {"error": f"User with ID {user_id} not found."}
+def add_class_enrollments(user_id: int, items: List[dict]) -> List[dict]:
+    """
+    Пакетная форма add_class_enrollment: items — список словарей с ключами
+    in_process, section_id, crn, course_id, term, section (как у add_class_enrollment).
+    Все классы добавляются одним вызовом enroll_sections в одной транзакции;
+    без функции — фиксированным числом запросов, независимо от len(items).
 
-    found_section_id = None
-    found_course_id = None
-    fallback_info = ""
+    :return: список {"success": ...} / {"error": ...} в порядке items
+    """
+    items = [
+        _enrollment_item(item.get("in_process", False), item.get("section_id"), item.get("crn"),
+                         item.get("course_id"), item.get("term"), item.get("section"))
+        for item in items
+    ]
+    results = _enroll_sections_rpc(user_id, items)
+    if results is None:
+        return _add_class_enrollments_queries(user_id, items)
+    return results
+
+_SECTION_COLUMNS = "section_id, course_id, crn, term, section"
+
+def _fetch_sections(column: str, values: list, term: Optional[str] = None) -> List[dict]:
+    values = list(dict.fromkeys(values))
+    if not values:
+        return []
+    order = () if column == "section_id" else ("section_id",)
+    return fetch_in("sections", _SECTION_COLUMNS, column, values, order=order,
+                    where={"term": term} if term else None)
+
+def _sections_by_course(items: List[dict]) -> Dict[str, List[dict]]:
+    """
+    course_id -> секции (по возрастанию section_id) для items вида (course_id, term, section).
+    Сначала читаются секции курсов в запрошенном семестре; остальные семестры
+    загружаются только для курсов, у которых там ничего не нашлось (fallback в _match_section).
+    """
+    courses_by_term: Dict[str, List[str]] = {}
+    for item in items:
+        courses_by_term.setdefault(item["term"], []).append(item["course_id"])
+
+    by_id = {}
+    found = set()
+    for term, course_ids in courses_by_term.items():
+        for row in _fetch_sections("course_id", course_ids, term):
+            by_id[row["section_id"]] = row
+            found.add((row["course_id"], term))
+    unmatched = [item["course_id"] for item in items if (item["course_id"], item["term"]) not in found]
+    for row in _fetch_sections("course_id", unmatched):
+        by_id.setdefault(row["section_id"], row)
+
+    by_course: Dict[str, List[dict]] = {}
+    for section_id in sorted(by_id):
+        by_course.setdefault(by_id[section_id]["course_id"], []).append(by_id[section_id])
+    return by_course
+
+def _match_section(item: dict, by_section_id: dict, by_crn: dict, by_course: dict) -> dict:
+    """
+    Та же логика выбора секции, что и у add_class_enrollment, но по уже загруженным строкам.
+    :return: {"row": <sections row>, "fallback_info": str} или {"error": ...}
+    """
+    section_id = item.get("section_id")
+    crn = item.get("crn")
+    course_id, term, section = item.get("course_id"), item.get("term"), item.get("section")
 
     if section_id is not None:
-        section_query = (
-            supabase.table("sections")
-            .select("section_id, course_id")
-            .eq("section_id", section_id)
-            .execute()
-        )
-        if not section_query.data:
+        row = by_section_id.get(str(section_id))
+        if row is None:
             return {"error": f"Section with section_id={section_id} not found."}
+        return {"row": row, "fallback_info": ""}
 
-        found_section_id = section_query.data[0]["section_id"]
-        found_course_id = section_query.data[0]["course_id"]
-
-    elif crn is not None:
-        section_query = (
-            supabase.table("sections")
-            .select("section_id, course_id")
-            .eq("crn", crn)
-            .execute()
-        )
-        if not section_query.data:
+    if crn is not None:
+        row = by_crn.get(str(crn))
+        if row is None:
             return {"error": f"Section with CRN={crn} not found."}
-
-        found_section_id = section_query.data[0]["section_id"]
-        found_course_id = section_query.data[0]["course_id"]
-
-    elif course_id and term and section:
-        exact_match = (
-            supabase.table("sections")
-            .select("section_id, course_id")
-            .eq("course_id", course_id)
-            .eq("term", term)
-            .eq("section", section)
-            .execute()
-        )
-        if exact_match.data:
-            found_section_id = exact_match.data[0]["section_id"]
-            found_course_id = exact_match.data[0]["course_id"]
-        else:
-            same_term_match = (
-                supabase.table("sections")
-                .select("section_id, course_id")
-                .eq("course_id", course_id)
-                .eq("term", term)
-                .execute()
-            )
-            if same_term_match.data:
-                found_section_id = same_term_match.data[0]["section_id"]
-                found_course_id = same_term_match.data[0]["course_id"]
-                fallback_info = (
+        return {"row": row, "fallback_info": ""}
+
+    if course_id and term and section:
+        rows = by_course.get(course_id, [])
+        same_term = [row for row in rows if row.get("term") == term]
+        for row in same_term:
+            if str(row.get("section")) == str(section):
+                return {"row": row, "fallback_info": ""}
+        if same_term:
+            return {
+                "row": same_term[0],
+                "fallback_info": (
                     f"In place of section '{section}' in term '{term}', section "
-                    f"{found_section_id} (in the same term) is selected."
+                    f"{same_term[0]['section_id']} (in the same term) is selected."
                 )
-            else:
-                any_term_match = (
-                    supabase.table("sections")
-                    .select("section_id, course_id, term, section")
-                    .eq("course_id", course_id)
-                    .execute()
+            }
+        if rows:
+            return {
+                "row": rows[0],
+                "fallback_info": (
+                    f"In place of term '{term}' and section '{section}', section "
+                    f"{rows[0]['section_id']} (term='{rows[0]['term']}', section='{rows[0]['section']}')."
                 )
-                if any_term_match.data:
-                    found_section_id = any_term_match.data[0]["section_id"]
-                    found_course_id = any_term_match.data[0]["course_id"]
-                    alt_term = any_term_match.data[0]["term"]
-                    alt_section = any_term_match.data[0]["section"]
-                    fallback_info = (
-                        f"In place of term '{term}' and section '{section}', section "
-                        f"{found_section_id} (term='{alt_term}', section='{alt_section}')."
-                    )
-                else:
-                    return {
-                        "error": (
-                            f"Section (course_id={course_id}, term={term}, section={section}) not found. "
-                            f"No alternative sections in this term or others."
-                        )
-                    }
-    else:
+            }
         return {
             "error": (
-                "No valid way to find section specified. "
-                "Provide one of the following:\n"
-                "  - section_id\n"
-                "  - crn\n"
-                "  - (course_id, term, section) (with fallback search)"
+                f"Section (course_id={course_id}, term={term}, section={section}) not found. "
+                f"No alternative sections in this term or others."
             )
         }
 
-    enrollment_check = (
-        supabase.table("enrollments")
-        .select("section_id")
-        .eq("user_id", user_id)
-        .execute()
-    )
-
-    if enrollment_check.data:
-        enrolled_section_ids = {record["section_id"] for record in enrollment_check.data}
-
-        existing_course_check = (
-            supabase.table("sections")
-            .select("section_id")
-            .eq("course_id", found_course_id)
-            .in_("section_id", list(enrolled_section_ids))
-            .execute()
+    return {
+        "error": (
+            "No valid way to find section specified. "
+            "Provide one of the following:\n"
+            "  - section_id\n"
+            "  - crn\n"
+            "  - (course_id, term, section) (with fallback search)"
         )
+    }
 
-        if existing_course_check.data:
-            return {
+def _add_class_enrollments_queries(user_id: int, items: List[dict]) -> List[dict]:
+    """
+    Запасной путь, пока функция enroll_sections не установлена в базе (sql/enroll_sections.sql).
+    Секции всех items ищутся пакетными (по частям и постранично) in_-запросами на тип ключа
+    (section_id, crn; course_id — сначала в запрошенном семестре),
+    повторы курсов отсеиваются в памяти, новые записи вставляются одним bulk insert.
+    В отличие от RPC, проверка дубликатов и вставка не атомарны.
+
+    :return: список {"success": ...} / {"error": ...} в порядке items
+    """
+    user_check = supabase.table("users").select("user_id").eq("user_id", user_id).execute()
+    if not user_check.data:
+        return [{"error": f"User with ID {user_id} not found."} for _ in items]
+
+    by_section_id = {
+        str(row["section_id"]): row
+        for row in _fetch_sections("section_id", [i["section_id"] for i in items if i.get("section_id") is not None])
+    }
+    by_crn = {}
+    for row in _fetch_sections("crn", [i["crn"] for i in items if i.get("section_id") is None and i.get("crn") is not None]):
+        by_crn.setdefault(str(row["crn"]), row)
+    by_course = _sections_by_course([
+        i for i in items
+        if i.get("section_id") is None and i.get("crn") is None
+        and i.get("course_id") and i.get("term") and i.get("section")
+    ])
+
+    # course_id -> section_id, в которой пользователь уже записан на этот курс
+    enrolled_courses = {}
+    enrollment_check = supabase.table("enrollments").select("section_id").eq("user_id", user_id).execute()
+    enrolled_section_ids = list({record["section_id"] for record in enrollment_check.data or []})
+    if enrolled_section_ids:
+        for row in _fetch_sections("section_id", enrolled_section_ids):
+            enrolled_courses.setdefault(row["course_id"], row["section_id"])
+
+    results: List[Optional[dict]] = [None] * len(items)
+    pending = []
+    for index, item in enumerate(items):
+        match = _match_section(item, by_section_id, by_crn, by_course)
+        if "error" in match:
+            results[index] = match
+            continue
+        found_section_id = match["row"]["section_id"]
+        found_course_id = match["row"]["course_id"]
+        if found_course_id in enrolled_courses:
+            results[index] = {
                 "error": (
                     f"User {user_id} is already enrolled in course {found_course_id} "
-                    f"in section {existing_course_check.data[0]['section_id']}."
+                    f"in section {enrolled_courses[found_course_id]}."
                 )
             }
+            continue
+        # Второй item того же курса в этом же запросе тоже считается дубликатом.
+        enrolled_courses[found_course_id] = found_section_id
+        pending.append((index, item.get("in_process", False), found_section_id, found_course_id, match["fallback_info"]))
+
+    if pending:
+        insert_data = [
+            {"user_id": user_id, "section_id": found_section_id, "in_process": in_process}
+            for _, in_process, found_section_id, _, _ in pending
+        ]
+        response = supabase.table("enrollments").insert(insert_data).execute()
+
+        for index, in_process, found_section_id, found_course_id, fallback_info in pending:
+            if not response.data:
+                results[index] = {
+                    "error": "Failed to add record to enrollments. Supabase response: " + str(response)
+                }
+                continue
+            success_message = (
+                f"User {user_id} successfully enrolled in section {found_section_id} "
+                f"of course {found_course_id}. in_process={in_process}"
+            )
+            if fallback_info:
+                success_message += " " + fallback_info
+            results[index] = {"success": success_message}
 
-    insert_data = {
-        "user_id": user_id,
-        "section_id": found_section_id,
-        "in_process": in_process
-    }
-    response = supabase.table("enrollments").insert(insert_data).execute()
-
-    if not response.data:
-        return {
-            "error": "Failed to add record to enrollments. Supabase response: " + str(response)
-        }
-
-    success_message = (
-        f"User {user_id} successfully enrolled in section {found_section_id} "
-        f"of course {found_course_id}. in_process={in_process}"
-    )
-    if fallback_info:
-        success_message += " " + fallback_info
-
-    return {"success": success_message}
-
-result = add_class_enrollment(
-    user_id=1,
-    in_process=False,
-    course_id="CPSC 121",
-    term="Spring 2024",
-    section="01"
-)
-print(result)
-
-
-
+    return results
 
 
 def get_user_enrollments(user_id: int) -> list:
@@ -0,0 +1,147 @@
+-- enroll_sections(p_user_id, p_items): adds one or more classes for a user in a single call.
+--
+-- p_items is a JSON array; each item identifies a section the same ways
+-- add_class_enrollment does (checked in this order):
+--   {"section_id": 123}
+--   {"crn": "40211"}
+--   {"course_id": "CPSC 121", "term": "Fall 2025", "section": "01"}
+--       falls back to another section of the course in the same term,
+--       then to a section of the course in any term
+-- plus an optional "in_process" flag.
+--
+-- Returns a JSON array with one {"success": "..."} or {"error": "..."} per item,
+-- in input order. The function runs in one transaction and takes a per-user
+-- advisory lock, so the duplicate-course check and the insert cannot race
+-- with another enrollment request for the same user.
+--
+-- Apply in the Supabase SQL editor (or psql) before deploying the backend;
+-- until then the backend falls back to its multi-query path.
+
+create or replace function public.enroll_sections(p_user_id bigint, p_items jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_item jsonb;
+    v_results jsonb := '[]'::jsonb;
+    v_section_id bigint;
+    v_course_id text;
+    v_alt_term text;
+    v_alt_section text;
+    v_fallback text;
+    v_existing bigint;
+    v_message text;
+begin
+    perform pg_advisory_xact_lock(p_user_id);
+
+    if not exists (select 1 from users where user_id = p_user_id) then
+        select coalesce(jsonb_agg(jsonb_build_object('error', format('User with ID %s not found.', p_user_id))), '[]'::jsonb)
+          into v_results
+          from jsonb_array_elements(p_items);
+        return v_results;
+    end if;
+
+    for v_item in select value from jsonb_array_elements(p_items) loop
+        v_section_id := null;
+        v_course_id := null;
+        v_fallback := null;
+
+        if v_item->>'section_id' is not null then
+            select s.section_id, s.course_id into v_section_id, v_course_id
+              from sections s
+             where s.section_id = (v_item->>'section_id')::bigint;
+            if not found then
+                v_results := v_results || jsonb_build_array(jsonb_build_object(
+                    'error', format('Section with section_id=%s not found.', v_item->>'section_id')));
+                continue;
+            end if;
+
+        elsif v_item->>'crn' is not null then
+            select s.section_id, s.course_id into v_section_id, v_course_id
+              from sections s
+             where s.crn::text = v_item->>'crn'
+             order by s.section_id
+             limit 1;
+            if not found then
+                v_results := v_results || jsonb_build_array(jsonb_build_object(
+                    'error', format('Section with CRN=%s not found.', v_item->>'crn')));
+                continue;
+            end if;
+
+        elsif v_item->>'course_id' is not null and v_item->>'term' is not null and v_item->>'section' is not null then
+            select s.section_id, s.course_id into v_section_id, v_course_id
+              from sections s
+             where s.course_id = v_item->>'course_id'
+               and s.term = v_item->>'term'
+               and s.section = v_item->>'section'
+             order by s.section_id
+             limit 1;
+
+            if not found then
+                select s.section_id, s.course_id into v_section_id, v_course_id
+                  from sections s
+                 where s.course_id = v_item->>'course_id'
+                   and s.term = v_item->>'term'
+                 order by s.section_id
+                 limit 1;
+                if found then
+                    v_fallback := format(
+                        'In place of section ''%s'' in term ''%s'', section %s (in the same term) is selected.',
+                        v_item->>'section', v_item->>'term', v_section_id);
+                end if;
+            end if;
+
+            if v_section_id is null then
+                select s.section_id, s.course_id, s.term, s.section
+                  into v_section_id, v_course_id, v_alt_term, v_alt_section
+                  from sections s
+                 where s.course_id = v_item->>'course_id'
+                 order by s.section_id
+                 limit 1;
+                if not found then
+                    v_results := v_results || jsonb_build_array(jsonb_build_object(
+                        'error', format(
+                            'Section (course_id=%s, term=%s, section=%s) not found. No alternative sections in this term or others.',
+                            v_item->>'course_id', v_item->>'term', v_item->>'section')));
+                    continue;
+                end if;
+                v_fallback := format(
+                    'In place of term ''%s'' and section ''%s'', section %s (term=''%s'', section=''%s'').',
+                    v_item->>'term', v_item->>'section', v_section_id, v_alt_term, v_alt_section);
+            end if;
+
+        else
+            v_results := v_results || jsonb_build_array(jsonb_build_object(
+                'error', 'No valid way to find section specified. Provide one of the following: '
+                         || 'section_id, crn, (course_id, term, section) (with fallback search)'));
+            continue;
+        end if;
+
+        select e.section_id into v_existing
+          from enrollments e
+          join sections s on s.section_id = e.section_id
+         where e.user_id = p_user_id
+           and s.course_id = v_course_id
+         limit 1;
+        if found then
+            v_results := v_results || jsonb_build_array(jsonb_build_object(
+                'error', format('User %s is already enrolled in course %s in section %s.',
+                                p_user_id, v_course_id, v_existing)));
+            continue;
+        end if;
+
+        insert into enrollments (user_id, section_id, in_process)
+        values (p_user_id, v_section_id, coalesce((v_item->>'in_process')::boolean, false));
+
+        v_message := format('User %s successfully enrolled in section %s of course %s. in_process=%s',
+                            p_user_id, v_section_id, v_course_id,
+                            case when coalesce((v_item->>'in_process')::boolean, false) then 'True' else 'False' end);
+        if v_fallback is not null then
+            v_message := v_message || ' ' || v_fallback;
+        end if;
+        v_results := v_results || jsonb_build_array(jsonb_build_object('success', v_message));
+    end loop;
+
+    return v_results;
+end;
+$$;
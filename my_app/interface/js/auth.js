@@ -1,12 +1,16 @@
 
-function storeUserSession(userData) {
+function storeUserSession(userData, token) {
     sessionStorage.setItem('user', JSON.stringify(userData));
     sessionStorage.setItem('isLoggedIn', 'true');
+    if (token) {
+        sessionStorage.setItem('token', token);
+    }
 }
 
 function clearUserSession() {
     sessionStorage.removeItem('user');
     sessionStorage.removeItem('isLoggedIn');
+    sessionStorage.removeItem('token');
 }
 
 function isUserLoggedIn() {
@@ -34,7 +38,7 @@ async function loginUser(username, password) {
         console.log('Login response data:', data);
 
         if (response.ok) {
-            storeUserSession(data.data);
+            storeUserSession(data.data, data.token);
             return { success: true, data: data.data };
         } else {
             console.error('Login failed with status:', response.status, data.error);
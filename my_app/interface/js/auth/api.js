@@ -265,6 +265,8 @@ export async function searchSections(filters = {}) {
   if (filters.courseCode) params.append('course_code', filters.courseCode);
   if (filters.attribute)  params.append('attribute',   filters.attribute);
   if (filters.instructor) params.append('instructor',  filters.instructor);
+  const term = filters.term || document.querySelector('.semester-button')?.textContent.trim();
+  if (term)               params.append('term',        term);
 
   const res = await fetch(`/sections_bp/search?${params}`);
   return res.ok
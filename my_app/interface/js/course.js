@@ -2,7 +2,7 @@ import { generateMockSections } from './mockdata.js';
 import { fetchSections, checkBackendConnection } from './exportService.js';
 import { updateCoursesListWithMockData } from './uiControls.js';
 import { editEventOnSchedule } from './eventEditing.js';
-import { parseTimeToHour, getDayIndex, getRandomCourseColor } from './utility.js';
+import { parseTimeToHour, getDayIndex, getRandomCourseColor, findMeetingConflict } from './utility.js';
 
 window.sectionsData = [];
 
@@ -188,6 +188,12 @@ function addSectionToSchedule(subject, courseCode, sectionNumber) {
             return;
         }
     }
+
+    const conflictBlock = findMeetingConflict(sectionData.meeting_mask);
+    if (conflictBlock) {
+        showNotification(`Time conflict with ${conflictBlock.getAttribute('data-course')}`, 'error');
+        return;
+    }
     
     try {
         
@@ -281,6 +287,9 @@ function addSectionToSchedule(subject, courseCode, sectionNumber) {
             courseBlock.setAttribute('data-start-time', startTime);
             courseBlock.setAttribute('data-end-time', endTime);
             courseBlock.setAttribute('data-day', day);
+            if (sectionData.meeting_mask) {
+                courseBlock.setAttribute('data-meeting-mask', sectionData.meeting_mask);
+            }
 
             const deleteButton = document.createElement('button');
             deleteButton.className = 'course-delete-btn';
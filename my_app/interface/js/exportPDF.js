@@ -1,5 +1,23 @@
+import {
+    showNotification,
+    showSuccessMessage,
+    showErrorMessage,
+    showLoadingIndicator,
+    hideLoadingIndicator
+} from './notifications.js';
+
+async function exportToPDF() {
+    const token = sessionStorage.getItem('token');
+    if (token) {
+        // Signed in: the server renders the enrolled sections as a small vector PDF.
+        try {
+            await downloadServerPDF(token);
+            return;
+        } catch (error) {
+            console.error('Server PDF export failed, rendering in the browser:', error);
+        }
+    }
 
-function exportToPDF() {
     const scheduleContainer = document.getElementById('schedule-container');
     
     if (!scheduleContainer) {
@@ -78,4 +96,34 @@ function generatePDF(container) {
         hideLoadingIndicator(document.querySelector('.loading-indicator'));
         showErrorMessage('Failed to generate PDF: ' + error.message);
     });
-} 
\ No newline at end of file
+}
+
+async function downloadServerPDF(token) {
+    const currentSemester = document.querySelector('.semester-button')?.textContent.trim() || '';
+    const apiBase = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1' ? 'http://localhost:5001' : '';
+    const response = await fetch(`${apiBase}/export_bp/pdf`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify({ semester: currentSemester })
+    });
+    if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+    }
+
+    const blob = await response.blob();
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = `GU_Schedule_${currentSemester.replace(/[^\w]+/g, '_')}.pdf`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    URL.revokeObjectURL(url);
+    showSuccessMessage('Schedule exported to PDF successfully');
+}
+
+// Called from the export menu's inline onclick handler in index.html.
+window.exportToPDF = exportToPDF;
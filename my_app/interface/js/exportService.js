@@ -1,3 +1,6 @@
+import { generateAndDownloadICS, generateEventICS } from './calenderExport.js';
+import { showSuccessMessage, showErrorMessage } from './notifications.js';
+import { getCurrentTimestamp } from './utility.js';
 
 export { checkBackendConnection, fetchSections };
 
@@ -17,6 +20,10 @@ function exportToGoogleCalendar(eventData = null) {
     exportToCalendar(eventData, 'google-calendar');
 }
 
+// Called from the export menu's inline onclick handlers in index.html.
+window.exportToAppleCalendar = exportToAppleCalendar;
+window.exportToGoogleCalendar = exportToGoogleCalendar;
+
 function collectScheduleData() {
     
     console.log('Collecting schedule data for export...');
@@ -126,71 +133,57 @@ function getDayFromIndex(index) {
     return days[index] || '';
 }
 
-function exportToCalendar(eventData, endpoint) {
+async function exportToCalendar(eventData, endpoint) {
     console.log(`Exporting to ${endpoint}...`);
-    console.log('Export data:', eventData);
-    
-    if (!eventData || eventData.length === 0) {
-        showErrorMessage('No courses added to schedule yet. Add courses before exporting.');
-        return;
-    }
-    
-    const currentSemester = document.querySelector('.semester-button').textContent.trim();
-    
-    if (endpoint === 'apple-calendar') {
-        
+
+    const currentSemester = document.querySelector('.semester-button')?.textContent.trim() || '';
+    const token = sessionStorage.getItem('token');
+
+    if (!token) {
+        // Not signed in: build the file in the browser from the courses on the grid.
+        if (!eventData || eventData.length === 0) {
+            showErrorMessage('No courses added to schedule yet. Add courses before exporting.');
+            return;
+        }
         generateAndDownloadICS(eventData, currentSemester);
         return;
     }
-    
-    const exportData = {
-        events: eventData,
-        semester: currentSemester,
-        user: {
-            name: 'John Doe', 
-            id: '123456789'   
-        }
-    };
-    
-    const loadingIndicator = showLoadingIndicator();
-    
+
+    // The server builds the .ics from the user's enrollments (one event per section).
     const apiBase = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1' ? 'http://localhost:5001' : '';
-    fetch(`${apiBase}/export_bp/${endpoint}`, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json'
-        },
-        body: JSON.stringify(exportData)
-    })
-    .then(response => {
+    try {
+        const response = await fetch(`${apiBase}/export_bp/${endpoint}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${token}`
+            },
+            body: JSON.stringify({ semester: currentSemester })
+        });
         if (!response.ok) {
-            throw new Error(`HTTP error! Status: ${response.status}`);
+            const err = await response.json().catch(() => ({}));
+            throw new Error(err.error || `HTTP error! Status: ${response.status}`);
         }
-        return response.json();
-    })
-    .then(data => {
-        console.log('Export response:', data);
-        
-        if (data.success) {
-            showSuccessMessage(`Successfully exported to ${formatEndpointName(endpoint)}`);
-            
-            if (endpoint === 'google-calendar') {
-                
-                const url = 'https://calendar.google.com/calendar/r/eventedit';
-                window.open(url, '_blank');
-            }
-        } else {
-            showErrorMessage(`Failed to export: ${data.error || 'Unknown error'}`);
+
+        const blob = await response.blob();
+        const url = URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = `GU_Schedule_${currentSemester.replace(/[^\w]+/g, '_')}.ics`;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        URL.revokeObjectURL(url);
+
+        showSuccessMessage(`Successfully exported to ${formatEndpointName(endpoint)}`);
+        if (endpoint === 'google-calendar') {
+            // Google Calendar takes the downloaded file under Settings > Import & export.
+            window.open('https://calendar.google.com/calendar/r/settings/export', '_blank');
         }
-    })
-    .catch(error => {
+    } catch (error) {
         console.error('Export error:', error);
         showErrorMessage(`Error: ${error.message}`);
-    })
-    .finally(() => {
-        
-        hideLoadingIndicator(loadingIndicator);
-    });
+    }
 }
 
 function exportToICalendar() {
@@ -387,7 +387,7 @@ document.addEventListener('DOMContentLoaded', function() {
             document.getElementById('addClassCode').value = '';
             document.getElementById('addClassSection').value = '';
             document.getElementById('addClassTerm').value = '';
-            loadEnrolledCoursesTable(window.currentUserId || 1);
+            loadEnrolledCoursesTable(sessionUserId());
         });
     }
     if (addClassCancel && addClassModal) {
@@ -408,14 +408,14 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
             
-            const user_id = window.currentUserId || 1;
+            const user_id = sessionUserId();
             const course_id = subject + ' ' + code;
 
             try {
                 
-                let response = await fetch('/user_bp/add_class', {
+                const response = await fetch('/user_bp/add_class', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
+                    headers: { 'Content-Type': 'application/json', ...sessionAuthHeaders() },
                     body: JSON.stringify({
                         user_id,
                         in_process: false,
@@ -425,66 +425,9 @@ document.addEventListener('DOMContentLoaded', function() {
                     })
                 });
 
-                let result = await response.json();
-
-                if (result.error && result.error.includes("not found")) {
-                    console.log("Exact section not found, looking for alternatives in the same term...");
-
-                    const sectionsResponse = await fetch(`/sections_bp/search?course_id=${encodeURIComponent(course_id)}&term=${encodeURIComponent(term)}`);
-                    const sectionsResult = await sectionsResponse.json();
-
-                    if (sectionsResult && sectionsResult.data && sectionsResult.data.length > 0) {
-                        
-                        const altSection = sectionsResult.data[0].section_number;
-
-                        if (confirm(`Section ${section} not found for ${course_id} in ${term}. Would you like to add section ${altSection} instead?`)) {
-                            response = await fetch('/user_bp/add_class', {
-                                method: 'POST',
-                                headers: { 'Content-Type': 'application/json' },
-                                body: JSON.stringify({
-                                    user_id,
-                                    in_process: false,
-                                    course_id,
-                                    term,
-                                    section: altSection
-                                })
-                            });
-                            result = await response.json();
-                        }
-                    } else {
-                        
-                        console.log("No sections found in same term, looking in other terms...");
-
-                        const allTermsResponse = await fetch(`/sections_bp/search?course_id=${encodeURIComponent(course_id)}`);
-                        const allTermsResult = await allTermsResponse.json();
-
-                        if (allTermsResult && allTermsResult.data && allTermsResult.data.length > 0) {
-                            
-                            const sortedSections = allTermsResult.data.sort((a, b) => {
-                                
-                                return b.term.localeCompare(a.term);
-                            });
-
-                            const altTerm = sortedSections[0].term;
-                            const altSection = sortedSections[0].section_number;
-
-                            if (confirm(`No sections for ${course_id} found in ${term}. Would you like to add section ${altSection} from ${altTerm} instead?`)) {
-                                response = await fetch('/user_bp/add_class', {
-                                    method: 'POST',
-                                    headers: { 'Content-Type': 'application/json' },
-                                    body: JSON.stringify({
-                                        user_id,
-                                        in_process: false,
-                                        course_id,
-                                        term: altTerm,
-                                        section: altSection
-                                    })
-                                });
-                                result = await response.json();
-                            }
-                        }
-                    }
-                }
+                // The server already falls back to another section of the course
+                // (same term first, then any term) in the same call.
+                const result = await response.json();
 
                 if (result.success) {
                     alert(result.success);
@@ -609,11 +552,22 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
+// Session token issued by /user_bp/login (stored by auth.js).
+function sessionAuthHeaders() {
+    const token = sessionStorage.getItem('token');
+    return token ? { 'Authorization': `Bearer ${token}` } : {};
+}
+
+function sessionUserId() {
+    const user = JSON.parse(sessionStorage.getItem('user') || 'null');
+    return (user && user.user_id) || window.currentUserId || 1;
+}
+
 async function loadEnrolledCoursesTable(user_id) {
     const tableDiv = document.getElementById('enrolledCoursesTable');
     tableDiv.innerHTML = 'Loading...';
     try {
-        const resp = await fetch(`/user_bp/${user_id}/enrollments`);
+        const resp = await fetch(`/user_bp/${user_id}/enrollments`, { headers: sessionAuthHeaders() });
         const data = await resp.json();
         if (!Array.isArray(data) || data.length === 0) {
             tableDiv.innerHTML = '<em>No enrolled courses.</em>';
@@ -638,7 +592,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const nextSemesterButton = document.getElementById('next-semester-btn');
     if (nextSemesterButton) {
         nextSemesterButton.addEventListener('click', async function() {
-            const userId = window.currentUserId || 1; 
+            const userId = sessionUserId();
             const response = await fetch(`/user_bp/${userId}/next_semester_plan`);
             const plan = await response.json();
 
@@ -653,6 +607,8 @@ document.addEventListener('DOMContentLoaded', function() {
                     <span class="close" id="closeNextSemesterModal">&times;</span>
                     <h2>Recommended Courses for Next Semester</h2>
                     <div id="nextSemesterCourses"></div>
+                    <button id="addPlanToClasses" class="btn">Add all to my classes</button>
+                    <div id="addPlanResult"></div>
                   </div>`;
                 document.body.appendChild(modal);
             }
@@ -670,8 +626,39 @@ document.addEventListener('DOMContentLoaded', function() {
             html += '</table>';
 
             document.getElementById('nextSemesterCourses').innerHTML = html;
+            document.getElementById('addPlanResult').innerHTML = '';
             modal.style.display = 'block';
 
+            // The whole plan is committed in one request; results come back per course.
+            document.getElementById('addPlanToClasses').onclick = async function() {
+                const resultDiv = document.getElementById('addPlanResult');
+                const items = plan
+                    .filter(item => item.section_id)
+                    .map(item => ({ section_id: item.section_id, in_process: false }));
+                if (!items.length) {
+                    resultDiv.textContent = 'No sections to add.';
+                    return;
+                }
+                try {
+                    const addResponse = await fetch('/user_bp/add_classes', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json', ...sessionAuthHeaders() },
+                        body: JSON.stringify({ items })
+                    });
+                    const result = await addResponse.json();
+                    if (!addResponse.ok) {
+                        resultDiv.textContent = result.error || 'Unknown error.';
+                        return;
+                    }
+                    resultDiv.innerHTML = result.results
+                        .map(r => `<div>${r.success || r.error}</div>`)
+                        .join('');
+                } catch (err) {
+                    console.error("Error adding planned classes:", err);
+                    resultDiv.textContent = 'Backend appears to be unavailable.';
+                }
+            };
+
             document.getElementById('closeNextSemesterModal').onclick = function() {
                 modal.style.display = 'none';
             };
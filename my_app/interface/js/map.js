@@ -1,4 +1,25 @@
 
+// Phones get a pre-rendered WebP of the floor plan instead of the PDF viewer;
+// the PDF itself is served with Range support, so desktop viewers load it lazily.
+function showFloorPlan(container, plan, pdfPath) {
+    const embedPdf = () => {
+        container.innerHTML = `<embed src="${pdfPath}" type="application/pdf" width="100%" height="100%" style="min-height:500px; border-radius:8px;" />`;
+    };
+    if (!window.matchMedia('(max-width: 768px)').matches) {
+        embedPdf();
+        return;
+    }
+    const width = Math.round(container.clientWidth * (window.devicePixelRatio || 1)) || 960;
+    const img = document.createElement('img');
+    img.src = `/floor_plans_bp/${plan}/pages/1.webp?width=${width}`;
+    img.alt = 'Floor plan';
+    img.style.width = '100%';
+    img.style.borderRadius = '8px';
+    img.onerror = embedPdf;
+    container.innerHTML = '';
+    container.appendChild(img);
+}
+
 window.openMapTab = function(tabId, event) {
     console.log('Switching to tab:', tabId); 
     if (event) {
@@ -48,21 +69,21 @@ window.openMapTab = function(tabId, event) {
 window.openHerakPDF = function() {
     const mapContainer = document.querySelector('.map-container');
     if (mapContainer) {
-        mapContainer.innerHTML = `<embed src="./assets/Floor Plans/Herak Center.pdf" type="application/pdf" width="100%" height="100%" style="min-height:500px; border-radius:8px;" />`;
+        showFloorPlan(mapContainer, 'Herak1', './assets/Floor Plans/Herak Center.pdf');
     }
 };
 
 window.openJepsonFirstFloorPDF = function() {
     const mapContainer = document.querySelector('.map-container');
     if (mapContainer) {
-        mapContainer.innerHTML = `<embed src="./assets/Floor Plans/Jepson1stFloor.pdf" type="application/pdf" width="100%" height="100%" style="min-height:500px; border-radius:8px;" />`;
+        showFloorPlan(mapContainer, 'Jepson1', './assets/Floor Plans/Jepson1stFloor.pdf');
     }
 };
 
 window.openJepsonBasementPDF = function() {
     const mapContainer = document.querySelector('.map-container');
     if (mapContainer) {
-        mapContainer.innerHTML = `<embed src="./assets/Floor Plans/JepsonBasementpdf.pdf" type="application/pdf" width="100%" height="100%" style="min-height:500px; border-radius:8px;" />`;
+        showFloorPlan(mapContainer, 'JepsonB', './assets/Floor Plans/JepsonBasementpdf.pdf');
     }
 };
 
@@ -185,31 +206,31 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
-    function showPdfInMapContainer(pdfPath) {
+    function showPdfInMapContainer(plan, pdfPath) {
         const mapContainer = document.querySelector('.map-container');
         if (mapContainer) {
-            mapContainer.innerHTML = `<embed src="${pdfPath}" type="application/pdf" width="100%" height="100%" style="min-height:500px; border-radius:8px;" />`;
+            showFloorPlan(mapContainer, plan, pdfPath);
         }
     }
 
     const jepsonBtn = document.querySelector('.floor-plan-btn[data-plan="Jepson1"]');
     if (jepsonBtn) {
         jepsonBtn.addEventListener('click', function() {
-            showPdfInMapContainer('assets/Floor Plans/Jepson1stFloor.pdf');
+            showPdfInMapContainer('Jepson1', 'assets/Floor Plans/Jepson1stFloor.pdf');
         });
     }
     
     const jepsonBasementBtn = document.querySelector('.floor-plan-btn[data-plan="JepsonB"]');
     if (jepsonBasementBtn) {
         jepsonBasementBtn.addEventListener('click', function() {
-            showPdfInMapContainer('assets/Floor Plans/JepsonBasementpdf.pdf');
+            showPdfInMapContainer('JepsonB', 'assets/Floor Plans/JepsonBasementpdf.pdf');
         });
     }
     
     const herakBtn = document.querySelector('.floor-plan-btn[data-plan="Herak1"]');
     if (herakBtn) {
         herakBtn.addEventListener('click', function() {
-            showPdfInMapContainer('assets/Floor Plans/Herak Center.pdf');
+            showPdfInMapContainer('Herak1', 'assets/Floor Plans/Herak Center.pdf');
         });
     }
 }); 
\ No newline at end of file
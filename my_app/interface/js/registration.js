@@ -1,3 +1,4 @@
+import { findMeetingConflict } from './utility.js';
 
 export { 
     createRegistrationSidebar, 
@@ -905,6 +906,8 @@ function fetchSectionsFromBackend(criteria) {
     if (criteria.subject) queryParams.append('subject', criteria.subject);
     if (criteria.course_code) queryParams.append('course_code', criteria.course_code);
     if (criteria.instructor) queryParams.append('instructor', criteria.instructor);
+    const term = criteria.term || document.querySelector('.semester-button')?.textContent.trim();
+    if (term) queryParams.append('term', term);
 
     const apiBase = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1' ? 'http://localhost:5001' : '';
     const url = `${apiBase}/sections_bp/search?${queryParams.toString()}`;
@@ -1003,6 +1006,13 @@ function addSectionToSchedule(subject, courseCode, sectionNumber) {
         return;
     }
 
+    const conflictBlock = findMeetingConflict(section.meeting_mask);
+    if (conflictBlock) {
+        const { subject: otherSubject, courseCode: otherCode } = conflictBlock.dataset;
+        alert(`Time conflict with ${otherSubject} ${otherCode}`);
+        return;
+    }
+
     scheduleInfo.days.forEach(day => {
         addCourseToScheduleGrid(subject, courseCode, sectionNumber, day, scheduleInfo.startHour, scheduleInfo.endHour, section);
     });
@@ -1128,6 +1138,9 @@ function addCourseToScheduleGrid(subject, courseCode, sectionNumber, day, startH
     courseBlock.dataset.courseCode = courseCode;
     courseBlock.dataset.sectionNumber = sectionNumber;
     courseBlock.dataset.day = day;
+    if (section && section.meeting_mask) {
+        courseBlock.dataset.meetingMask = section.meeting_mask;
+    }
 
     cell.appendChild(courseBlock);
 
@@ -285,3 +285,21 @@ export function parseTime(startTime, endTime) {
     const [endHour, endMinute] = endTime.split(':').map(Number);
     return { startHour, startMinute, endHour, endMinute };
 }
+
+/**
+ * Returns the schedule block whose meeting time overlaps the given section, or null.
+ * meetingMask is the hex bitmask from /sections_bp/search (one bit per 5-minute slot
+ * of the week), so the check is one AND per scheduled section instead of re-parsing
+ * schedule strings.
+ */
+export function findMeetingConflict(meetingMask) {
+    if (!meetingMask) return null;
+    const mask = BigInt(`0x${meetingMask}`);
+    if (mask === 0n) return null;
+    for (const block of document.querySelectorAll('.course-block[data-meeting-mask]')) {
+        if (BigInt(`0x${block.dataset.meetingMask}`) & mask) {
+            return block;
+        }
+    }
+    return null;
+}